@@ -4,6 +4,7 @@ from autohive_integrations_sdk import (
 from typing import Dict, Any, List, Optional
 import json
 import base64
+import asyncio
 import aiohttp
 
 # Create the integration using the config.json
@@ -13,6 +14,144 @@ box = Integration.load()
 BOX_API_BASE = "https://api.box.com/2.0"
 BOX_UPLOAD_BASE = "https://upload.box.com/api/2.0"
 
+# Folder crawler settings
+BOX_CRAWL_PAGE_SIZE = 1000  # Maximum page size for marker-based folder listing
+BOX_CRAWL_CONCURRENCY = 5
+BOX_CRAWL_FIELDS = "id,name,type,size,created_at,modified_at"
+
+
+class BoxFolderCrawler:
+    """Walks a Box folder tree breadth-first and streams items as pages arrive.
+
+    Folders are listed with marker-based pagination (usemarker=true), so every page
+    of every subfolder is read. Up to `concurrency` folder listings run at once;
+    folders are queued in FIFO order, so the tree is expanded level by level.
+    max_depth limits how many levels below the root are listed (1 = direct
+    children only) and max_items caps the number of yielded items.
+
+    Paths are relative to the root folder ("Reports/2024/q1.pdf"). When
+    path_prefixes is set, only items under one of the prefixes are yielded and
+    folders that cannot contain matches are not listed at all.
+
+    Errors listing a folder do not stop the crawl; they are recorded in `errors`.
+    """
+
+    def __init__(
+        self,
+        context: ExecutionContext,
+        root_folder_id: str,
+        max_depth: Optional[int] = None,
+        max_items: Optional[int] = None,
+        path_prefixes: Optional[List[str]] = None,
+        item_type: str = "all",
+        concurrency: int = BOX_CRAWL_CONCURRENCY
+    ):
+        self.context = context
+        self.root_folder_id = root_folder_id
+        self.max_depth = max_depth
+        self.max_items = max_items
+        self.path_prefixes = [prefix.strip("/") for prefix in (path_prefixes or []) if prefix.strip("/")]
+        self.item_type = item_type
+        self.concurrency = max(1, concurrency)
+
+        self.errors: List[Dict[str, Any]] = []
+        self.folders_listed = 0
+        self.truncated = False
+
+        self._folders: asyncio.Queue = asyncio.Queue()
+        self._items: asyncio.Queue = asyncio.Queue(maxsize=BOX_CRAWL_PAGE_SIZE)
+
+    def _matches(self, path: str) -> bool:
+        if not self.path_prefixes:
+            return True
+        return any(path == prefix or path.startswith(prefix + "/") for prefix in self.path_prefixes)
+
+    def _may_contain_matches(self, folder_path: str) -> bool:
+        if not self.path_prefixes:
+            return True
+        return any(
+            self._matches(folder_path) or prefix.startswith(folder_path + "/")
+            for prefix in self.path_prefixes
+        )
+
+    async def _list_folder(self, folder_id: str, folder_path: str, depth: int):
+        url = f"{BOX_API_BASE}/folders/{folder_id}/items"
+        params = {
+            "usemarker": "true",
+            "limit": BOX_CRAWL_PAGE_SIZE,
+            "fields": BOX_CRAWL_FIELDS
+        }
+
+        while True:
+            data = await self.context.fetch(url, method="GET", params=params)
+
+            for entry in data.get("entries", []):
+                path = f"{folder_path}/{entry.get('name')}" if folder_path else entry.get("name", "")
+
+                if self._matches(path) and self.item_type in ("all", entry.get("type")):
+                    item = {
+                        "id": entry.get("id"),
+                        "name": entry.get("name"),
+                        "path": path,
+                        "type": entry.get("type"),
+                        "depth": depth,
+                        "parent_id": folder_id,
+                        "created_at": entry.get("created_at"),
+                        "modified_at": entry.get("modified_at")
+                    }
+                    if entry.get("type") == "file" and "size" in entry:
+                        item["size"] = entry.get("size")
+                    await self._items.put(item)
+
+                if entry.get("type") == "folder" and (self.max_depth is None or depth < self.max_depth):
+                    if self._may_contain_matches(path):
+                        self._folders.put_nowait((entry["id"], path, depth + 1))
+
+            next_marker = data.get("next_marker")
+            if not next_marker:
+                break
+            params["marker"] = next_marker
+
+        self.folders_listed += 1
+
+    async def _worker(self):
+        while True:
+            folder_id, folder_path, depth = await self._folders.get()
+            try:
+                await self._list_folder(folder_id, folder_path, depth)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors.append({"folder_id": folder_id, "path": folder_path, "error": str(e)})
+            finally:
+                self._folders.task_done()
+
+    async def _signal_done(self):
+        await self._folders.join()
+        await self._items.put(None)
+
+    async def crawl(self):
+        """Yield items (files and folders) as they are discovered."""
+        self._folders.put_nowait((self.root_folder_id, "", 1))
+        tasks = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+        tasks.append(asyncio.create_task(self._signal_done()))
+
+        yielded = 0
+        try:
+            while True:
+                item = await self._items.get()
+                if item is None:
+                    break
+                if self.max_items is not None and yielded >= self.max_items:
+                    self.truncated = True
+                    break
+                yielded += 1
+                yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
 # ---- Action Handlers ----
 
 @box.action("list_shared_folders")
@@ -206,6 +345,46 @@ class ListFolderContents(ActionHandler):
                 "error": str(e)
             }
 
+@box.action("crawl_folder")
+class CrawlFolder(ActionHandler):
+    async def execute(self, inputs: Dict[str, Any], context: ExecutionContext):
+        try:
+            folder_id = inputs.get('folder_id', '0')
+
+            crawler = BoxFolderCrawler(
+                context,
+                folder_id,
+                max_depth=inputs.get('max_depth'),
+                max_items=inputs.get('max_items', 10000),
+                path_prefixes=inputs.get('path_prefixes'),
+                item_type=inputs.get('item_type', 'all'),
+                concurrency=inputs.get('concurrency', BOX_CRAWL_CONCURRENCY)
+            )
+
+            items = []
+            async for item in crawler.crawl():
+                items.append(item)
+
+            return {
+                "items": items,
+                "total_count": len(items),
+                "folders_listed": crawler.folders_listed,
+                "truncated": crawler.truncated,
+                "errors": crawler.errors,
+                "result": True
+            }
+
+        except Exception as e:
+            return {
+                "items": [],
+                "total_count": 0,
+                "folders_listed": 0,
+                "truncated": False,
+                "errors": [],
+                "result": False,
+                "error": str(e)
+            }
+
 @box.action("get_file")
 class GetFile(ActionHandler):
     async def execute(self, inputs: Dict[str, Any], context: ExecutionContext):
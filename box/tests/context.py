@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+import sys
+import os
+
+# Add parent directory to path for imports
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, parent_dir)
+sys.path.insert(0, os.path.join(parent_dir, "dependencies"))
+
+# Load by path so `box` always means box.py, whether or not the box package is importable
+import importlib.util
+spec = importlib.util.spec_from_file_location("box_module", os.path.join(parent_dir, "box.py"))
+box_module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(box_module)
+box = box_module.box
@@ -0,0 +1,165 @@
+"""
+Unit tests for the Box folder crawler.
+
+These run offline against a fake context.fetch that serves a folder tree.
+
+Usage:
+    cd box/tests
+    python -m pytest test_box.py
+"""
+
+import pytest
+
+from context import box_module
+
+
+class FakeBoxContext:
+    """Serves /folders/{id}/items from a dict of folder id -> pages of entries"""
+
+    def __init__(self, pages, failing=None):
+        self.pages = pages
+        self.failing = failing or {}
+        self.requests = []
+
+    async def fetch(self, url, method="GET", params=None, **kwargs):
+        folder_id = url.split("/folders/", 1)[1].split("/", 1)[0]
+        params = dict(params or {})
+        self.requests.append((folder_id, params))
+        if folder_id in self.failing:
+            raise self.failing[folder_id]
+
+        folder_pages = self.pages[folder_id]
+        index = int(params.get("marker", "0"))
+        data = {"entries": folder_pages[index]}
+        if index + 1 < len(folder_pages):
+            data["next_marker"] = str(index + 1)
+        return data
+
+
+def folder(folder_id, name):
+    return {"id": folder_id, "name": name, "type": "folder"}
+
+
+def file(file_id, name, size=10):
+    return {"id": file_id, "name": name, "type": "file", "size": size}
+
+
+async def crawl(context, **kwargs):
+    crawler = box_module.BoxFolderCrawler(context, "0", **kwargs)
+    items = [item async for item in crawler.crawl()]
+    return crawler, items
+
+
+@pytest.mark.asyncio
+async def test_crawler_follows_next_marker_across_pages():
+    """Test that every page of a folder is listed by following next_marker"""
+    context = FakeBoxContext({
+        "0": [
+            [file("f1", "a.txt"), file("f2", "b.txt")],
+            [folder("d1", "Reports")],
+            [file("f3", "c.txt")]
+        ],
+        "d1": [
+            [file("f4", "q1.pdf")],
+            [file("f5", "q2.pdf")]
+        ]
+    })
+
+    crawler, items = await crawl(context)
+
+    assert sorted(item["path"] for item in items) == [
+        "Reports", "Reports/q1.pdf", "Reports/q2.pdf", "a.txt", "b.txt", "c.txt"
+    ]
+    assert crawler.folders_listed == 2
+    assert crawler.errors == []
+    assert crawler.truncated is False
+
+    root_requests = [params for folder_id, params in context.requests if folder_id == "0"]
+    assert [params.get("marker") for params in root_requests] == [None, "1", "2"]
+    assert all(params["usemarker"] == "true" for params in root_requests)
+
+    q2 = next(item for item in items if item["id"] == "f5")
+    assert q2["depth"] == 2
+    assert q2["parent_id"] == "d1"
+    assert q2["size"] == 10
+
+
+@pytest.mark.asyncio
+async def test_crawler_records_failing_subfolder_and_continues():
+    """Test that a subfolder that fails to list is recorded in errors without stopping the crawl"""
+    context = FakeBoxContext(
+        {
+            "0": [[folder("d1", "Broken"), folder("d2", "Fine")]],
+            "d2": [[file("f1", "ok.txt")]]
+        },
+        failing={"d1": Exception("403 Forbidden")}
+    )
+
+    crawler, items = await crawl(context)
+
+    assert sorted(item["path"] for item in items) == ["Broken", "Fine", "Fine/ok.txt"]
+    assert crawler.errors == [{"folder_id": "d1", "path": "Broken", "error": "403 Forbidden"}]
+    assert crawler.folders_listed == 2
+
+
+@pytest.mark.asyncio
+async def test_crawler_stops_at_max_items():
+    """Test that max_items caps the yielded items and marks the crawl as truncated"""
+    context = FakeBoxContext({
+        "0": [[file(f"f{i}", f"file{i}.txt") for i in range(5)], [folder("d1", "More")]],
+        "d1": [[file(f"g{i}", f"more{i}.txt") for i in range(5)]]
+    })
+
+    crawler, items = await crawl(context, max_items=3)
+
+    assert len(items) == 3
+    assert crawler.truncated is True
+
+
+@pytest.mark.asyncio
+async def test_crawler_without_max_items_is_not_truncated():
+    """Test that a crawl with fewer items than max_items is not marked as truncated"""
+    context = FakeBoxContext({"0": [[file("f1", "a.txt"), file("f2", "b.txt")]]})
+
+    crawler, items = await crawl(context, max_items=2)
+
+    assert len(items) == 2
+    assert crawler.truncated is False
+
+
+@pytest.mark.asyncio
+async def test_crawler_filters_by_path_prefixes():
+    """Test that only items under path_prefixes are yielded and unrelated folders are not listed"""
+    context = FakeBoxContext({
+        "0": [[folder("d1", "Reports"), folder("d2", "Archive"), file("f1", "readme.txt")]],
+        "d1": [[folder("d3", "2024"), folder("d4", "2023")]],
+        "d3": [[file("f2", "q1.pdf")]],
+        "d4": [[file("f3", "q4.pdf")]],
+        "d2": [[file("f4", "old.pdf")]]
+    })
+
+    crawler, items = await crawl(context, path_prefixes=["/Reports/2024/"])
+
+    assert sorted(item["path"] for item in items) == ["Reports/2024", "Reports/2024/q1.pdf"]
+    listed = {folder_id for folder_id, _ in context.requests}
+    assert listed == {"0", "d1", "d3"}
+
+
+@pytest.mark.asyncio
+async def test_crawl_folder_action_returns_items_and_errors():
+    """Test that the crawl_folder action reports items, truncation and errors"""
+    context = FakeBoxContext(
+        {
+            "0": [[folder("d1", "Docs"), folder("d2", "Private")]],
+            "d1": [[file("f1", "a.txt"), file("f2", "b.txt")]]
+        },
+        failing={"d2": Exception("404 Not Found")}
+    )
+
+    result = await box_module.CrawlFolder().execute({"folder_id": "0", "item_type": "file"}, context)
+
+    assert result["result"] is True
+    assert sorted(item["path"] for item in result["items"]) == ["Docs/a.txt", "Docs/b.txt"]
+    assert result["total_count"] == 2
+    assert result["truncated"] is False
+    assert result["errors"][0]["folder_id"] == "d2"
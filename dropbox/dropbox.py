@@ -1,9 +1,12 @@
 from autohive_integrations_sdk import (
     Integration, ExecutionContext, ActionHandler, ActionResult
 )
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import json
 import base64
+import re
+import asyncio
+import aiohttp
 
 # Create the integration using the config.json
 dropbox = Integration.load()
@@ -11,12 +14,198 @@ dropbox = Integration.load()
 # Base URLs for Dropbox API
 DROPBOX_API_BASE_URL = "https://api.dropboxapi.com/2"
 DROPBOX_CONTENT_BASE_URL = "https://content.dropboxapi.com/2"
+DROPBOX_NOTIFY_BASE_URL = "https://notify.dropboxapi.com/2"
 
 
 # Note: Authentication is handled automatically by the platform OAuth integration.
 # The context.fetch method automatically includes the OAuth token in requests.
 
 
+# ---- Upload Session Helpers ----
+
+# Chunk size for upload sessions: a multiple of 4MB (required by Dropbox for
+# concurrent sessions) and of 3 bytes, so each chunk maps to whole base64 quanta
+UPLOAD_CHUNK_SIZE = 12 * 1024 * 1024
+UPLOAD_CHUNK_RETRIES = 3
+UPLOAD_RETRY_BASE_DELAY = 1.0
+UPLOAD_CONCURRENCY = 4
+FINISH_BATCH_MAX_ENTRIES = 1000
+WHITESPACE_PATTERN = re.compile(r"\s")
+
+
+def iter_base64_chunks(content: str, chunk_size: int = UPLOAD_CHUNK_SIZE):
+    """Decode base64 content one chunk at a time.
+
+    Slices the encoded string on 4-character boundaries, so only one decoded chunk
+    is held in memory at a time instead of a full decoded copy of the file.
+    """
+    # MIME/PEM-wrapped base64 has its first line break at column 76 or later
+    if WHITESPACE_PATTERN.search(content):
+        content = "".join(content.split())
+    step = chunk_size // 3 * 4
+    for start in range(0, len(content), step):
+        yield base64.b64decode(content[start:start + step])
+
+
+def _error_status(error: Exception) -> Optional[int]:
+    """HTTP status code attached to an error or its response, if any"""
+    for source in (error, getattr(error, "response", None)):
+        for attribute in ("status", "status_code"):
+            status = getattr(source, attribute, None)
+            if isinstance(status, int):
+                return status
+    return None
+
+
+def _error_body(error: Exception) -> Dict[str, Any]:
+    """Dropbox error body ({"error_summary", "error"}) carried by an exception, if any"""
+    for source in (error, getattr(error, "response", None)):
+        for attribute in ("body", "data", "json"):
+            value = getattr(source, attribute, None)
+            if isinstance(value, dict):
+                return value
+            if isinstance(value, (str, bytes)):
+                try:
+                    return json.loads(value)
+                except ValueError:
+                    pass
+    # Otherwise look for the JSON body in the error message
+    message = str(error)
+    start = message.find("{")
+    if start != -1:
+        try:
+            body = json.loads(message[start:])
+        except ValueError:
+            return {}
+        return body if isinstance(body, dict) else {}
+    return {}
+
+
+def _error_tag(error: Exception) -> Optional[str]:
+    return ((_error_body(error).get("error") or {}).get(".tag"))
+
+
+def _error_retry_after(error: Exception) -> Optional[int]:
+    """Seconds Dropbox asked the client to wait (429 retry_after or Retry-After header), if any"""
+    retry_after = (_error_body(error).get("error") or {}).get("retry_after")
+    if retry_after is None:
+        for source in (error, getattr(error, "response", None)):
+            headers = getattr(source, "headers", None) or {}
+            if hasattr(headers, "get") and headers.get("Retry-After") is not None:
+                retry_after = headers.get("Retry-After")
+                break
+    try:
+        return int(retry_after) if retry_after is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_transient_error(error: Exception) -> bool:
+    """Rate limits, server errors and network failures; anything else will fail again on retry"""
+    if isinstance(error, (aiohttp.ClientConnectionError, asyncio.TimeoutError)):
+        return True
+    status = _error_status(error)
+    return status == 429 or (status is not None and status >= 500)
+
+
+async def _content_request(context: ExecutionContext, endpoint: str, api_arg: Dict[str, Any], data: bytes = b"",
+                           idempotent: bool = True):
+    """POST to a content endpoint, retrying transient failures with exponential backoff.
+
+    Requests that are not safe to repeat (idempotent=False) are only retried after a
+    429, which Dropbox rejects before doing any work.
+    """
+    headers = {
+        "Dropbox-API-Arg": json.dumps(api_arg),
+        "Content-Type": "application/octet-stream"
+    }
+    for attempt in range(UPLOAD_CHUNK_RETRIES + 1):
+        try:
+            return await context.fetch(
+                f"{DROPBOX_CONTENT_BASE_URL}/{endpoint}",
+                method="POST",
+                headers=headers,
+                data=data
+            )
+        except Exception as e:
+            retryable = _is_transient_error(e) if idempotent else _error_status(e) == 429
+            if attempt == UPLOAD_CHUNK_RETRIES or not retryable:
+                raise
+            await asyncio.sleep(UPLOAD_RETRY_BASE_DELAY * (2 ** attempt))
+
+
+async def _append_chunk(context: ExecutionContext, cursor: Dict[str, Any], chunk: bytes, close: bool) -> None:
+    """Append a chunk at the cursor.
+
+    If an earlier attempt reached Dropbox even though it appeared to fail, the retry
+    is rejected with incorrect_offset; the upload then resumes from the
+    correct_offset Dropbox reports instead of re-sending bytes it already has.
+    """
+    start = cursor["offset"]
+    end = start + len(chunk)
+    offset = start
+    while True:
+        try:
+            await _content_request(
+                context,
+                "files/upload_session/append_v2",
+                {"cursor": {"session_id": cursor["session_id"], "offset": offset}, "close": close},
+                chunk[offset - start:]
+            )
+            return
+        except Exception as e:
+            tag = _error_tag(e)
+            if tag == "closed" and close and offset == end:
+                # The earlier attempt already appended the rest and closed the session
+                return
+            if tag != "incorrect_offset":
+                raise
+            correct_offset = _error_body(e)["error"].get("correct_offset")
+            if not isinstance(correct_offset, int) or not offset < correct_offset <= end:
+                raise
+            offset = correct_offset
+            if offset == end and not close:
+                return
+
+
+async def upload_session_append_all(context: ExecutionContext, content: str, close: bool = False) -> Dict[str, Any]:
+    """Upload base64 content into a new upload session, chunk by chunk.
+
+    Returns the session cursor ({"session_id", "offset"}) positioned after the last
+    byte. With close=True the session is closed so it can be committed through
+    upload_session/finish_batch_v2.
+    """
+    chunks = iter_base64_chunks(content)
+    first_chunk = next(chunks, b"")
+    next_chunk = next(chunks, None)
+
+    session = await _content_request(
+        context,
+        "files/upload_session/start",
+        {"close": close and next_chunk is None},
+        first_chunk
+    )
+    cursor = {"session_id": session["session_id"], "offset": len(first_chunk)}
+
+    while next_chunk is not None:
+        chunk = next_chunk
+        next_chunk = next(chunks, None)
+        await _append_chunk(context, cursor, chunk, close and next_chunk is None)
+        cursor = {"session_id": cursor["session_id"], "offset": cursor["offset"] + len(chunk)}
+
+    return cursor
+
+
+def build_commit_info(inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the commit info used by upload and upload_session/finish."""
+    return {
+        "path": inputs['path'],
+        "mode": inputs.get('mode', 'add'),
+        "autorename": inputs.get('autorename', False),
+        "mute": inputs.get('mute', False)
+    }
+
+
 # ---- Action Handlers ----
 
 # ---- File and Folder Listing Handlers ----
@@ -76,6 +265,121 @@ class ListFolderAction(ActionHandler):
             )
 
 
+@dropbox.action("watch_changes")
+class WatchChangesAction(ActionHandler):
+    """Return entries changed since a stored cursor.
+
+    Without a cursor, a cursor for the current state is returned (no entries) to be
+    stored for the next call. With a cursor, optionally waits for changes using
+    list_folder/longpoll, then drains every list_folder/continue page.
+    """
+
+    LONGPOLL_MIN_TIMEOUT = 30
+    LONGPOLL_MAX_TIMEOUT = 480
+
+    async def execute(self, inputs: Dict[str, Any], context: ExecutionContext):
+        backoff = None
+        try:
+            cursor = inputs.get('cursor')
+
+            if not cursor:
+                data = {
+                    "path": inputs.get('path', ''),
+                    "recursive": inputs.get('recursive', True),
+                    "include_deleted": inputs.get('include_deleted', True),
+                    "include_mounted_folders": inputs.get('include_mounted_folders', True)
+                }
+                response = await context.fetch(
+                    f"{DROPBOX_API_BASE_URL}/files/list_folder/get_latest_cursor",
+                    method="POST",
+                    json=data
+                )
+                return ActionResult(
+                    data={
+                        "entries": [],
+                        "cursor": response.get('cursor'),
+                        "changes": False,
+                        "has_more": False,
+                        "backoff": None,
+                        "result": True
+                    },
+                    cost_usd=0.0
+                )
+
+            if inputs.get('wait', False):
+                timeout = min(
+                    max(inputs.get('timeout', self.LONGPOLL_MIN_TIMEOUT), self.LONGPOLL_MIN_TIMEOUT),
+                    self.LONGPOLL_MAX_TIMEOUT
+                )
+                poll = await self._longpoll(cursor, timeout)
+                backoff = poll.get('backoff')
+                if not poll.get('changes', False):
+                    return ActionResult(
+                        data={
+                            "entries": [],
+                            "cursor": cursor,
+                            "changes": False,
+                            "has_more": False,
+                            "backoff": backoff,
+                            "result": True
+                        },
+                        cost_usd=0.0
+                    )
+
+            max_entries = inputs.get('max_entries', 10000)
+            entries = []
+            has_more = True
+            while has_more and len(entries) < max_entries:
+                response = await context.fetch(
+                    f"{DROPBOX_API_BASE_URL}/files/list_folder/continue",
+                    method="POST",
+                    json={"cursor": cursor}
+                )
+                entries.extend(response.get('entries', []))
+                cursor = response.get('cursor', cursor)
+                has_more = response.get('has_more', False)
+
+            return ActionResult(
+                data={
+                    "entries": entries,
+                    "cursor": cursor,
+                    "changes": bool(entries),
+                    "has_more": has_more,
+                    "backoff": backoff,
+                    "result": True
+                },
+                cost_usd=0.0
+            )
+
+        except Exception as e:
+            # Same shape as a success, so a longpoll loop knows how long to back off before retrying
+            return ActionResult(
+                data={
+                    "entries": [],
+                    "cursor": inputs.get('cursor'),
+                    "changes": False,
+                    "has_more": False,
+                    "backoff": _error_retry_after(e) or backoff,
+                    "result": False,
+                    "error": str(e)
+                },
+                cost_usd=0.0
+            )
+
+    async def _longpoll(self, cursor: str, timeout: int) -> Dict[str, Any]:
+        """Wait for changes on the notify endpoint, which takes no Authorization header."""
+        # Dropbox adds up to 90 seconds of random jitter to the requested timeout
+        client_timeout = aiohttp.ClientTimeout(total=timeout + 120)
+        async with aiohttp.ClientSession(timeout=client_timeout) as session:
+            async with session.post(
+                f"{DROPBOX_NOTIFY_BASE_URL}/files/list_folder/longpoll",
+                json={"cursor": cursor, "timeout": timeout}
+            ) as response:
+                if response.status != 200:
+                    raise Exception(f"Dropbox longpoll error: {response.status} - {await response.text()}")
+                return await response.json()
+
+
 # ---- Metadata Handlers ----
 
 @dropbox.action("get_metadata")
@@ -147,17 +451,12 @@ class GetTemporaryLinkAction(ActionHandler):
 
 @dropbox.action("upload_file")
 class UploadFileAction(ActionHandler):
-    """Upload a file to Dropbox."""
+    """Upload a file to Dropbox. Large files are uploaded in chunks through an upload session."""
 
     async def execute(self, inputs: Dict[str, Any], context: ExecutionContext):
         try:
             # Build Dropbox-API-Arg header with upload parameters
-            api_arg = {
-                "path": inputs['path'],
-                "mode": inputs.get('mode', 'add'),
-                "autorename": inputs.get('autorename', False),
-                "mute": inputs.get('mute', False)
-            }
+            api_arg = build_commit_info(inputs)
 
             # Get file content - expected as base64 or bytes
             content = inputs.get('content')
@@ -166,6 +465,22 @@ class UploadFileAction(ActionHandler):
                     data={"file": {}, "result": False, "error": "File content is required"},
                     cost_usd=0.0
                 )
+
+            # Files larger than one chunk go through an upload session: decoded chunk
+            # by chunk, and not limited to the 150MB single-request maximum
+            if isinstance(content, str) and len(content) > UPLOAD_CHUNK_SIZE // 3 * 4:
+                cursor = await upload_session_append_all(context, content)
+                response = await _content_request(
+                    context,
+                    "files/upload_session/finish",
+                    {"cursor": cursor, "commit": api_arg},
+                    idempotent=False
+                )
+                return ActionResult(
+                    data={"file": response, "result": True},
+                    cost_usd=0.0
+                )
+
             if isinstance(content, str):
                 content = base64.b64decode(content)
 
@@ -194,6 +509,76 @@ class UploadFileAction(ActionHandler):
             )
 
 
+@dropbox.action("upload_files")
+class UploadFilesAction(ActionHandler):
+    """Upload many files, committing them together with upload_session/finish_batch_v2.
+
+    Each file is uploaded into its own closed upload session (several at once), then
+    all sessions are committed in one finish_batch_v2 call per 1,000 files, so the
+    namespace is locked once per batch rather than once per file.
+    """
+
+    async def execute(self, inputs: Dict[str, Any], context: ExecutionContext):
+        try:
+            files = inputs['files']
+            semaphore = asyncio.Semaphore(UPLOAD_CONCURRENCY)
+
+            async def upload(file: Dict[str, Any]):
+                async with semaphore:
+                    return await upload_session_append_all(context, file.get('content') or "", close=True)
+
+            cursors = await asyncio.gather(*(upload(file) for file in files), return_exceptions=True)
+
+            results = [None] * len(files)
+            pending = []
+            for index, (file, cursor) in enumerate(zip(files, cursors)):
+                if isinstance(cursor, Exception):
+                    results[index] = {"path": file.get('path'), "result": False, "error": str(cursor)}
+                else:
+                    pending.append((index, {"cursor": cursor, "commit": build_commit_info(file)}))
+
+            for start in range(0, len(pending), FINISH_BATCH_MAX_ENTRIES):
+                batch = pending[start:start + FINISH_BATCH_MAX_ENTRIES]
+                response = await context.fetch(
+                    f"{DROPBOX_API_BASE_URL}/files/upload_session/finish_batch_v2",
+                    method="POST",
+                    json={"entries": [entry for _, entry in batch]}
+                )
+
+                for (index, entry), outcome in zip(batch, response.get('entries', [])):
+                    if outcome.get('.tag') == 'success':
+                        metadata = {key: value for key, value in outcome.items() if key != '.tag'}
+                        results[index] = {"path": entry["commit"]["path"], "file": metadata, "result": True}
+                    else:
+                        results[index] = {
+                            "path": entry["commit"]["path"],
+                            "result": False,
+                            "error": json.dumps(outcome.get('failure', outcome))
+                        }
+
+            for index, item in enumerate(results):
+                if item is None:
+                    results[index] = {"path": files[index].get('path'), "result": False, "error": "No result returned by Dropbox"}
+
+            succeeded = sum(1 for item in results if item["result"])
+
+            return ActionResult(
+                data={
+                    "files": results,
+                    "succeeded_count": succeeded,
+                    "failed_count": len(results) - succeeded,
+                    "result": True
+                },
+                cost_usd=0.0
+            )
+
+        except Exception as e:
+            return ActionResult(
+                data={"files": [], "succeeded_count": 0, "failed_count": 0, "result": False, "error": str(e)},
+                cost_usd=0.0
+            )
+
+
 @dropbox.action("create_folder")
 class CreateFolderAction(ActionHandler):
     """Create a new folder."""
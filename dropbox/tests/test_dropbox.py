@@ -2,6 +2,7 @@
 import asyncio
 import base64
 from context import dropbox
+from dropbox import iter_base64_chunks
 from autohive_integrations_sdk import ExecutionContext
 
 
@@ -65,6 +66,37 @@ async def test_list_folder_continue():
             return None
 
 
+async def test_watch_changes():
+    """Test getting a starting cursor and then fetching changes since it."""
+    auth = {
+        "auth_type": "PlatformOauth2",
+        "credentials": {
+            "access_token": "your_access_token_here"
+        }
+    }
+
+    async with ExecutionContext(auth=auth) as context:
+        try:
+            start = await dropbox.execute_action("watch_changes", {"path": "", "recursive": True}, context)
+            assert start.get('result') == True, f"Action failed: {start.get('error', 'Unknown error')}"
+            assert start.get('cursor'), "Response missing 'cursor' field"
+            assert start.get('entries') == [], "Initial call should not return entries"
+
+            # Upload or change a file in Dropbox now to see it reported
+            result = await dropbox.execute_action(
+                "watch_changes", {"cursor": start['cursor'], "wait": True, "timeout": 30}, context
+            )
+            print(f"Watch Changes Result: {result}")
+            assert result.get('result') == True, f"Action failed: {result.get('error', 'Unknown error')}"
+            assert 'cursor' in result, "Response missing 'cursor' field"
+            for entry in result.get('entries', [])[:5]:
+                print(f"     - {entry.get('path_display')} ({entry.get('.tag')})")
+            return result
+        except Exception as e:
+            print(f"Error testing watch_changes: {e}")
+            return None
+
+
 async def test_get_metadata():
     """Test getting metadata for a file or folder."""
     auth = {
@@ -163,6 +195,114 @@ async def test_upload_file():
             return None
 
 
+async def test_upload_file_large():
+    """Test uploading a file larger than one chunk through an upload session."""
+    auth = {
+        "auth_type": "PlatformOauth2",
+        "credentials": {
+            "access_token": "your_access_token_here"
+        }
+    }
+
+    # 13MB of content so the upload is split into two chunks
+    sample_content = base64.b64encode(b"0123456789abcdef" * (13 * 1024 * 1024 // 16)).decode('utf-8')
+
+    inputs = {
+        "path": "/test_upload_file_large.bin",
+        "content": sample_content,
+        "mode": "add",
+        "autorename": True
+    }
+
+    async with ExecutionContext(auth=auth) as context:
+        try:
+            result = await dropbox.execute_action("upload_file", inputs, context)
+            assert result.get('result') == True, f"Action failed: {result.get('error', 'Unknown error')}"
+            print(f"  -> Uploaded: {result['file'].get('path_display')} ({result['file'].get('size')} bytes)")
+            return result
+        except Exception as e:
+            print(f"Error testing large upload_file: {e}")
+            return None
+
+
+def test_iter_base64_chunks_wrapped():
+    """Test MIME-wrapped base64 larger than one chunk decodes back to the original bytes."""
+    original = bytes(range(256)) * (40 * 1024)
+    wrapped = base64.encodebytes(original).decode('utf-8')
+    assert wrapped.index("\n") == 76, "Expected the first line break at column 76"
+
+    chunk_size = 3 * 1024 * 1024
+    chunks = list(iter_base64_chunks(wrapped, chunk_size))
+    assert len(chunks) == 4, f"Expected 4 chunks, got {len(chunks)}"
+    assert all(len(chunk) == chunk_size for chunk in chunks[:-1]), "Chunks must be full size except the last"
+    assert b"".join(chunks) == original, "Decoded content does not match the original"
+    print(f"  -> Decoded {len(original)} bytes in {len(chunks)} chunks")
+
+
+async def test_upload_file_large_wrapped():
+    """Test uploading a large file whose base64 content is wrapped at 76 columns."""
+    auth = {
+        "auth_type": "PlatformOauth2",
+        "credentials": {
+            "access_token": "your_access_token_here"
+        }
+    }
+
+    # 13MB of content, line-wrapped the way email attachments are
+    sample_content = base64.encodebytes(b"0123456789abcdef" * (13 * 1024 * 1024 // 16)).decode('utf-8')
+
+    inputs = {
+        "path": "/test_upload_file_large_wrapped.bin",
+        "content": sample_content,
+        "mode": "add",
+        "autorename": True
+    }
+
+    async with ExecutionContext(auth=auth) as context:
+        try:
+            result = await dropbox.execute_action("upload_file", inputs, context)
+            assert result.get('result') == True, f"Action failed: {result.get('error', 'Unknown error')}"
+            print(f"  -> Uploaded: {result['file'].get('path_display')} ({result['file'].get('size')} bytes)")
+            return result
+        except Exception as e:
+            print(f"Error testing wrapped large upload_file: {e}")
+            return None
+
+
+async def test_upload_files():
+    """Test uploading several files committed with one finish_batch call."""
+    auth = {
+        "auth_type": "PlatformOauth2",
+        "credentials": {
+            "access_token": "your_access_token_here"
+        }
+    }
+
+    inputs = {
+        "files": [
+            {
+                "path": f"/test_upload_files/file_{i}.txt",
+                "content": base64.b64encode(f"Batch upload test file {i}".encode()).decode('utf-8'),
+                "autorename": True
+            }
+            for i in range(3)
+        ]
+    }
+
+    async with ExecutionContext(auth=auth) as context:
+        try:
+            result = await dropbox.execute_action("upload_files", inputs, context)
+            print(f"Upload Files Result: {result}")
+            assert result.get('result') == True, f"Action failed: {result.get('error', 'Unknown error')}"
+            assert result.get('succeeded_count') == 3, "Not all files were uploaded"
+            for item in result['files']:
+                print(f"  -> {item['path']}: {'ok' if item['result'] else item.get('error')}")
+            return result
+        except Exception as e:
+            print(f"Error testing upload_files: {e}")
+            return None
+
+
 async def test_create_folder():
     """Test creating a new folder."""
     auth = {
@@ -282,7 +422,7 @@ async def test_copy():
 
 
 async def main():
-    print("Testing Dropbox Integration - 9 Actions")
+    print("Testing Dropbox Integration - 11 Actions")
     print("=" * 60)
     print()
     print("NOTE: Replace placeholders with actual values:")
@@ -295,7 +435,7 @@ async def main():
     print("=" * 60)
     print()
 
-    # Test folder listing actions (2)
+    # Test folder listing actions (3)
     print("FOLDER LISTING ACTIONS")
     print("-" * 60)
     print("1. Testing list_folder...")
@@ -306,6 +446,10 @@ async def main():
     await test_list_folder_continue()
     print()
 
+    print("2b. Testing watch_changes...")
+    await test_watch_changes()
+    print()
+
     print("=" * 60)
     print()
     print("METADATA ACTIONS")
@@ -325,32 +469,48 @@ async def main():
     print("WRITE OPERATIONS")
     print("-" * 60)
 
-    # Test write actions (5)
+    # Test write actions (6)
     print("5. Testing upload_file...")
     await test_upload_file()
     print()
 
-    print("6. Testing create_folder...")
+    print("5b. Testing upload_file with a large file...")
+    await test_upload_file_large()
+    print()
+
+    print("5c. Testing base64 chunking of wrapped content...")
+    test_iter_base64_chunks_wrapped()
+    print()
+
+    print("5d. Testing upload_file with a large wrapped file...")
+    await test_upload_file_large_wrapped()
+    print()
+
+    print("6. Testing upload_files...")
+    await test_upload_files()
+    print()
+
+    print("7. Testing create_folder...")
     await test_create_folder()
     print()
 
-    print("7. Testing delete...")
+    print("8. Testing delete...")
     await test_delete()
     print()
 
-    print("8. Testing move...")
+    print("9. Testing move...")
     await test_move()
     print()
 
-    print("9. Testing copy...")
+    print("10. Testing copy...")
     await test_copy()
     print()
 
     print("=" * 60)
-    print("Testing completed - 9 actions total!")
-    print("  - 2 folder listing actions (list_folder, list_folder_continue)")
+    print("Testing completed - 11 actions total!")
+    print("  - 3 folder listing actions (list_folder, list_folder_continue, watch_changes)")
     print("  - 2 metadata actions (get_metadata, get_temporary_link)")
-    print("  - 5 write operations (upload_file, create_folder, delete, move, copy)")
+    print("  - 6 write operations (upload_file, upload_files, create_folder, delete, move, copy)")
     print("=" * 60)
 
 
@@ -1,8 +1,10 @@
 from autohive_integrations_sdk import (
     Integration, ExecutionContext, ActionHandler, ActionResult
 )
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from urllib.parse import quote
+import asyncio
+import random
 
 fathom = Integration.load()
 
@@ -50,6 +52,63 @@ class FathomAPIClient:
         else:
             raise ValueError(f"Unsupported HTTP method: {method}")
 
+# ---- Transcript Helpers ----
+
+# Fathom has no multi-recording transcript endpoint, so batches are per-recording
+# requests run a few at a time to stay under the API rate limit
+TRANSCRIPT_CONCURRENCY = 5
+TRANSCRIPT_MAX_RETRIES = 3
+TRANSCRIPT_RETRY_BASE_DELAY = 2.0
+
+
+def timestamp_to_seconds(timestamp: str) -> float:
+    """Convert an HH:MM:SS (or MM:SS) timestamp to seconds"""
+    seconds = 0.0
+    try:
+        for part in timestamp.split(":"):
+            seconds = seconds * 60 + float(part)
+    except (AttributeError, ValueError):
+        return 0.0
+    return seconds
+
+
+def normalize_transcript(segments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Convert Fathom transcript segments into speaker-attributed segments"""
+    transcript = []
+    for segment in segments:
+        # Extract speaker name from speaker object
+        speaker = segment.get("speaker") or {}
+        timestamp = segment.get("timestamp", "00:00:00")
+
+        transcript.append({
+            "speaker_name": speaker.get("display_name", "Unknown Speaker"),
+            "timestamp": timestamp,
+            "start_time": timestamp_to_seconds(timestamp),
+            "text": segment.get("text", "")
+        })
+    return transcript
+
+
+def _is_rate_limited(error: Exception) -> bool:
+    for source in (error, getattr(error, "response", None)):
+        for attribute in ("status", "status_code"):
+            if getattr(source, attribute, None) == 429:
+                return True
+    return False
+
+
+async def fetch_transcript(client: FathomAPIClient, recording_id: int) -> List[Dict[str, Any]]:
+    """Fetch one recording's transcript, backing off and retrying when rate limited"""
+    for attempt in range(TRANSCRIPT_MAX_RETRIES + 1):
+        try:
+            response = await client._make_request(f"recordings/{recording_id}/transcript")
+            return normalize_transcript(response.get("transcript", []))
+        except Exception as e:
+            if attempt == TRANSCRIPT_MAX_RETRIES or not _is_rate_limited(e):
+                raise
+            delay = TRANSCRIPT_RETRY_BASE_DELAY * (2 ** attempt)
+            await asyncio.sleep(delay / 2 + random.uniform(0, delay / 2))
+
 # ---- Action Handlers ----
 
 @fathom.action("list_meetings")
@@ -131,18 +190,7 @@ class GetTranscriptAction(ActionHandler):
 
         try:
             response = await client._make_request(f"recordings/{recording_id}/transcript")
-
-            transcript = []
-            for segment in response.get("transcript", []):
-                # Extract speaker name from speaker object
-                speaker = segment.get("speaker", {})
-                speaker_name = speaker.get("display_name", "Unknown Speaker")
-
-                transcript.append({
-                    "speaker_name": speaker_name,
-                    "timestamp": segment.get("timestamp", "00:00:00"),
-                    "text": segment.get("text", "")
-                })
+            transcript = normalize_transcript(response.get("transcript", []))
 
             return ActionResult(
                 data={
@@ -161,6 +209,36 @@ class GetTranscriptAction(ActionHandler):
                 cost_usd=0.0
             )
 
+@fathom.action("get_transcripts")
+class GetTranscriptsAction(ActionHandler):
+    async def execute(self, inputs: Dict[str, Any], context: ExecutionContext):
+        client = FathomAPIClient(context)
+        # Keep the caller's order and drop duplicates
+        recording_ids = list(dict.fromkeys(inputs["recording_ids"]))
+        semaphore = asyncio.Semaphore(TRANSCRIPT_CONCURRENCY)
+
+        async def fetch(recording_id):
+            async with semaphore:
+                return await fetch_transcript(client, recording_id)
+
+        results = await asyncio.gather(*(fetch(recording_id) for recording_id in recording_ids), return_exceptions=True)
+
+        transcripts = []
+        errors = []
+        for recording_id, result in zip(recording_ids, results):
+            if isinstance(result, Exception):
+                errors.append({"recording_id": recording_id, "error": str(result)})
+            else:
+                transcripts.append({"recording_id": recording_id, "transcript": result})
+
+        return ActionResult(
+            data={
+                "transcripts": transcripts,
+                "errors": errors
+            },
+            cost_usd=0.0
+        )
+
 @fathom.action("list_teams")
 class ListTeamsAction(ActionHandler):
     async def execute(self, inputs: Dict[str, Any], context: ExecutionContext):
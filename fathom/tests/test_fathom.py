@@ -43,6 +43,27 @@ async def test_get_transcript():
         except Exception as e:
             print(f"✗ Error testing get_transcript: {str(e)}")
 
+async def test_get_transcripts():
+    """Test getting transcripts for several recordings"""
+    print("\n--- Testing get_transcripts ---")
+
+    auth = {
+        "api_key": "test_api_key"
+    }
+
+    inputs = {
+        "recording_ids": [123, 456]
+    }
+
+    async with ExecutionContext(auth=auth) as context:
+        try:
+            result = await fathom.execute_action("get_transcripts", inputs, context)
+            print(f"✓ get_transcripts returned {len(result.get('transcripts', []))} transcripts")
+            for error in result.get("errors", []):
+                print(f"  Recording {error['recording_id']} failed: {error['error']}")
+        except Exception as e:
+            print(f"✗ Error testing get_transcripts: {str(e)}")
+
 async def test_list_teams():
     """Test listing teams"""
     print("\n--- Testing list_teams ---")
@@ -84,6 +105,7 @@ async def main():
 
     await test_list_meetings()
     await test_get_transcript()
+    await test_get_transcripts()
     await test_list_teams()
     await test_list_team_members()
 
@@ -2,10 +2,14 @@ from autohive_integrations_sdk import (
     Integration, ExecutionContext, ActionHandler
 )
 from typing import Dict, Any, List, Optional
+from urllib.parse import quote, urlparse
+import asyncio
+import hashlib
 import json
 import base64
+import re
+import time
 import aiohttp
-import io
 
 # Create the integration using the config.json
 front = Integration.load()
@@ -13,6 +17,20 @@ front = Integration.load()
 # Front API Base URL
 FRONT_API_BASE = "https://api2.frontapp.com"
 
+# Maximum page size Front accepts on list and search endpoints
+FRONT_PAGE_SIZE = 100
+# How long the teammate and inbox directories are reused before refetching
+DIRECTORY_CACHE_TTL = 300
+# Upper bound on conversations returned by find_conversation
+MAX_SEARCH_RESULTS = 1000
+# Front rejects messages whose attachments add up to more than 25 MB
+MAX_ATTACHMENTS_TOTAL_BYTES = 25 * 1024 * 1024
+# Base64 characters decoded per write; a multiple of 4 so each chunk decodes on its own
+ATTACHMENT_STREAM_CHUNK = 256 * 1024
+# Bytes read per download chunk; a multiple of 3 so each chunk encodes without padding
+DOWNLOAD_READ_CHUNK = 3 * 64 * 1024
+DOWNLOAD_CONCURRENCY = 4
+
 # ---- Utility Classes ----
 
 class FrontDataParser:
@@ -74,6 +92,324 @@ class FrontDataParser:
 
         return message
 
+    @staticmethod
+    def parse_inbox(raw_inbox: Dict[str, Any]) -> Dict[str, Any]:
+        """Parse raw Front inbox from a list response into standardized format."""
+        inbox = {
+            "id": raw_inbox.get("id", ""),
+            "name": raw_inbox.get("name", ""),
+            "address": raw_inbox.get("address", ""),
+        }
+        # Add optional fields
+        if 'type' in raw_inbox:
+            inbox['type'] = raw_inbox['type']
+        if 'send_as' in raw_inbox:
+            inbox['send_as'] = raw_inbox['send_as']
+        return inbox
+
+    @staticmethod
+    def parse_teammate(raw_teammate: Dict[str, Any]) -> Dict[str, Any]:
+        """Parse raw Front teammate into standardized format."""
+        return {
+            "id": raw_teammate.get("id", ""),
+            "email": raw_teammate.get("email", ""),
+            "username": raw_teammate.get("username", ""),
+            "first_name": raw_teammate.get("first_name", ""),
+            "last_name": raw_teammate.get("last_name", ""),
+            "is_admin": raw_teammate.get("is_admin", False),
+            "is_available": raw_teammate.get("is_available", True),
+            "is_blocked": raw_teammate.get("is_blocked", False),
+            "type": raw_teammate.get("type", "user"),
+            "custom_fields": raw_teammate.get("custom_fields", {})
+        }
+
+
+async def fetch_all_pages(context: ExecutionContext, url: str, params: Optional[Dict[str, Any]] = None,
+                          max_items: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Collect _results from a Front list or search endpoint, following _pagination.next.
+
+    Returns the results (at most max_items) and the _total Front reports, if any.
+    """
+    results: List[Dict[str, Any]] = []
+    total = None
+    next_url: Optional[str] = url
+    next_params = dict(params or {}, limit=FRONT_PAGE_SIZE)
+
+    while next_url and (max_items is None or len(results) < max_items):
+        response = await context.fetch(next_url, params=next_params)
+        if "error" in response:
+            raise Exception(f"API request failed: {response.get('error', 'Unknown error')}")
+
+        results.extend(response.get("_results", []))
+        if total is None:
+            total = response.get("_total")
+        # The next link already carries the page token and original query
+        next_url = (response.get("_pagination") or {}).get("next")
+        next_params = None
+
+    if max_items is not None:
+        results = results[:max_items]
+    return {"results": results, "total": total}
+
+
+class FrontDirectoryCache:
+    """
+    Teammate and inbox directories per Front account, reused for ttl_seconds.
+    Concurrent lookups for the same account share one download.
+    """
+
+    def __init__(self, ttl_seconds: int = DIRECTORY_CACHE_TTL):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[tuple, tuple] = {}
+        self._pending: Dict[tuple, asyncio.Future] = {}
+
+    @staticmethod
+    def _account_key(context: ExecutionContext) -> str:
+        auth = json.dumps(getattr(context, 'auth', None) or {}, sort_keys=True, default=str)
+        return hashlib.sha256(auth.encode()).hexdigest()
+
+    async def _load(self, context: ExecutionContext, kind: str) -> List[Dict[str, Any]]:
+        page = await fetch_all_pages(context, f"{FRONT_API_BASE}/{kind}")
+        parse = FrontDataParser.parse_teammate if kind == "teammates" else FrontDataParser.parse_inbox
+        return [parse(raw) for raw in page["results"]]
+
+    async def get(self, context: ExecutionContext, kind: str, refresh: bool = False) -> List[Dict[str, Any]]:
+        key = (self._account_key(context), kind)
+        entry = self._entries.get(key)
+        if entry is not None and not refresh and entry[0] > time.monotonic():
+            return entry[1]
+
+        pending = self._pending.get(key)
+        if pending is None or pending.get_loop() is not asyncio.get_running_loop():
+            pending = asyncio.ensure_future(self._load(context, kind))
+            self._pending[key] = pending
+        try:
+            records = await asyncio.shield(pending)
+        finally:
+            if self._pending.get(key) is pending and pending.done():
+                del self._pending[key]
+
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, records)
+        return records
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# Global directory cache instance
+directory_cache = FrontDirectoryCache()
+
+# ---- Attachments ----
+
+_BASE64_PATTERN = re.compile(r'[A-Za-z0-9+/]*={0,2}')
+
+
+class AttachmentError(Exception):
+    """Raised for attachment problems that should be reported to the caller as-is."""
+
+
+class AttachmentBudget:
+    """Running total of attachment bytes against a limit, shared by concurrent transfers."""
+
+    def __init__(self, limit: int = MAX_ATTACHMENTS_TOTAL_BYTES):
+        self.limit = limit
+        self.used = 0
+
+    def reserve(self, nbytes: int, filename: str) -> None:
+        if self.used + nbytes > self.limit:
+            raise AttachmentError(
+                f"Attachment '{filename}' exceeds the {self.limit} byte attachment limit "
+                f"({self.used + nbytes} bytes in total)"
+            )
+        self.used += nbytes
+
+
+class Base64AttachmentPayload(aiohttp.payload.Payload):
+    """
+    Multipart part backed by base64 text that is decoded chunk by chunk while
+    the request body is written, so the decoded file is never held in memory.
+    """
+
+    def __init__(self, content_b64: str, size: int, **kwargs: Any):
+        super().__init__(content_b64, **kwargs)
+        self._size = size
+
+    def decode(self, encoding: str = "utf-8", errors: str = "strict") -> str:
+        return base64.b64decode(self._value).decode(encoding, errors)
+
+    async def write(self, writer) -> None:
+        for start in range(0, len(self._value), ATTACHMENT_STREAM_CHUNK):
+            await writer.write(base64.b64decode(self._value[start:start + ATTACHMENT_STREAM_CHUNK]))
+
+
+def prepare_attachment(attachment: Dict[str, Any], idx: int) -> Base64AttachmentPayload:
+    """Validate a {filename, content, content_type} attachment without decoding it"""
+    filename = attachment.get("filename", f"attachment_{idx}")
+    content_b64 = attachment.get("content", "")
+    content_type = attachment.get("content_type", "application/octet-stream")
+
+    # Validate content exists
+    if not content_b64:
+        raise AttachmentError(f"Attachment '{filename}' has no content provided")
+
+    # Clean up base64 string (remove whitespace/newlines that might be present)
+    original_length = len(content_b64)
+    content_b64_cleaned = content_b64
+    if any(ch in content_b64 for ch in ' \n\r\t'):
+        content_b64_cleaned = ''.join(content_b64.split())
+    cleaned_length = len(content_b64_cleaned)
+
+    # Base64 must be multiple of 4 (accounting for padding)
+    padding_needed = cleaned_length % 4
+    if padding_needed != 0:
+        content_b64_cleaned += '=' * (4 - padding_needed)
+
+    # Validate minimum size - a small file should be at least 100 chars in base64
+    # PDFs and images should be much larger (typically thousands of chars)
+    if cleaned_length < 100:
+        raise AttachmentError(
+            f"Attachment '{filename}' has suspiciously short base64 content "
+            f"({cleaned_length} characters after cleaning from {original_length} original). "
+            f"This suggests the content may be truncated or incomplete. "
+            f"Expected at least 100 characters for a valid file."
+        )
+
+    # Check the alphabet up front; the content itself is decoded while it is sent
+    if not _BASE64_PATTERN.fullmatch(content_b64_cleaned):
+        raise AttachmentError(
+            f"Failed to decode attachment '{filename}': invalid base64 characters or padding. "
+            f"Content length: {cleaned_length} chars. "
+            f"Make sure the content is valid base64-encoded data."
+        )
+
+    size = len(content_b64_cleaned) // 4 * 3 - (len(content_b64_cleaned) - len(content_b64_cleaned.rstrip('=')))
+    if size <= 0:
+        raise AttachmentError(f"Attachment '{filename}' decoded to empty content")
+
+    return Base64AttachmentPayload(content_b64_cleaned, size, filename=filename, content_type=content_type)
+
+
+def build_message_form(message_data: Dict[str, Any], attachments: List[Dict[str, Any]],
+                       max_total_bytes: int = MAX_ATTACHMENTS_TOTAL_BYTES) -> aiohttp.FormData:
+    """
+    Build the multipart/form-data body for a message with attachments.
+
+    Attachment sizes are checked against max_total_bytes before anything is
+    decoded; the files themselves are streamed into the request.
+    """
+    budget = AttachmentBudget(max_total_bytes)
+    parts = []
+    for idx, attachment in enumerate(attachments):
+        part = prepare_attachment(attachment, idx)
+        budget.reserve(part.size, part.filename)
+        parts.append(part)
+
+    form = aiohttp.FormData()
+
+    # Add body field - convert plain text newlines to HTML if needed
+    body_content = message_data['body']
+
+    # If body doesn't contain HTML tags, convert newlines to <br> for proper rendering
+    if '<' not in body_content and '>' not in body_content:
+        # Plain text - convert newlines to HTML breaks
+        body_content = body_content.replace('\r\n', '<br>').replace('\n', '<br>').replace('\r', '<br>')
+
+    form.add_field('body', body_content)
+
+    # Add recipients as arrays
+    for field in ('to', 'cc', 'bcc'):
+        for recipient in message_data.get(field, []):
+            form.add_field(f'{field}[]', recipient)
+
+    # Add optional fields
+    for field in ('subject', 'author_id', 'sender_name', 'channel_id', 'text', 'quote_body', 'signature_id'):
+        if field in message_data:
+            form.add_field(field, message_data[field])
+    if 'should_add_default_signature' in message_data:
+        form.add_field('should_add_default_signature', str(message_data['should_add_default_signature']).lower())
+
+    # Front expects 'attachments[]' for multiple files
+    for part in parts:
+        form.add_field('attachments[]', part, filename=part.filename)
+
+    return form
+
+
+async def post_message_form(context: ExecutionContext, url: str, form: aiohttp.FormData) -> Dict[str, Any]:
+    """POST a multipart message to Front with the connection's access token"""
+    # Get auth token from context
+    auth_token = None
+    if context.auth and "credentials" in context.auth:
+        auth_token = context.auth["credentials"].get("access_token")
+
+    if not auth_token:
+        raise Exception("No authentication token available")
+
+    headers = {
+        "Authorization": f"Bearer {auth_token}"
+    }
+
+    async with aiohttp.ClientSession() as session:
+        async with session.post(url, data=form, headers=headers) as resp:
+            if resp.status >= 400:
+                error_text = await resp.text()
+                return {"error": f"HTTP {resp.status}: {error_text}"}
+
+            return await resp.json()
+
+
+def attachment_filename(resp: aiohttp.ClientResponse, attachment_url: str) -> str:
+    """Filename from the Content-Disposition header, falling back to the URL path"""
+    content_disposition = resp.headers.get('content-disposition', '')
+    if 'filename=' in content_disposition:
+        return content_disposition.split('filename=')[1].strip('"\'')
+    url_path = urlparse(attachment_url).path
+    if url_path:
+        return url_path.split('/')[-1] or "attachment"
+    return "attachment"
+
+
+async def download_attachment(session: aiohttp.ClientSession, attachment_url: str, headers: Dict[str, str],
+                              budget: AttachmentBudget) -> Dict[str, Any]:
+    """
+    Download one attachment and return it base64-encoded.
+
+    The declared Content-Length is charged to the budget before the body is read;
+    bodies without one are charged as they stream in. Chunks are encoded as they
+    arrive, so the raw file is never held in full next to its base64 form.
+    """
+    async with session.get(attachment_url, headers=headers) as resp:
+        if resp.status >= 400:
+            error_text = await resp.text()
+            raise AttachmentError(f"HTTP {resp.status}: {error_text}")
+
+        filename = attachment_filename(resp, attachment_url)
+        reserved = resp.content_length or 0
+        budget.reserve(reserved, filename)
+
+        encoded_parts = []
+        pending = b""
+        size = 0
+        async for chunk in resp.content.iter_chunked(DOWNLOAD_READ_CHUNK):
+            size += len(chunk)
+            if size > reserved:
+                budget.reserve(size - reserved, filename)
+                reserved = size
+            pending += chunk
+            usable = len(pending) - len(pending) % 3
+            encoded_parts.append(base64.b64encode(pending[:usable]).decode('ascii'))
+            pending = pending[usable:]
+        encoded_parts.append(base64.b64encode(pending).decode('ascii'))
+
+        return {
+            "content": "".join(encoded_parts),  # Use this in create_message attachments
+            "name": filename,
+            "contentType": resp.headers.get('content-type', 'application/octet-stream'),
+            "size": size
+        }
+
+
 # ---- Action Handlers ----
 
 @front.action("get_inbox")
@@ -344,129 +680,10 @@ class CreateMessageReplyAction(ActionHandler):
         message_data: Dict[str, Any], attachments: List[Dict[str, Any]]
     ) -> Dict[str, Any]:
         """Send reply with attachments using multipart/form-data"""
-        # Get auth token from context
-        auth_token = None
-        if context.auth and "credentials" in context.auth:
-            auth_token = context.auth["credentials"].get("access_token")
-
-        if not auth_token:
-            raise Exception("No authentication token available")
-
-        # Build multipart form data
-        form = aiohttp.FormData()
-
-        # Add body field - convert plain text newlines to HTML if needed
-        body_content = message_data['body']
-
-        # If body doesn't contain HTML tags, convert newlines to <br> for proper rendering
-        if '<' not in body_content and '>' not in body_content:
-            # Plain text - convert newlines to HTML breaks
-            body_content = body_content.replace('\r\n', '<br>').replace('\n', '<br>').replace('\r', '<br>')
-
-        form.add_field('body', body_content)
-
-        # Add optional fields (for replies)
-        if 'to' in message_data:
-            for recipient in message_data['to']:
-                form.add_field('to[]', recipient)
-        if 'cc' in message_data:
-            for recipient in message_data['cc']:
-                form.add_field('cc[]', recipient)
-        if 'bcc' in message_data:
-            for recipient in message_data['bcc']:
-                form.add_field('bcc[]', recipient)
-        if 'subject' in message_data:
-            form.add_field('subject', message_data['subject'])
-        if 'author_id' in message_data:
-            form.add_field('author_id', message_data['author_id'])
-        if 'sender_name' in message_data:
-            form.add_field('sender_name', message_data['sender_name'])
-        if 'channel_id' in message_data:
-            form.add_field('channel_id', message_data['channel_id'])
-        if 'text' in message_data:
-            form.add_field('text', message_data['text'])
-        if 'quote_body' in message_data:
-            form.add_field('quote_body', message_data['quote_body'])
-        if 'signature_id' in message_data:
-            form.add_field('signature_id', message_data['signature_id'])
-        if 'should_add_default_signature' in message_data:
-            form.add_field('should_add_default_signature', str(message_data['should_add_default_signature']).lower())
-
-        # Add each attachment as binary file
-        for idx, attachment in enumerate(attachments):
-            filename = attachment.get("filename", f"attachment_{idx}")
-            content_b64 = attachment.get("content", "")
-            content_type = attachment.get("content_type", "application/octet-stream")
-
-            # Validate content exists
-            if not content_b64:
-                raise Exception(f"Attachment '{filename}' has no content provided")
-
-            # Clean up base64 string (remove whitespace/newlines that might be present)
-            content_b64_cleaned = content_b64.strip().replace('\n', '').replace('\r', '').replace(' ', '').replace('\t', '')
-
-            # Check length before and after cleaning
-            original_length = len(content_b64)
-            cleaned_length = len(content_b64_cleaned)
-
-            # Base64 must be multiple of 4 (accounting for padding)
-            # If it's not, check if adding padding would make it valid
-            padding_needed = cleaned_length % 4
-            if padding_needed != 0:
-                content_b64_cleaned += '=' * (4 - padding_needed)
-
-            # Validate minimum size - a small file should be at least 100 chars in base64
-            # PDFs and images should be much larger (typically thousands of chars)
-            if cleaned_length < 100:
-                raise Exception(
-                    f"Attachment '{filename}' has suspiciously short base64 content "
-                    f"({cleaned_length} characters after cleaning from {original_length} original). "
-                    f"This suggests the content may be truncated or incomplete. "
-                    f"Expected at least 100 characters for a valid file."
-                )
-
-            # Decode base64 content
-            try:
-                file_bytes = base64.b64decode(content_b64_cleaned, validate=True)
-            except Exception as e:
-                raise Exception(
-                    f"Failed to decode attachment '{filename}': {str(e)}. "
-                    f"Content length: {cleaned_length} chars. "
-                    f"Make sure the content is valid base64-encoded data."
-                )
-
-            # Validate file is not empty after decoding
-            if not file_bytes or len(file_bytes) == 0:
-                raise Exception(f"Attachment '{filename}' decoded to empty content")
-
-            # Log file size for debugging
-            file_size = len(file_bytes)
-
-            # Wrap bytes in BytesIO to create file-like object (like open('file', 'rb'))
-            file_obj = io.BytesIO(file_bytes)
-            file_obj.seek(0)  # Ensure we're at the beginning of the stream
-
-            # Add file to form data - Front expects 'attachments[]' for multiple files
-            form.add_field(
-                'attachments[]',
-                file_obj,
-                filename=filename,
-                content_type=content_type
-            )
-
-        # Send request with aiohttp
-        url = f"{FRONT_API_BASE}/conversations/{conversation_id}/messages"
-        headers = {
-            "Authorization": f"Bearer {auth_token}"
-        }
-
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, data=form, headers=headers) as resp:
-                if resp.status >= 400:
-                    error_text = await resp.text()
-                    return {"error": f"HTTP {resp.status}: {error_text}"}
-
-                return await resp.json()
+        form = build_message_form(message_data, attachments)
+        return await post_message_form(
+            context, f"{FRONT_API_BASE}/conversations/{conversation_id}/messages", form
+        )
 
 @front.action("get_message")
 class GetMessageAction(ActionHandler):
@@ -506,13 +723,17 @@ class GetMessageAction(ActionHandler):
 class DownloadMessageAttachmentAction(ActionHandler):
     async def execute(self, inputs: Dict[str, Any], context: ExecutionContext):
         """
-        Download a message attachment and return base64-encoded content.
+        Download message attachments and return base64-encoded content.
 
         WORKFLOW: Call get_message first to get attachment URL from message.attachments[].url,
         then pass that URL to this action. Returns base64 content ready for create_message attachments.
+        Pass attachment_urls instead to download several attachments concurrently.
         """
+        attachment_urls = inputs.get("attachment_urls") or []
+        single = not attachment_urls
         try:
-            attachment_url = inputs["attachment_url"]
+            if single:
+                attachment_urls = [inputs["attachment_url"]]
 
             # Get auth token from context
             auth_token = None
@@ -522,52 +743,43 @@ class DownloadMessageAttachmentAction(ActionHandler):
             if not auth_token:
                 raise Exception("No authentication token available")
 
-            # Download attachment from Front's download endpoint
+            # Download attachments from Front's download endpoint
             headers = {"Authorization": f"Bearer {auth_token}"}
+            budget = AttachmentBudget(inputs.get("max_total_bytes") or MAX_ATTACHMENTS_TOTAL_BYTES)
+            semaphore = asyncio.Semaphore(DOWNLOAD_CONCURRENCY)
 
             async with aiohttp.ClientSession() as session:
-                async with session.get(attachment_url, headers=headers) as resp:
-                    if resp.status >= 400:
-                        error_text = await resp.text()
-                        return {
-                            "file": {},
-                            "result": False,
-                            "error": f"HTTP {resp.status}: {error_text}"
-                        }
-
-                    # Read complete file content as binary
-                    file_bytes = await resp.read()
-
-                    # Extract content type from response
-                    content_type = resp.headers.get('content-type', 'application/octet-stream')
-
-                    # Extract filename from Content-Disposition header or URL
-                    filename = "attachment"
-                    content_disposition = resp.headers.get('content-disposition', '')
-                    if 'filename=' in content_disposition:
-                        filename = content_disposition.split('filename=')[1].strip('"\'')
-                    else:
-                        from urllib.parse import urlparse
-                        url_path = urlparse(attachment_url).path
-                        if url_path:
-                            filename = url_path.split('/')[-1] or "attachment"
-
-                    # Encode to base64 for JSON transport and attachment forwarding
-                    content_b64 = base64.b64encode(file_bytes).decode('utf-8')
+                async def download(url: str) -> Dict[str, Any]:
+                    async with semaphore:
+                        return await download_attachment(session, url, headers, budget)
 
-                    return {
-                        "file": {
-                            "content": content_b64,  # Use this in create_message attachments
-                            "name": filename,
-                            "contentType": content_type,
-                            "size": len(file_bytes)
-                        },
-                        "result": True
-                    }
+                results = await asyncio.gather(
+                    *(download(url) for url in attachment_urls), return_exceptions=True
+                )
+
+            if single:
+                if isinstance(results[0], AttachmentError):
+                    return {"file": {}, "result": False, "error": str(results[0])}
+                if isinstance(results[0], BaseException):
+                    raise results[0]
+                return {"file": results[0], "result": True}
+
+            files = []
+            errors = []
+            for url, outcome in zip(attachment_urls, results):
+                if isinstance(outcome, BaseException):
+                    errors.append({"attachment_url": url, "error": str(outcome)})
+                else:
+                    files.append(outcome)
+
+            response = {"files": files, "errors": errors, "result": not errors}
+            if errors:
+                response["error"] = f"{len(errors)} of {len(attachment_urls)} attachments failed to download"
+            return response
 
         except Exception as e:
             return {
-                "file": {},
+                "file" if single else "files": {} if single else [],
                 "result": False,
                 "error": f"Error downloading attachment: {str(e)}"
             }
@@ -666,127 +878,10 @@ class CreateMessageAction(ActionHandler):
         message_data: Dict[str, Any], attachments: List[Dict[str, Any]]
     ) -> Dict[str, Any]:
         """Send message with attachments using multipart/form-data"""
-        # Get auth token from context
-        auth_token = None
-        if context.auth and "credentials" in context.auth:
-            auth_token = context.auth["credentials"].get("access_token")
-
-        if not auth_token:
-            raise Exception("No authentication token available")
-
-        # Build multipart form data
-        form = aiohttp.FormData()
-
-        # Add body field - convert plain text newlines to HTML if needed
-        body_content = message_data['body']
-
-        # If body doesn't contain HTML tags, convert newlines to <br> for proper rendering
-        if '<' not in body_content and '>' not in body_content:
-            # Plain text - convert newlines to HTML breaks
-            body_content = body_content.replace('\r\n', '<br>').replace('\n', '<br>').replace('\r', '<br>')
-
-        form.add_field('body', body_content)
-
-        # Add 'to' recipients as array
-        if 'to' in message_data:
-            for recipient in message_data['to']:
-                form.add_field('to[]', recipient)
-
-        # Add optional fields
-        if 'cc' in message_data:
-            for recipient in message_data['cc']:
-                form.add_field('cc[]', recipient)
-        if 'bcc' in message_data:
-            for recipient in message_data['bcc']:
-                form.add_field('bcc[]', recipient)
-        if 'subject' in message_data:
-            form.add_field('subject', message_data['subject'])
-        if 'author_id' in message_data:
-            form.add_field('author_id', message_data['author_id'])
-        if 'sender_name' in message_data:
-            form.add_field('sender_name', message_data['sender_name'])
-        if 'text' in message_data:
-            form.add_field('text', message_data['text'])
-        if 'signature_id' in message_data:
-            form.add_field('signature_id', message_data['signature_id'])
-        if 'should_add_default_signature' in message_data:
-            form.add_field('should_add_default_signature', str(message_data['should_add_default_signature']).lower())
-
-        # Add each attachment as binary file
-        for idx, attachment in enumerate(attachments):
-            filename = attachment.get("filename", f"attachment_{idx}")
-            content_b64 = attachment.get("content", "")
-            content_type = attachment.get("content_type", "application/octet-stream")
-
-            # Validate content exists
-            if not content_b64:
-                raise Exception(f"Attachment '{filename}' has no content provided")
-
-            # Clean up base64 string (remove whitespace/newlines that might be present)
-            content_b64_cleaned = content_b64.strip().replace('\n', '').replace('\r', '').replace(' ', '').replace('\t', '')
-
-            # Check length before and after cleaning
-            original_length = len(content_b64)
-            cleaned_length = len(content_b64_cleaned)
-
-            # Base64 must be multiple of 4 (accounting for padding)
-            # If it's not, check if adding padding would make it valid
-            padding_needed = cleaned_length % 4
-            if padding_needed != 0:
-                content_b64_cleaned += '=' * (4 - padding_needed)
-
-            # Validate minimum size - a small file should be at least 100 chars in base64
-            # PDFs and images should be much larger (typically thousands of chars)
-            if cleaned_length < 100:
-                raise Exception(
-                    f"Attachment '{filename}' has suspiciously short base64 content "
-                    f"({cleaned_length} characters after cleaning from {original_length} original). "
-                    f"This suggests the content may be truncated or incomplete. "
-                    f"Expected at least 100 characters for a valid file."
-                )
-
-            # Decode base64 content
-            try:
-                file_bytes = base64.b64decode(content_b64_cleaned, validate=True)
-            except Exception as e:
-                raise Exception(
-                    f"Failed to decode attachment '{filename}': {str(e)}. "
-                    f"Content length: {cleaned_length} chars. "
-                    f"Make sure the content is valid base64-encoded data."
-                )
-
-            # Validate file is not empty after decoding
-            if not file_bytes or len(file_bytes) == 0:
-                raise Exception(f"Attachment '{filename}' decoded to empty content")
-
-            # Log file size for debugging
-            file_size = len(file_bytes)
-
-            # Wrap bytes in BytesIO to create file-like object (like open('file', 'rb'))
-            file_obj = io.BytesIO(file_bytes)
-            file_obj.seek(0)  # Ensure we're at the beginning of the stream
-
-            # Add file to form data - Front expects 'attachments[]' for multiple files
-            form.add_field(
-                'attachments[]',
-                file_obj,
-                filename=filename,
-                content_type=content_type
-            )
-
-        # Send request with aiohttp
-        url = f"{FRONT_API_BASE}/channels/{channel_id}/messages"
-        headers = {
-            "Authorization": f"Bearer {auth_token}"
-        }
-
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, data=form, headers=headers) as resp:
-                if resp.status >= 400:
-                    error_text = await resp.text()
-                    return {"error": f"HTTP {resp.status}: {error_text}"}
-
-                return await resp.json()
+        form = build_message_form(message_data, attachments)
+        return await post_message_form(
+            context, f"{FRONT_API_BASE}/channels/{channel_id}/messages", form
+        )
 
 @front.action("list_channels")
 class ListChannelsAction(ActionHandler):
@@ -1144,18 +1239,7 @@ class ListInboxesAction(ActionHandler):
             raw_inboxes = response.get("_results", [])
 
             for raw_inbox in raw_inboxes:
-                inbox = {
-                    "id": raw_inbox.get("id", ""),
-                    "name": raw_inbox.get("name", ""),
-                    "address": raw_inbox.get("address", ""),
-                }
-                # Add optional fields
-                if 'type' in raw_inbox:
-                    inbox['type'] = raw_inbox['type']
-                if 'send_as' in raw_inbox:
-                    inbox['send_as'] = raw_inbox['send_as']
-
-                inboxes.append(inbox)
+                inboxes.append(FrontDataParser.parse_inbox(raw_inbox))
 
             return {
                 "inboxes": inboxes,
@@ -1194,20 +1278,7 @@ class ListTeammatesAction(ActionHandler):
             raw_teammates = response.get("_results", [])
 
             for raw_teammate in raw_teammates:
-                teammate = {
-                    "id": raw_teammate.get("id", ""),
-                    "email": raw_teammate.get("email", ""),
-                    "username": raw_teammate.get("username", ""),
-                    "first_name": raw_teammate.get("first_name", ""),
-                    "last_name": raw_teammate.get("last_name", ""),
-                    "is_admin": raw_teammate.get("is_admin", False),
-                    "is_available": raw_teammate.get("is_available", True),
-                    "is_blocked": raw_teammate.get("is_blocked", False),
-                    "type": raw_teammate.get("type", "user"),
-                    "custom_fields": raw_teammate.get("custom_fields", {})
-                }
-
-                teammates.append(teammate)
+                teammates.append(FrontDataParser.parse_teammate(raw_teammate))
 
             return {
                 "teammates": teammates,
@@ -1272,25 +1343,22 @@ class GetTeammateAction(ActionHandler):
 class FindTeammateAction(ActionHandler):
     async def execute(self, inputs: Dict[str, Any], context: ExecutionContext):
         """
-        Find teammates by searching name or email (client-side filtering).
-        This is a helper function since Front API doesn't support search.
+        Find teammates by searching name or email.
+        Front has no teammate search, so this filters the cached teammate directory.
         """
         try:
             search_query = inputs["search_query"].lower()
 
-            # Use the existing list_teammates action
-            list_action = ListTeammatesAction()
-            list_result = await list_action.execute({"limit": 100}, context)
-
-            if not list_result["result"]:
+            try:
+                teammates = await directory_cache.get(context, "teammates", refresh=inputs.get("refresh", False))
+            except Exception as e:
                 return {
                     "teammates": [],
                     "result": False,
-                    "error": f"Failed to fetch teammates: {list_result.get('error', 'Unknown error')}"
+                    "error": f"Failed to fetch teammates: {str(e)}"
                 }
 
             # Filter teammates by search query (case-insensitive partial match)
-            teammates = list_result["teammates"]
             matching_teammates = []
 
             for teammate in teammates:
@@ -1326,25 +1394,22 @@ class FindTeammateAction(ActionHandler):
 class FindInboxAction(ActionHandler):
     async def execute(self, inputs: Dict[str, Any], context: ExecutionContext):
         """
-        Find inboxes by searching name (client-side filtering).
-        This is a helper function since Front API doesn't support search.
+        Find inboxes by searching name.
+        Front has no inbox search, so this filters the cached inbox directory.
         """
         try:
             inbox_name = inputs["inbox_name"].lower()
 
-            # Use the existing list_inboxes action
-            list_action = ListInboxesAction()
-            list_result = await list_action.execute({"limit": 100}, context)
-
-            if not list_result["result"]:
+            try:
+                inboxes = await directory_cache.get(context, "inboxes", refresh=inputs.get("refresh", False))
+            except Exception as e:
                 return {
                     "inboxes": [],
                     "result": False,
-                    "error": f"Failed to fetch inboxes: {list_result.get('error', 'Unknown error')}"
+                    "error": f"Failed to fetch inboxes: {str(e)}"
                 }
 
             # Filter inboxes by name (case-insensitive partial match)
-            inboxes = list_result["inboxes"]
             matching_inboxes = []
 
             for inbox in inboxes:
@@ -1371,53 +1436,30 @@ class FindInboxAction(ActionHandler):
 class FindConversationAction(ActionHandler):
     async def execute(self, inputs: Dict[str, Any], context: ExecutionContext):
         """
-        Find conversations by searching recipient or subject (client-side filtering).
-        This is a helper function since Front API doesn't support search.
+        Find conversations with Front's search endpoint, following every results page.
+        Matches subject, message content and recipients; search_query may also use
+        Front search syntax such as from:, to: or is:open.
         """
         try:
-            inbox_id = inputs["inbox_id"]
-            search_query = inputs["search_query"].lower()
-
-            # Use the existing list_inbox_conversations action
-            list_action = ListInboxConversationsAction()
-            list_result = await list_action.execute({
-                "inbox_id": inbox_id,
-                "limit": 100
-            }, context)
-
-            if not list_result["result"]:
-                return {
-                    "conversations": [],
-                    "result": False,
-                    "error": f"Failed to fetch conversations: {list_result.get('error', 'Unknown error')}"
-                }
-
-            # Filter conversations by search query (case-insensitive partial match)
-            conversations = list_result["conversations"]
-            matching_conversations = []
+            search_query = inputs["search_query"].strip()
+            if inputs.get("inbox_id"):
+                search_query = f"{search_query} inbox:{inputs['inbox_id']}"
 
-            for conversation in conversations:
-                # Search in subject
-                subject = (conversation.get("subject") or "").lower()
+            max_results = min(inputs.get("limit", 50), MAX_SEARCH_RESULTS)
 
-                # Search in recipient fields (handle, name, email)
-                recipient = conversation.get("recipient") or {}
-                recipient_handle = (recipient.get("handle") or "").lower()
-                recipient_name = (recipient.get("name") or "").lower()
-                # Some recipients may have email in handle or other fields
-                recipient_str = f"{recipient_handle} {recipient_name}".lower()
+            page = await fetch_all_pages(
+                context,
+                f"{FRONT_API_BASE}/conversations/search/{quote(search_query, safe='')}",
+                max_items=max_results
+            )
 
-                # Check if search query matches any field
-                if (search_query in subject or
-                    search_query in recipient_handle or
-                    search_query in recipient_name or
-                    search_query in recipient_str):
-                    matching_conversations.append(conversation)
+            conversations = [FrontDataParser.parse_conversation(raw_conv) for raw_conv in page["results"]]
 
             return {
-                "conversations": matching_conversations,
+                "conversations": conversations,
                 "result": True,
-                "count": len(matching_conversations)
+                "count": len(conversations),
+                "total": page["total"] if page["total"] is not None else len(conversations)
             }
 
         except Exception as e:
@@ -167,6 +167,33 @@ async def test_download_message_attachment():
         except Exception as e:
             print(f"✗ Error testing download_message_attachment: {str(e)}")
 
+async def test_download_message_attachments():
+    print("Testing download_message_attachment with several URLs...")
+
+    auth = {
+        "auth_type": "PlatformOauth2",
+        "credentials": {
+            "access_token": "mock_access_token"
+        }
+    }
+
+    inputs = {
+        "attachment_urls": [
+            "https://api2.frontapp.com/download/test_attachment_1",
+            "https://api2.frontapp.com/download/test_attachment_2"
+        ],
+        "max_total_bytes": 10485760
+    }
+
+    async with ExecutionContext(auth=auth) as context:
+        try:
+            result = await front.execute_action("download_message_attachment", inputs, context)
+            print(f"Result: {result}")
+            assert result.get("result") is not None
+            print("✓ download_message_attachment (several URLs) test passed")
+        except Exception as e:
+            print(f"✗ Error testing download_message_attachment (several URLs): {str(e)}")
+
 async def test_create_message_reply():
     print("Testing create_message_reply...")
 
@@ -499,6 +526,7 @@ async def main():
     await test_list_conversation_messages()
     await test_get_message()
     await test_download_message_attachment()
+    await test_download_message_attachments()
     await test_create_message_reply()
     await test_create_message()
 
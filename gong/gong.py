@@ -1,9 +1,17 @@
 from autohive_integrations_sdk import (
     Integration, ExecutionContext, ActionHandler, ActionResult, ConnectedAccountHandler, ConnectedAccountInfo
 )
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, AsyncIterator
 from datetime import datetime, timedelta, timezone
+from collections import OrderedDict
+import asyncio
+import hashlib
+import heapq
 import json
+import math
+import re
+import time
+import weakref
 
 
 
@@ -38,6 +46,436 @@ class GongAPIClient:
         else:
             raise ValueError(f"Unsupported HTTP method: {method}")
 
+    async def iter_extensive_calls(self, call_filter: Dict[str, Any], content_selector: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """Yield every call matching the filter from calls/extensive, following records.cursor"""
+        cursor = None
+        while True:
+            data = {"filter": call_filter, "contentSelector": content_selector}
+            if cursor:
+                data["cursor"] = cursor
+            response = await self._make_request("calls/extensive", method="POST", data=data)
+            for call in response.get("calls", []):
+                yield call
+            cursor = (response.get("records") or {}).get("cursor")
+            if not cursor:
+                return
+
+    async def fetch_transcripts(self, call_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Fetch raw transcript segments for many calls.
+
+        IDs are sent to calls/transcript in batches of TRANSCRIPT_BATCH_SIZE, at most
+        TRANSCRIPT_CONCURRENCY batches at a time, following records.cursor within each batch.
+        """
+        semaphore = asyncio.Semaphore(TRANSCRIPT_CONCURRENCY)
+        transcripts: Dict[str, List[Dict[str, Any]]] = {}
+
+        async def fetch_batch(batch: List[str]):
+            cursor = None
+            async with semaphore:
+                while True:
+                    data = {"filter": {"callIds": batch, "fromDateTime": GONG_EARLIEST_DATETIME}}
+                    if cursor:
+                        data["cursor"] = cursor
+                    response = await self._make_request("calls/transcript", method="POST", data=data)
+                    for call_transcript in response.get("callTranscripts", []):
+                        call_id = str(call_transcript.get("callId", ""))
+                        transcripts.setdefault(call_id, []).extend(call_transcript.get("transcript", []))
+                    cursor = (response.get("records") or {}).get("cursor")
+                    if not cursor:
+                        return
+
+        batches = [call_ids[i:i + TRANSCRIPT_BATCH_SIZE] for i in range(0, len(call_ids), TRANSCRIPT_BATCH_SIZE)]
+        await asyncio.gather(*(fetch_batch(batch) for batch in batches))
+        return transcripts
+
+    async def fetch_calls_by_ids(self, call_ids: List[str], content_selector: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Fetch calls/extensive records for many call IDs, batched and capped like fetch_transcripts"""
+        semaphore = asyncio.Semaphore(TRANSCRIPT_CONCURRENCY)
+        calls: Dict[str, Dict[str, Any]] = {}
+
+        async def fetch_batch(batch: List[str]):
+            async with semaphore:
+                call_filter = {"callIds": batch, "fromDateTime": GONG_EARLIEST_DATETIME}
+                async for call in self.iter_extensive_calls(call_filter, content_selector):
+                    call_id = str(call.get("id") or (call.get("metaData") or {}).get("id") or "")
+                    if call_id:
+                        calls[call_id] = call
+
+        batches = [call_ids[i:i + TRANSCRIPT_BATCH_SIZE] for i in range(0, len(call_ids), TRANSCRIPT_BATCH_SIZE)]
+        await asyncio.gather(*(fetch_batch(batch) for batch in batches))
+        return calls
+
+
+# ---- Transcript Helpers ----
+
+# Earliest fromDateTime accepted when filtering by call IDs alone
+GONG_EARLIEST_DATETIME = "2015-01-01T00:00:00.000Z"
+# Call IDs per calls/transcript request
+TRANSCRIPT_BATCH_SIZE = 100
+# Gong allows 3 requests per second, so only a few batches run at once
+TRANSCRIPT_CONCURRENCY = 3
+
+
+def build_speaker_map(parties: List[Dict[str, Any]]) -> Dict[str, str]:
+    """Map Gong speaker IDs to display names from a call's parties"""
+    speaker_map = {}
+    for participant in parties:
+        speaker_id = str(participant.get("speakerId") or
+                         participant.get("userId") or
+                         participant.get("id") or "")
+
+        name = (participant.get("name") or
+                participant.get("title") or
+                f"{participant.get('firstName', '')} {participant.get('lastName', '')}".strip() or
+                participant.get("emailAddress") or
+                participant.get("email") or "")
+
+        if speaker_id and name:
+            speaker_map[speaker_id] = name
+    return speaker_map
+
+
+def normalize_transcript(segments: List[Dict[str, Any]], speaker_map: Dict[str, str]) -> List[Dict[str, Any]]:
+    """Flatten Gong transcript segments into speaker-attributed sentences with times in seconds"""
+    transcript = []
+    for segment in segments:
+        raw_speaker_id = segment.get("speakerId", "")
+        speaker_id = str(raw_speaker_id) if raw_speaker_id is not None else ""
+
+        speaker_name = speaker_map.get(speaker_id, f"Speaker {speaker_id}" if speaker_id else "Unknown Speaker")
+
+        for sentence in segment.get("sentences", []):
+            transcript.append({
+                "speaker_id": speaker_id,
+                "speaker_name": speaker_name,
+                "start_time": sentence.get("start", 0) / 1000,
+                "end_time": sentence.get("end", 0) / 1000,
+                "text": sentence.get("text", "")
+            })
+    return transcript
+
+
+# ---- Transcript Search Index ----
+
+# Calls listed for a date range are reused for this long before the range is listed again
+CALL_LISTING_TTL = 900
+# Calls with no transcript yet are checked again after this long
+TRANSCRIPT_RECHECK_INTERVAL = 300
+# Indexes unused for this long, or beyond the most recently used MAX_TRANSCRIPT_INDEXES, are dropped
+TRANSCRIPT_INDEX_IDLE_TTL = 3600
+MAX_TRANSCRIPT_INDEXES = 16
+BM25_K1 = 1.2
+BM25_B = 0.75
+MAX_SEGMENTS_PER_RESULT = 5
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+_STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have i if in into is it its of on or so "
+    "that the their then there these they this to was we were will with you your".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in _TOKEN_PATTERN.findall(text.lower()) if token not in _STOPWORDS]
+
+
+class TranscriptIndex:
+    """
+    In-memory BM25 index over the calls of one Gong account.
+
+    Each document is a passage of a call: a speaker turn from the transcript, the
+    title, a topic or a point of interest. Postings map a term to the documents
+    that contain it, so a query only touches documents sharing a term with it.
+    """
+
+    def __init__(self):
+        self.calls: Dict[str, Dict[str, Any]] = {}
+        self.documents: List[Dict[str, Any]] = []
+        self.doc_lengths: List[int] = []
+        self.postings: Dict[str, List[tuple]] = {}
+        self.total_length = 0
+        # (fromDateTime, toDateTime) -> (listed at, IDs of the calls Gong returned for the range)
+        self.listed_ranges: Dict[tuple, tuple] = {}
+        # Calls whose transcript is indexed, and when calls without one were last checked
+        self.transcribed: set = set()
+        self.transcript_checked_at: Dict[str, float] = {}
+
+    def has_call(self, call_id: str) -> bool:
+        return call_id in self.calls
+
+    def needs_transcript(self, call_id: str) -> bool:
+        """True until a transcript is indexed; Gong may not have one ready when the call is first seen"""
+        if call_id in self.transcribed:
+            return False
+        checked_at = self.transcript_checked_at.get(call_id)
+        return checked_at is None or time.monotonic() - checked_at >= TRANSCRIPT_RECHECK_INTERVAL
+
+    def add_call(self, call: Dict[str, Any], passages: List[Dict[str, Any]]) -> None:
+        """Index a call's title, topics and points of interest; a call is only added once"""
+        if call["id"] in self.calls:
+            return
+        self.calls[call["id"]] = call
+        self._add_passages(call["id"], passages)
+
+    def add_transcript(self, call_id: str, passages: List[Dict[str, Any]]) -> None:
+        """Index a call's transcript passages, or note that it has no transcript yet"""
+        if call_id in self.transcribed:
+            return
+        if not passages:
+            self.transcript_checked_at[call_id] = time.monotonic()
+            return
+        self.transcribed.add(call_id)
+        self.transcript_checked_at.pop(call_id, None)
+        self._add_passages(call_id, passages)
+
+    def _add_passages(self, call_id: str, passages: List[Dict[str, Any]]) -> None:
+        for passage in passages:
+            tokens = tokenize(passage["text"])
+            if not tokens:
+                continue
+            doc_id = len(self.documents)
+            self.documents.append(dict(passage, call_id=call_id))
+            self.doc_lengths.append(len(tokens))
+            self.total_length += len(tokens)
+            counts: Dict[str, int] = {}
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            for token, count in counts.items():
+                self.postings.setdefault(token, []).append((doc_id, count))
+
+    def search(self, query: str, call_ids: Optional[set] = None, limit: int = 50) -> Dict[str, Any]:
+        """Rank calls (optionally restricted to call_ids) by their best-matching passages"""
+        terms = set(tokenize(query))
+        if not terms or not self.documents:
+            return {"results": [], "total_count": 0}
+
+        doc_count = len(self.documents)
+        average_length = self.total_length / doc_count
+        scores: Dict[int, float] = {}
+        for term in terms:
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, tf in postings:
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_lengths[doc_id] / average_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+        hits_by_call: Dict[str, List[tuple]] = {}
+        for doc_id, score in scores.items():
+            call_id = self.documents[doc_id]["call_id"]
+            if call_ids is not None and call_id not in call_ids:
+                continue
+            hits_by_call.setdefault(call_id, []).append((score, doc_id))
+
+        ranked = []
+        for call_id, hits in hits_by_call.items():
+            top_hits = heapq.nlargest(MAX_SEGMENTS_PER_RESULT, hits)
+            # Best passage dominates; further strong passages add a little
+            call_score = top_hits[0][0] + 0.25 * sum(score for score, _ in top_hits[1:])
+            ranked.append((call_score, call_id, top_hits))
+        ranked.sort(key=lambda item: item[0], reverse=True)
+
+        results = []
+        for call_score, call_id, top_hits in ranked[:limit]:
+            call = self.calls[call_id]
+            results.append({
+                "call_id": call_id,
+                "title": call.get("title", ""),
+                "started": call.get("started"),
+                "relevance_score": round(call_score, 4),
+                "matched_segments": [
+                    {
+                        "text": self.documents[doc_id]["text"],
+                        "start_time": self.documents[doc_id]["start_time"],
+                        "end_time": self.documents[doc_id]["end_time"],
+                        "speaker_id": self.documents[doc_id]["speaker_id"],
+                        "speaker_name": self.documents[doc_id]["speaker_name"],
+                        "source": self.documents[doc_id]["source"],
+                        "score": round(score, 4)
+                    }
+                    for score, doc_id in top_hits
+                ]
+            })
+        return {"results": results, "total_count": len(ranked)}
+
+
+def _passage(text: str, source: str, start_time: float = 0, end_time: float = 0,
+             speaker_id: str = "", speaker_name: str = "") -> Dict[str, Any]:
+    return {"text": text, "source": source, "start_time": start_time, "end_time": end_time,
+            "speaker_id": speaker_id, "speaker_name": speaker_name}
+
+
+def build_call_passages(call: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Split a call's metadata into indexable passages: title, topics and points of interest"""
+    passages = []
+    if call.get("title"):
+        passages.append(_passage(call["title"], "title"))
+
+    content = call.get("content") or {}
+    for topic in content.get("topics", []) or []:
+        if topic.get("name"):
+            passages.append(_passage(topic["name"], "topic"))
+
+    points_of_interest = content.get("pointsOfInterest") or []
+    if isinstance(points_of_interest, dict):
+        # Newer responses group points of interest, e.g. {"actionItems": [...]}
+        points_of_interest = [item for group in points_of_interest.values() if isinstance(group, list) for item in group]
+    for poi in points_of_interest:
+        text = poi.get("snippet") or f"{poi.get('action', '')} {poi.get('concept', '')}".strip()
+        if text:
+            start = poi.get("snippetStartTime", poi.get("startTime", 0)) or 0
+            end = poi.get("snippetEndTime", start) or start
+            passages.append(_passage(text, "point_of_interest", start, end))
+    return passages
+
+
+def build_transcript_passages(transcript_segments: List[Dict[str, Any]], speaker_map: Dict[str, str]) -> List[Dict[str, Any]]:
+    """One passage per speaker turn keeps hits attributable and long enough to rank"""
+    passages = []
+    for segment in transcript_segments:
+        sentences = segment.get("sentences", [])
+        if not sentences:
+            continue
+        raw_speaker_id = segment.get("speakerId", "")
+        speaker_id = str(raw_speaker_id) if raw_speaker_id is not None else ""
+        passages.append(_passage(
+            " ".join(sentence.get("text", "") for sentence in sentences),
+            "transcript",
+            sentences[0].get("start", 0) / 1000,
+            sentences[-1].get("end", 0) / 1000,
+            speaker_id,
+            speaker_map.get(speaker_id, f"Speaker {speaker_id}" if speaker_id else "Unknown Speaker")
+        ))
+    return passages
+
+
+class TranscriptIndexStore:
+    """Transcript indexes per Gong account, evicted when idle or least recently used."""
+
+    # Auth fields that change on every token refresh and say nothing about the account
+    _VOLATILE_AUTH_FIELDS = frozenset({
+        "access_token", "refresh_token", "id_token", "token_type", "expires_at", "expires_in", "scope"
+    })
+
+    def __init__(self, idle_ttl: float = TRANSCRIPT_INDEX_IDLE_TTL, max_indexes: int = MAX_TRANSCRIPT_INDEXES):
+        self.idle_ttl = idle_ttl
+        self.max_indexes = max_indexes
+        # account key -> (last used, index, ingestion lock per event loop)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    @classmethod
+    def _stable_auth(cls, value: Any) -> Any:
+        if isinstance(value, dict):
+            return {key: cls._stable_auth(item) for key, item in value.items() if key not in cls._VOLATILE_AUTH_FIELDS}
+        return value
+
+    @classmethod
+    def _account_key(cls, context: ExecutionContext) -> str:
+        # api_base_url is issued per Gong customer, and Gong API access is company-wide,
+        # so it identifies whose calls an index holds without depending on the current token
+        identity = json.dumps({
+            "base_url": (getattr(context, "metadata", None) or {}).get("api_base_url"),
+            "auth": cls._stable_auth(getattr(context, "auth", None) or {})
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(identity.encode()).hexdigest()
+
+    def _entry(self, context: ExecutionContext, refresh: bool = False) -> tuple:
+        now = time.monotonic()
+        for key, (used_at, _, _) in list(self._entries.items()):
+            if now - used_at > self.idle_ttl:
+                del self._entries[key]
+
+        key = self._account_key(context)
+        entry = self._entries.get(key)
+        if entry is None or refresh:
+            entry = (now, TranscriptIndex(), entry[2] if entry else weakref.WeakKeyDictionary())
+        else:
+            entry = (now, entry[1], entry[2])
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_indexes:
+            self._entries.popitem(last=False)
+        return entry
+
+    def get(self, context: ExecutionContext, refresh: bool = False) -> TranscriptIndex:
+        return self._entry(context, refresh)[1]
+
+    def lock(self, context: ExecutionContext) -> asyncio.Lock:
+        """Serialise ingestion per account so concurrent searches don't fetch the same transcripts"""
+        # Locks are bound to an event loop; keyed weakly so a finished loop's lock goes with it
+        locks = self._entry(context)[2]
+        loop = asyncio.get_running_loop()
+        if loop not in locks:
+            locks[loop] = asyncio.Lock()
+        return locks[loop]
+
+
+# Global transcript index store
+transcript_indexes = TranscriptIndexStore()
+
+
+async def ingest_calls(client: GongAPIClient, index: TranscriptIndex, from_datetime: str, to_datetime: str) -> Dict[str, Any]:
+    """
+    Bring the index up to date for a date range.
+
+    Pages through every call in the range (unless it was listed within
+    CALL_LISTING_TTL), then fetches transcripts for calls that don't have one
+    indexed yet, including calls whose transcript wasn't ready last time.
+    Returns the IDs of the public calls in the range and how many transcripts were indexed.
+    """
+    range_key = (from_datetime, to_datetime)
+    listing = index.listed_ranges.get(range_key)
+    if listing is not None and time.monotonic() - listing[0] < CALL_LISTING_TTL:
+        call_ids = listing[1]
+    else:
+        call_filter = {"fromDateTime": from_datetime, "toDateTime": to_datetime}
+        content_selector = {
+            "context": "Extended",
+            "exposedFields": {
+                "parties": True,
+                "content": {
+                    "topics": True,
+                    "pointsOfInterest": True
+                }
+            }
+        }
+
+        call_ids = set()
+        async for call in client.iter_extensive_calls(call_filter, content_selector):
+            # Skip private calls
+            if bool(call.get("isPrivate", False)):
+                continue
+            call_id = str(call.get("id") or (call.get("metaData") or {}).get("id") or "")
+            if not call_id:
+                continue
+            call_ids.add(call_id)
+            if not index.has_call(call_id):
+                meta = call.get("metaData") or call
+                index.add_call(
+                    {
+                        "id": call_id,
+                        "title": meta.get("title", ""),
+                        "started": meta.get("started"),
+                        "speaker_map": build_speaker_map(call.get("parties", []))
+                    },
+                    build_call_passages({"title": meta.get("title", ""), "content": call.get("content")})
+                )
+
+        call_ids = frozenset(call_ids)
+        index.listed_ranges[range_key] = (time.monotonic(), call_ids)
+
+    pending = sorted(call_id for call_id in call_ids if index.needs_transcript(call_id))
+    transcripts = await client.fetch_transcripts(pending) if pending else {}
+    for call_id in pending:
+        index.add_transcript(call_id, build_transcript_passages(
+            transcripts.get(call_id, []),
+            index.calls[call_id]["speaker_map"]
+        ))
+
+    return {"call_ids": call_ids, "calls_indexed": sum(1 for call_id in pending if call_id in index.transcribed)}
+
 # ---- Action Handlers ----
 
 @gong.action("list_calls")
@@ -141,22 +579,7 @@ class GetCallTranscriptAction(ActionHandler):
                 ext_calls = ext_response.get("calls", [])
                 
                 if ext_calls:
-                    ext_call = ext_calls[0]
-                    participants = ext_call.get("parties", [])
-                    
-                    for participant in participants:
-                        speaker_id = str(participant.get("speakerId") or 
-                                       participant.get("userId") or 
-                                       participant.get("id") or "")
-                        
-                        name = (participant.get("name") or 
-                               participant.get("title") or
-                               f"{participant.get('firstName', '')} {participant.get('lastName', '')}".strip() or
-                               participant.get("emailAddress") or
-                               participant.get("email") or "")
-                        
-                        if speaker_id and name:
-                            speaker_map[speaker_id] = name
+                    speaker_map = build_speaker_map(ext_calls[0].get("parties", []))
             except Exception as e:
                 print(f"Warning: Failed to fetch speaker details: {e}")
 
@@ -171,21 +594,7 @@ class GetCallTranscriptAction(ActionHandler):
             transcript = []
             call_transcripts = response.get("callTranscripts", [])
             if call_transcripts:
-                for segment in call_transcripts[0].get("transcript", []):
-                    raw_speaker_id = segment.get("speakerId", "")
-                    speaker_id = str(raw_speaker_id) if raw_speaker_id is not None else ""
-                    topic = segment.get("topic", "")
-                    
-                    speaker_name = speaker_map.get(speaker_id, f"Speaker {speaker_id}" if speaker_id else "Unknown Speaker")
-                    
-                    for sentence in segment.get("sentences", []):
-                        transcript.append({
-                            "speaker_id": speaker_id,
-                            "speaker_name": speaker_name,
-                            "start_time": sentence.get("start", 0) / 1000,
-                            "end_time": sentence.get("end", 0) / 1000,
-                            "text": sentence.get("text", "")
-                        })
+                transcript = normalize_transcript(call_transcripts[0].get("transcript", []), speaker_map)
             
             return ActionResult(data={
                 "call_id": call_id,
@@ -198,6 +607,53 @@ class GetCallTranscriptAction(ActionHandler):
                 "error": str(e)
             })
 
+@gong.action("get_call_transcripts")
+class GetCallTranscriptsAction(ActionHandler):
+    async def execute(self, inputs: Dict[str, Any], context: ExecutionContext):
+        client = GongAPIClient(context)
+        # Keep the caller's order and drop duplicates
+        call_ids = list(dict.fromkeys(str(call_id) for call_id in inputs["call_ids"]))
+        
+        try:
+            # One calls/extensive request per batch gives privacy flags and speaker names
+            calls = await client.fetch_calls_by_ids(call_ids, {"exposedFields": {"parties": True}})
+            
+            public_ids = []
+            errors = []
+            for call_id in call_ids:
+                call = calls.get(call_id)
+                if call is None:
+                    errors.append({"call_id": call_id, "error": "call_not_found"})
+                elif bool(call.get("isPrivate", (call.get("metaData") or {}).get("isPrivate", False))):
+                    errors.append({"call_id": call_id, "error": "private_call_filtered"})
+                else:
+                    public_ids.append(call_id)
+            
+            raw_transcripts = await client.fetch_transcripts(public_ids) if public_ids else {}
+            
+            transcripts = []
+            for call_id in public_ids:
+                call = calls[call_id]
+                transcripts.append({
+                    "call_id": call_id,
+                    "title": (call.get("metaData") or call).get("title", ""),
+                    "transcript": normalize_transcript(
+                        raw_transcripts.get(call_id, []),
+                        build_speaker_map(call.get("parties", []))
+                    )
+                })
+            
+            return ActionResult(data={
+                "transcripts": transcripts,
+                "errors": errors
+            })
+        except Exception as e:
+            return ActionResult(data={
+                "transcripts": [],
+                "errors": [],
+                "error": str(e)
+            })
+
 @gong.action("get_call_details")
 class GetCallDetailsAction(ActionHandler):
     async def execute(self, inputs: Dict[str, Any], context: ExecutionContext):
@@ -282,96 +738,37 @@ class SearchCallsAction(ActionHandler):
     async def execute(self, inputs: Dict[str, Any], context: ExecutionContext):
         client = GongAPIClient(context)
         
-        # Use calls/extensive endpoint with proper JSON structure
-        data = {
-            "filter": {
-                "fromDateTime": None,
-                "toDateTime": None
-            },
-            "contentSelector": {
-                "context": "Extended",
-                "exposedFields": {
-                    "content": {
-                        "topics": True,
-                        "pointsOfInterest": True
-                    }
-                }
-            }
-        }
-        
         if inputs.get("from_date"):
-            from datetime import datetime
-            from_dt = datetime.strptime(inputs["from_date"], "%Y-%m-%d")
-            data["filter"]["fromDateTime"] = from_dt.strftime("%Y-%m-%dT00:00:00.000Z")
+            from_dt = datetime.strptime(inputs["from_date"], "%Y-%m-%d").replace(tzinfo=timezone.utc)
         else:
             # Default to last 30 days if no date provided
-            from datetime import datetime, timedelta
-            start_date = datetime.now() - timedelta(days=30)
-            data["filter"]["fromDateTime"] = start_date.strftime("%Y-%m-%dT00:00:00.000Z")
+            from_dt = (datetime.now(timezone.utc) - timedelta(days=30)).replace(hour=0, minute=0, second=0, microsecond=0)
             
         if inputs.get("to_date"):
-            from datetime import datetime
-            to_dt = datetime.strptime(inputs["to_date"], "%Y-%m-%d")
-            data["filter"]["toDateTime"] = to_dt.strftime("%Y-%m-%dT23:59:59.999Z")
+            to_dt = datetime.strptime(inputs["to_date"], "%Y-%m-%d").replace(tzinfo=timezone.utc)
         else:
             # Default to now if no end date provided
-            from datetime import datetime
-            data["filter"]["toDateTime"] = datetime.now().strftime("%Y-%m-%dT23:59:59.999Z")
+            to_dt = datetime.now(timezone.utc)
+        to_dt = to_dt.replace(hour=23, minute=59, second=59, microsecond=999000)
         
         try:
-            response = await client._make_request("calls/extensive", method="POST", data=data)
-            
-            # Filter calls based on search query in content
-            query = inputs["query"].lower()
-            results = []
+            index = transcript_indexes.get(context, refresh=inputs.get("refresh_index", False))
+            # Only calls and transcripts not already indexed are fetched
+            async with transcript_indexes.lock(context):
+                ingestion = await ingest_calls(
+                    client,
+                    index,
+                    from_dt.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+                    to_dt.strftime("%Y-%m-%dT%H:%M:%S.999Z")
+                )
             
-            for call in response.get("calls", []):
-                # Skip private calls
-                if bool(call.get("isPrivate", False)):
-                    continue
-                # Check if query appears in call content/highlights/topics
-                content_match = False
-                matched_segments = []
-                
-                # Check various content fields for the search query
-                content_fields = call.get("content", {})
-                
-                # Let's try to match the original logic as much as possible but with valid API request structure.
-                topics = content_fields.get("topics", [])
-                
-                # Since I requested pointsOfInterest, let's use that if highlights is empty
-                points_of_interest = content_fields.get("pointsOfInterest", [])
-                
-                # Search in points_of_interest (assuming it has text field)
-                for poi in points_of_interest:
-                     if query in poi.get("action", "").lower() or query in poi.get("concept", "").lower():
-                        content_match = True
-                        matched_segments.append({
-                            "text": f"{poi.get('action', '')} {poi.get('concept', '')}",
-                            "start_time": poi.get("startTime", 0)
-                        })
-
-                # Search in topics
-                for topic in topics:
-                    if query in topic.get("name", "").lower():
-                         content_match = True
-                
-                # Fallback to simple title search if nothing else
-                if query in call.get("title", "").lower():
-                    content_match = True
-
-                if content_match:
-                    results.append({
-                        "call_id": call.get("id"),
-                        "title": call.get("title", ""),
-                        "started": call.get("started"),
-                        "relevance_score": len(matched_segments) + (1 if query in call.get("title", "").lower() else 0), 
-                        "matched_segments": matched_segments
-                    })
+            search = index.search(inputs["query"], ingestion["call_ids"], limit=inputs.get("limit", 50))
             
             return ActionResult(data={
-                "results": results,
-                "total_count": len(results)
+                "results": search["results"],
+                "total_count": search["total_count"],
+                "indexed_calls": len(index.calls),
+                "newly_indexed_calls": ingestion["calls_indexed"]
             })
         except Exception as e:
             return ActionResult(data={
@@ -194,6 +194,141 @@ async def test_search_calls_skips_private():
     assert ids == ["pub"]
 
 
+async def test_get_call_transcripts_batch():
+    responses = {
+        "POST /calls/extensive": {
+            "calls": [
+                {"id": "a", "title": "Discovery", "parties": [{"speakerId": "s1", "name": "Jane"}]},
+                {"id": "b", "isPrivate": True}
+            ]
+        },
+        "POST /calls/transcript": {
+            "callTranscripts": [
+                {"callId": "a", "transcript": [
+                    {"speakerId": "s1", "sentences": [{"start": 2000, "end": 3500, "text": "Thanks for joining."}]}
+                ]}
+            ]
+        }
+    }
+    context = MockExecutionContext(responses)
+    result = await gong.execute_action("get_call_transcripts", {"call_ids": ["a", "b", "c"]}, context)
+    data = result.result.data
+    assert [t["call_id"] for t in data["transcripts"]] == ["a"]
+    assert data["transcripts"][0]["transcript"] == [{
+        "speaker_id": "s1", "speaker_name": "Jane", "start_time": 2.0, "end_time": 3.5, "text": "Thanks for joining."
+    }]
+    assert data["errors"] == [
+        {"call_id": "b", "error": "private_call_filtered"},
+        {"call_id": "c", "error": "call_not_found"}
+    ]
+
+
+class PagingExecutionContext(MockExecutionContext):
+    """Serves calls/extensive in two cursor pages and records transcript requests."""
+
+    def __init__(self, pages, transcripts):
+        super().__init__({})
+        self._pages = pages
+        self._transcripts = transcripts
+        self.transcript_requests = []
+
+    async def fetch(self, url: str, method: str = "GET", params: Optional[Dict[str, Any]] = None, json: Any = None, headers: Optional[Dict[str, str]] = None, **kwargs):
+        if url.endswith("/calls/extensive") and method == "POST":
+            return self._pages[json.get("cursor")]
+        if url.endswith("/calls/transcript") and method == "POST":
+            call_ids = json["filter"]["callIds"]
+            self.transcript_requests.append(call_ids)
+            return {"callTranscripts": [t for t in self._transcripts if t["callId"] in call_ids]}
+        return await super().fetch(url, method, params, json, headers, **kwargs)
+
+
+async def test_search_calls_matches_transcript_text():
+    pages = {
+        None: {
+            "records": {"cursor": "page-2"},
+            "calls": [
+                {"id": "c1", "title": "Kickoff", "started": "2024-03-01T00:00:00Z",
+                 "parties": [{"speakerId": "s1", "name": "Jane"}]}
+            ]
+        },
+        "page-2": {
+            "records": {},
+            "calls": [
+                {"id": "c2", "title": "Check-in", "started": "2024-03-02T00:00:00Z",
+                 "parties": [{"speakerId": "s2", "name": "Raj"}]}
+            ]
+        }
+    }
+    transcripts = [
+        {"callId": "c1", "transcript": [
+            {"speakerId": "s1", "sentences": [{"start": 1000, "end": 4000, "text": "Welcome everyone."}]}
+        ]},
+        {"callId": "c2", "transcript": [
+            {"speakerId": "s2", "sentences": [
+                {"start": 60000, "end": 62000, "text": "Can we talk about the renewal discount?"},
+                {"start": 62000, "end": 65000, "text": "The renewal is due next month."}
+            ]}
+        ]}
+    ]
+    context = PagingExecutionContext(pages, transcripts)
+    inputs = {"query": "renewal discount", "from_date": "2024-03-01", "to_date": "2024-03-31", "refresh_index": True}
+    result = await gong.execute_action("search_calls", inputs, context)
+    data = result.result.data
+    assert [r["call_id"] for r in data["results"]] == ["c2"]
+    segment = data["results"][0]["matched_segments"][0]
+    assert segment["speaker_name"] == "Raj"
+    assert segment["start_time"] == 60 and segment["end_time"] == 65
+    assert context.transcript_requests == [["c1", "c2"]]
+
+    # Already indexed calls are not fetched again
+    inputs["refresh_index"] = False
+    result = await gong.execute_action("search_calls", inputs, context)
+    assert [r["call_id"] for r in result.result.data["results"]] == ["c2"]
+    assert len(context.transcript_requests) == 1
+
+
+async def test_search_calls_indexes_transcript_once_ready():
+    import gong as gong_module
+
+    pages = {None: {"records": {}, "calls": [{"id": "late", "title": "Weekly sync", "started": "2024-04-01T00:00:00Z"}]}}
+    context = PagingExecutionContext(pages, [])
+    inputs = {"query": "forecast", "from_date": "2024-04-01", "to_date": "2024-04-30", "refresh_index": True}
+    result = await gong.execute_action("search_calls", inputs, context)
+    assert result.result.data["results"] == []
+
+    # The transcript becomes available after the first search
+    context._transcripts = [{"callId": "late", "transcript": [
+        {"speakerId": "s1", "sentences": [{"start": 0, "end": 2000, "text": "The forecast looks good."}]}
+    ]}]
+    recheck_interval = gong_module.TRANSCRIPT_RECHECK_INTERVAL
+    gong_module.TRANSCRIPT_RECHECK_INTERVAL = 0
+    try:
+        inputs["refresh_index"] = False
+        result = await gong.execute_action("search_calls", inputs, context)
+    finally:
+        gong_module.TRANSCRIPT_RECHECK_INTERVAL = recheck_interval
+    assert [r["call_id"] for r in result.result.data["results"]] == ["late"]
+    assert context.transcript_requests == [["late"], ["late"]]
+
+
+async def test_search_calls_index_survives_token_refresh():
+    pages = {None: {"records": {}, "calls": [{"id": "t1", "title": "Renewal", "started": "2024-05-01T00:00:00Z"}]}}
+    transcripts = [{"callId": "t1", "transcript": [
+        {"speakerId": "s1", "sentences": [{"start": 0, "end": 1000, "text": "Renewal terms."}]}
+    ]}]
+    inputs = {"query": "renewal", "from_date": "2024-05-01", "to_date": "2024-05-31"}
+
+    context = PagingExecutionContext(pages, transcripts)
+    context.auth = {"credentials": {"access_token": "old"}}
+    await gong.execute_action("search_calls", dict(inputs, refresh_index=True), context)
+
+    refreshed = PagingExecutionContext(pages, transcripts)
+    refreshed.auth = {"credentials": {"access_token": "new"}}
+    result = await gong.execute_action("search_calls", inputs, refreshed)
+    assert [r["call_id"] for r in result.result.data["results"]] == ["t1"]
+    assert refreshed.transcript_requests == []
+
+
 def _run(coro):
     return asyncio.get_event_loop().run_until_complete(coro)
 
@@ -208,6 +343,10 @@ if __name__ == "__main__":
     _run(test_get_call_details_private_filtered())
     _run(test_get_call_transcript_private_filtered())
     _run(test_search_calls_skips_private())
+    _run(test_search_calls_matches_transcript_text())
+    _run(test_get_call_transcripts_batch())
+    _run(test_search_calls_indexes_transcript_once_ready())
+    _run(test_search_calls_index_survives_token_refresh())
     print("All tests passed")
 
 
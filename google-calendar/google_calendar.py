@@ -1,12 +1,25 @@
 from autohive_integrations_sdk import (
     Integration, ExecutionContext, ActionHandler, PollingTriggerHandler
 )
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime, timedelta, time
+from zoneinfo import ZoneInfo
+import asyncio
 
 # Create the integration using the config.json
 google_calendar = Integration.load()
 service_endpoint = "https://www.googleapis.com/calendar/v3/"
 
+# freeBusy accepts at most 50 calendars per request and rejects very long ranges,
+# so larger queries are split into chunks that are sent concurrently
+FREEBUSY_MAX_CALENDARS = 50
+FREEBUSY_MAX_RANGE = timedelta(days=60)
+FREEBUSY_CONCURRENCY = 4
+
+# Event sync reads the largest pages the API allows and stops after this many
+SYNC_PAGE_SIZE = 2500
+SYNC_MAX_PAGES = 50
+
 class CalendarEventParser:
     @staticmethod
     def parse_event(raw_event: Dict[str, Any]) -> Dict[str, Any]:
@@ -54,6 +67,154 @@ class CalendarEventParser:
             
         return calendar_data
 
+class AvailabilityCalculator:
+    """Helpers for turning freeBusy results into candidate meeting slots.
+
+    Intervals are (start, end) tuples of timezone-aware datetimes, kept sorted
+    and non-overlapping.
+    """
+
+    @staticmethod
+    def parse_datetime(value: str) -> datetime:
+        """Parse an RFC3339 timestamp; timestamps without an offset are taken as UTC."""
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=ZoneInfo("UTC"))
+        return parsed
+
+    @staticmethod
+    def parse_clock(value: str) -> time:
+        """Parse an HH:MM working-hours boundary."""
+        hours, minutes = value.split(':')
+        return time(int(hours), int(minutes))
+
+    @staticmethod
+    def merge_intervals(intervals: List[Tuple[datetime, datetime]]) -> List[Tuple[datetime, datetime]]:
+        merged = []
+        for start, end in sorted(intervals):
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return merged
+
+    @staticmethod
+    def subtract_intervals(
+        window_start: datetime, window_end: datetime, busy: List[Tuple[datetime, datetime]]
+    ) -> List[Tuple[datetime, datetime]]:
+        """Free gaps inside the window around merged busy intervals."""
+        free = []
+        cursor = window_start
+        for busy_start, busy_end in busy:
+            if busy_end <= cursor:
+                continue
+            if busy_start >= window_end:
+                break
+            if busy_start > cursor:
+                free.append((cursor, busy_start))
+            cursor = max(cursor, busy_end)
+        if cursor < window_end:
+            free.append((cursor, window_end))
+        return free
+
+    @staticmethod
+    def intersect_intervals(
+        first: List[Tuple[datetime, datetime]], second: List[Tuple[datetime, datetime]]
+    ) -> List[Tuple[datetime, datetime]]:
+        result = []
+        i = j = 0
+        while i < len(first) and j < len(second):
+            start = max(first[i][0], second[j][0])
+            end = min(first[i][1], second[j][1])
+            if start < end:
+                result.append((start, end))
+            if first[i][1] < second[j][1]:
+                i += 1
+            else:
+                j += 1
+        return result
+
+    @staticmethod
+    def working_windows(
+        window_start: datetime, window_end: datetime, time_zone: str,
+        day_start: time, day_end: time, include_weekends: bool
+    ) -> List[Tuple[datetime, datetime]]:
+        """Working-hour intervals in the given time zone that overlap the window."""
+        zone = ZoneInfo(time_zone)
+        windows = []
+        day = window_start.astimezone(zone).date() - timedelta(days=1)
+        last_day = window_end.astimezone(zone).date()
+        while day <= last_day:
+            if include_weekends or day.weekday() < 5:
+                start = datetime.combine(day, day_start, tzinfo=zone)
+                end = datetime.combine(day, day_end, tzinfo=zone)
+                start, end = max(start, window_start), min(end, window_end)
+                if start < end:
+                    windows.append((start, end))
+            day += timedelta(days=1)
+        return windows
+
+    @staticmethod
+    def candidate_slots(
+        free: List[Tuple[datetime, datetime]], duration: timedelta, increment: timedelta, max_slots: int
+    ) -> List[Tuple[datetime, datetime]]:
+        """Slots of the requested duration inside free intervals, aligned to the increment."""
+        slots = []
+        epoch = datetime(1970, 1, 1, tzinfo=ZoneInfo("UTC"))
+        for free_start, free_end in free:
+            # Align to the increment so slots start on round times (e.g. :00 and :30)
+            offset = (free_start - epoch) % increment
+            slot_start = free_start if not offset else free_start + (increment - offset)
+            while slot_start + duration <= free_end:
+                slots.append((slot_start, slot_start + duration))
+                if len(slots) >= max_slots:
+                    return slots
+                slot_start += increment
+        return slots
+
+    @staticmethod
+    async def query_free_busy(
+        context: ExecutionContext, calendar_ids: List[str], time_min: datetime, time_max: datetime
+    ) -> Tuple[Dict[str, List[Tuple[datetime, datetime]]], Dict[str, List[Dict[str, Any]]]]:
+        """Busy intervals per calendar, querying freeBusy in calendar and time-range chunks."""
+        chunks = []
+        for i in range(0, len(calendar_ids), FREEBUSY_MAX_CALENDARS):
+            calendar_chunk = calendar_ids[i:i + FREEBUSY_MAX_CALENDARS]
+            range_start = time_min
+            while range_start < time_max:
+                range_end = min(range_start + FREEBUSY_MAX_RANGE, time_max)
+                chunks.append((calendar_chunk, range_start, range_end))
+                range_start = range_end
+
+        semaphore = asyncio.Semaphore(FREEBUSY_CONCURRENCY)
+
+        async def send(calendar_chunk, range_start, range_end):
+            async with semaphore:
+                return await context.fetch(
+                    service_endpoint + "freeBusy",
+                    method="POST",
+                    json={
+                        "timeMin": range_start.isoformat(),
+                        "timeMax": range_end.isoformat(),
+                        "items": [{"id": calendar_id} for calendar_id in calendar_chunk]
+                    }
+                )
+
+        responses = await asyncio.gather(*(send(*chunk) for chunk in chunks))
+
+        busy = {calendar_id: [] for calendar_id in calendar_ids}
+        errors = {}
+        for response in responses:
+            for calendar_id, calendar in response.get('calendars', {}).items():
+                if calendar.get('errors'):
+                    errors[calendar_id] = calendar['errors']
+                for period in calendar.get('busy', []):
+                    busy.setdefault(calendar_id, []).append((
+                        AvailabilityCalculator.parse_datetime(period['start']),
+                        AvailabilityCalculator.parse_datetime(period['end'])
+                    ))
+        return busy, errors
+
 # ---- Action Handlers ----
 
 @google_calendar.action("list_calendars")
@@ -127,6 +288,107 @@ class ListEvents(ActionHandler):
                 "error": str(e)
             }
 
+@google_calendar.action("sync_events")
+class SyncEvents(ActionHandler):
+    """Full or incremental sync of a calendar's events using sync tokens.
+
+    Without a sync token every page of events is read and a sync token is
+    returned. Passing that token back returns only what changed since, with
+    deleted events reported separately. When Google no longer accepts the token
+    (HTTP 410) a full sync is done instead and flagged with `resynced`.
+    """
+
+    @staticmethod
+    def _sync_token_expired(error: Exception) -> bool:
+        status = getattr(error, 'status', None) or getattr(error, 'status_code', None)
+        return status == 410 or 'fullSyncRequired' in str(error)
+
+    async def _read_pages(self, context: ExecutionContext, calendar_id: str, params: Dict[str, Any],
+                          page_token: Optional[str], max_pages: int) -> Dict[str, Any]:
+        events = []
+        deleted_event_ids = []
+        response = {}
+        for _ in range(max_pages):
+            page_params = dict(params)
+            if page_token:
+                page_params['pageToken'] = page_token
+            response = await context.fetch(
+                service_endpoint + f"calendars/{calendar_id}/events",
+                method="GET",
+                params=page_params
+            )
+            for raw_event in response.get('items', []):
+                if raw_event.get('status') == 'cancelled':
+                    deleted_event_ids.append(raw_event.get('id', ''))
+                else:
+                    event = CalendarEventParser.parse_event(raw_event)
+                    event['status'] = raw_event.get('status', 'confirmed')
+                    events.append(event)
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                break
+
+        return {
+            "events": events,
+            "deleted_event_ids": deleted_event_ids,
+            "next_sync_token": response.get('nextSyncToken'),
+            "next_page_token": page_token
+        }
+
+    async def execute(self, inputs: Dict[str, Any], context: ExecutionContext):
+        try:
+            calendar_id = inputs['calendar_id']
+            sync_token = inputs.get('sync_token')
+            max_pages = inputs.get('max_pages', SYNC_MAX_PAGES)
+
+            # singleEvents has to match between the initial sync and later incremental ones
+            params = {
+                'maxResults': SYNC_PAGE_SIZE,
+                'singleEvents': 'true' if inputs.get('single_events', False) else 'false'
+            }
+            full_sync_params = dict(params)
+            if 'time_min' in inputs:
+                full_sync_params['timeMin'] = inputs['time_min']
+
+            resynced = False
+            if sync_token:
+                try:
+                    page = await self._read_pages(
+                        context, calendar_id, {**params, 'syncToken': sync_token},
+                        inputs.get('page_token'), max_pages
+                    )
+                except Exception as e:
+                    if not self._sync_token_expired(e):
+                        raise
+                    # The token expired or was invalidated; the caller has to rebuild its copy
+                    resynced = True
+                    page = await self._read_pages(context, calendar_id, full_sync_params, None, max_pages)
+            else:
+                page = await self._read_pages(
+                    context, calendar_id, full_sync_params, inputs.get('page_token'), max_pages
+                )
+
+            result = {
+                "events": page['events'],
+                "deleted_event_ids": page['deleted_event_ids'],
+                "full_sync": resynced or not sync_token,
+                "resynced": resynced,
+                "result": True
+            }
+            if page['next_sync_token']:
+                result['next_sync_token'] = page['next_sync_token']
+            if page['next_page_token']:
+                result['next_page_token'] = page['next_page_token']
+            return result
+
+        except Exception as e:
+            return {
+                "events": [],
+                "deleted_event_ids": [],
+                "result": False,
+                "error": str(e)
+            }
+
 @google_calendar.action("get_event")
 class GetEvent(ActionHandler):
     async def execute(self, inputs: Dict[str, Any], context: ExecutionContext):
@@ -278,6 +540,65 @@ class DeleteEvent(ActionHandler):
                 "error": str(e)
             }
 
+@google_calendar.action("find_availability")
+class FindAvailability(ActionHandler):
+    async def execute(self, inputs: Dict[str, Any], context: ExecutionContext):
+        try:
+            calendar_ids = inputs['calendar_ids']
+            time_min = AvailabilityCalculator.parse_datetime(inputs['time_min'])
+            time_max = AvailabilityCalculator.parse_datetime(inputs['time_max'])
+            duration = timedelta(minutes=inputs['duration_minutes'])
+            increment = timedelta(minutes=inputs.get('slot_increment_minutes', 30))
+            time_zone = inputs.get('time_zone', 'UTC')
+            calendar_time_zones = inputs.get('calendar_time_zones', {})
+            day_start = AvailabilityCalculator.parse_clock(inputs.get('working_hours_start', '09:00'))
+            day_end = AvailabilityCalculator.parse_clock(inputs.get('working_hours_end', '17:00'))
+            include_weekends = inputs.get('include_weekends', False)
+            max_slots = inputs.get('max_slots', 20)
+
+            busy_by_calendar, errors = await AvailabilityCalculator.query_free_busy(
+                context, calendar_ids, time_min, time_max
+            )
+
+            all_busy = AvailabilityCalculator.merge_intervals(
+                [interval for intervals in busy_by_calendar.values() for interval in intervals]
+            )
+            free = AvailabilityCalculator.subtract_intervals(time_min, time_max, all_busy)
+
+            # A slot has to fall inside working hours for every attendee's time zone
+            for zone in {calendar_time_zones.get(calendar_id, time_zone) for calendar_id in calendar_ids} or {time_zone}:
+                free = AvailabilityCalculator.intersect_intervals(
+                    free,
+                    AvailabilityCalculator.working_windows(
+                        time_min, time_max, zone, day_start, day_end, include_weekends
+                    )
+                )
+
+            slots = AvailabilityCalculator.candidate_slots(free, duration, increment, max_slots)
+
+            output_zone = ZoneInfo(time_zone)
+
+            def format_interval(start, end):
+                return {
+                    "start": start.astimezone(output_zone).isoformat(),
+                    "end": end.astimezone(output_zone).isoformat()
+                }
+
+            return {
+                "slots": [format_interval(start, end) for start, end in slots],
+                "busy": [format_interval(start, end) for start, end in all_busy],
+                "calendar_errors": errors,
+                "result": True
+            }
+
+        except Exception as e:
+            return {
+                "slots": [],
+                "busy": [],
+                "result": False,
+                "error": str(e)
+            }
+
 # ---- Polling Trigger Handlers ----
 
 
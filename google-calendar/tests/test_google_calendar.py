@@ -47,6 +47,60 @@ async def test_list_events():
             print(f"Error testing list_events: {e}")
             return None
 
+async def test_sync_events():
+    """Test a full sync followed by an incremental sync."""
+    auth = {
+        "auth_type": "PlatformOauth2",
+        "credentials": {
+            "access_token": "your_access_token_here"
+        }
+    }
+
+    inputs = {
+        "calendar_id": "primary"
+    }
+
+    async with ExecutionContext(auth=auth) as context:
+        try:
+            result = await google_calendar.execute_action("sync_events", inputs, context)
+            print(f"Full Sync Result: {len(result.get('events', []))} events, token: {result.get('next_sync_token')}")
+
+            if result.get('next_sync_token'):
+                inputs["sync_token"] = result['next_sync_token']
+                result = await google_calendar.execute_action("sync_events", inputs, context)
+                print(f"Incremental Sync Result: {result}")
+            return result
+        except Exception as e:
+            print(f"Error testing sync_events: {e}")
+            return None
+
+async def test_find_availability():
+    """Test finding a common free slot across calendars."""
+    auth = {
+        "auth_type": "PlatformOauth2",
+        "credentials": {
+            "access_token": "your_access_token_here"
+        }
+    }
+
+    inputs = {
+        "calendar_ids": ["primary"],
+        "time_min": "2024-12-02T00:00:00Z",
+        "time_max": "2024-12-07T00:00:00Z",
+        "duration_minutes": 30,
+        "time_zone": "America/Los_Angeles",
+        "max_slots": 5
+    }
+
+    async with ExecutionContext(auth=auth) as context:
+        try:
+            result = await google_calendar.execute_action("find_availability", inputs, context)
+            print(f"Find Availability Result: {result}")
+            return result
+        except Exception as e:
+            print(f"Error testing find_availability: {e}")
+            return None
+
 async def test_get_event():
     """Test getting a specific event."""
     auth = {
@@ -163,7 +217,15 @@ async def main():
     await test_get_event()
     print()
 
-    print("4. Testing create_event...")
+    print("4. Testing find_availability...")
+    await test_find_availability()
+    print()
+
+    print("5. Testing sync_events...")
+    await test_sync_events()
+    print()
+
+    print("6. Testing create_event...")
     created_event = await test_create_event()
     print()
 
@@ -171,12 +233,12 @@ async def main():
     if created_event and created_event.get('result'):
         event_id = created_event.get('event', {}).get('id')
         if event_id:
-            print("5. Testing update_event on created event...")
+            print("7. Testing update_event on created event...")
             # Update the test to use actual event_id
             await test_update_event()
             print()
 
-            print("6. Testing delete_event on created event...")
+            print("8. Testing delete_event on created event...")
             # Delete the test to use actual event_id
             await test_delete_event()
             print()
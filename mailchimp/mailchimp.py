@@ -2,9 +2,19 @@ from autohive_integrations_sdk import (
     Integration, ExecutionContext, ActionHandler, ActionResult,
     ConnectedAccountHandler, ConnectedAccountInfo
 )
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Deque
+from collections import OrderedDict, deque
 import asyncio
+import bisect
+import contextlib
+import difflib
 import hashlib
+import io
+import json
+import random
+import tarfile
+import time
+import aiohttp
 
 # Create the integration using the config.json
 mailchimp = Integration.load()
@@ -24,61 +34,202 @@ class MailchimpRateLimitException(Exception):
         )
 
 
+class _AccountConnectionState:
+    """Connection slots and wait queue for a single Mailchimp account."""
+
+    def __init__(self, max_connections: int):
+        self.max_connections = max_connections
+        self.in_flight = 0
+        # caller -> queued futures; callers are served round-robin so one busy
+        # workflow branch cannot starve the others
+        self.waiters: "OrderedDict[int, Deque[asyncio.Future]]" = OrderedDict()
+        self.loop = None
+        self.blocked_until = 0.0
+        self.requests = 0
+        self.throttled = 0
+        self.retries = 0
+        self.max_queue_depth = 0
+        self.queue_wait_seconds = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(len(queue) for queue in self.waiters.values())
+
+    def bind_loop(self) -> None:
+        # Futures belong to an event loop; a new loop (e.g. a new invocation) starts a fresh queue
+        loop = asyncio.get_running_loop()
+        if self.loop is not loop:
+            self.loop = loop
+            self.in_flight = 0
+            self.waiters = OrderedDict()
+
+    def _wake(self) -> None:
+        """Hand free slots to waiting callers in round-robin order"""
+        while self.in_flight < self.max_connections and self.waiters:
+            caller, queue = next(iter(self.waiters.items()))
+            future = queue.popleft()
+            if queue:
+                self.waiters.move_to_end(caller)
+            else:
+                del self.waiters[caller]
+            if future.done():
+                continue
+            self.in_flight += 1
+            future.set_result(None)
+
+    async def acquire(self, caller: int) -> None:
+        self.bind_loop()
+        if self.in_flight < self.max_connections and not self.waiters:
+            self.in_flight += 1
+            return
+
+        future = self.loop.create_future()
+        self.waiters.setdefault(caller, deque()).append(future)
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        started = time.monotonic()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just as we were cancelled; pass it on
+                self.release()
+            else:
+                queue = self.waiters.get(caller)
+                if queue is not None and future in queue:
+                    queue.remove(future)
+                    if not queue:
+                        del self.waiters[caller]
+            raise
+        finally:
+            self.queue_wait_seconds += time.monotonic() - started
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._wake()
+
+
 class MailchimpRateLimiter:
-    def __init__(self, default_retry_delay: int = 60, max_retries: int = 3):
+    def __init__(self, default_retry_delay: int = 60, max_retries: int = 3, max_connections: int = 10,
+                 base_backoff: float = 1.0):
         """
-        Handles Mailchimp API rate limiting by retrying requests on 429 errors.
-        Mailchimp has a limit of 10 simultaneous connections.
+        Handles Mailchimp API rate limiting per account.
+
+        Mailchimp has a limit of 10 simultaneous connections, so each account
+        gets at most 10 requests in flight; further requests queue and are
+        served fairly across callers. On a 429 the whole account pauses and
+        the request is retried after Retry-After, or with jittered exponential
+        backoff capped at default_retry_delay when no header is sent.
         """
         self.default_retry_delay = default_retry_delay
         self.max_retries = max_retries
-
-    def _extract_retry_delay(self, error_response) -> int:
+        self.max_connections = max_connections
+        self.base_backoff = base_backoff
+        self._accounts: Dict[str, _AccountConnectionState] = {}
+
+    def _account(self, account_key: str) -> _AccountConnectionState:
+        state = self._accounts.get(account_key)
+        if state is None:
+            state = _AccountConnectionState(self.max_connections)
+            self._accounts[account_key] = state
+        return state
+
+    @staticmethod
+    def _error_headers(error) -> Dict[str, str]:
+        """Response headers attached to an error, if the error carries any"""
+        headers = getattr(error, 'headers', None)
+        if headers is None and getattr(error, 'response', None) is not None:
+            headers = getattr(error.response, 'headers', None)
+        return headers or {}
+
+    @staticmethod
+    def _error_status(error) -> Optional[int]:
+        """HTTP status code attached to an error, if the error carries one"""
+        for source in (error, getattr(error, 'response', None)):
+            if source is None:
+                continue
+            for attribute in ('status', 'status_code'):
+                status = getattr(source, attribute, None)
+                if isinstance(status, int):
+                    return status
+        return None
+
+    def _extract_retry_delay(self, error_response) -> Optional[int]:
         """Extract retry delay from error response headers"""
-        if hasattr(error_response, 'headers'):
-            retry_after = error_response.headers.get('Retry-After')
-            if retry_after:
-                try:
-                    return int(retry_after)
-                except ValueError:
-                    pass
-        return self.default_retry_delay
+        retry_after = self._error_headers(error_response).get('Retry-After')
+        if retry_after:
+            try:
+                return int(retry_after)
+            except ValueError:
+                pass
+        return None
+
+    def _backoff_delay(self, error, attempt: int) -> float:
+        """Retry-After if the server sent one, otherwise jittered exponential backoff"""
+        retry_after = self._extract_retry_delay(error)
+        if retry_after is not None:
+            return retry_after + random.uniform(0, 1)
+        ceiling = min(self.default_retry_delay, self.base_backoff * (2 ** attempt))
+        # Equal jitter keeps a floor on the wait while spreading out parallel callers
+        return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+    @contextlib.asynccontextmanager
+    async def connection(self, context: ExecutionContext):
+        """Hold one of the account's connection slots, waiting out any 429 pause first"""
+        state = self._account(get_account_key(context))
+        await state.acquire(id(context))
+        try:
+            # Requests that were queued during a 429 pause wait it out before going
+            pause = state.blocked_until - time.monotonic()
+            if pause > 0:
+                await asyncio.sleep(pause)
+            state.requests += 1
+            yield state
+        finally:
+            state.release()
 
     async def make_request(self, context: ExecutionContext, url: str, **kwargs) -> Dict[str, Any]:
-        """Make request to Mailchimp API with automatic retry on rate limit errors"""
-        last_error = None
-
+        """Make request to Mailchimp API with a connection cap and automatic retry on rate limit errors"""
         for attempt in range(self.max_retries + 1):
             try:
-                response = await context.fetch(url, **kwargs)
-                return response
+                async with self.connection(context):
+                    return await context.fetch(url, **kwargs)
 
             except Exception as e:
-                last_error = e
-                error_str = str(e).lower()
-
-                # Check if it's a rate limit error (HTTP 429)
-                if '429' in error_str or 'rate limit' in error_str or 'too many requests' in error_str:
-                    # Don't retry on the last attempt
-                    if attempt >= self.max_retries:
-                        delay = self._extract_retry_delay(e)
-                        raise MailchimpRateLimitException(delay)
-
-                    # Get delay from response headers or use default
-                    delay = self._extract_retry_delay(e)
-
-                    # Wait and retry
-                    await asyncio.sleep(delay)
-                    continue
-
                 # For non-rate-limit errors, fail immediately
-                raise e
-
-        # All retries exhausted, raise the last error if present, else raise generic exception
-        if last_error is not None:
-            raise last_error
-        else:
-            raise Exception("All retries exhausted, but no exception was captured.")
+                if self._error_status(e) != 429:
+                    raise
+
+                state = self._account(get_account_key(context))
+                state.throttled += 1
+                delay = self._backoff_delay(e, attempt)
+
+                # Don't retry on the last attempt
+                if attempt >= self.max_retries:
+                    raise MailchimpRateLimitException(int(delay + 0.999))
+
+                # Pause the whole account so parallel requests back off together
+                state.blocked_until = max(state.blocked_until, time.monotonic() + delay)
+                state.retries += 1
+                await asyncio.sleep(delay)
+
+    def get_metrics(self, account_key: Optional[str] = None) -> Dict[str, Any]:
+        """Per-account in-flight requests, queue depth and throttling counts"""
+        account_keys = [account_key] if account_key else list(self._accounts)
+        metrics = {}
+        for current_key in account_keys:
+            state = self._accounts.get(current_key)
+            if state is None:
+                continue
+            metrics[current_key] = {
+                "in_flight": state.in_flight,
+                "queue_depth": state.queue_depth,
+                "max_queue_depth": state.max_queue_depth,
+                "queue_wait_seconds": round(state.queue_wait_seconds, 3),
+                "requests": state.requests,
+                "throttled": state.throttled,
+                "retries": state.retries
+            }
+        return metrics
 
 
 # Global rate limiter instance
@@ -119,6 +270,284 @@ def get_subscriber_hash(email: str) -> str:
     return hashlib.md5(email.lower().encode()).hexdigest()
 
 
+def get_account_key(context: ExecutionContext) -> str:
+    """Identify the Mailchimp account behind a context by data center and access token"""
+    metadata = getattr(context, 'metadata', None) or {}
+    auth = getattr(context, 'auth', None) or {}
+    credentials = auth.get('credentials', auth) if isinstance(auth, dict) else {}
+    token = credentials.get('access_token', '') if isinstance(credentials, dict) else ''
+    token_hash = hashlib.sha256(token.encode()).hexdigest()[:16] if token else ''
+    return f"{metadata.get('dc', '')}:{token_hash}"
+
+
+# ---- Name Index ----
+
+NAME_INDEX_TTL = 300
+NAME_INDEX_PAGE_SIZE = 1000
+MATCH_MODES = ("exact", "prefix", "contains", "fuzzy")
+DEFAULT_FUZZY_MIN_SCORE = 0.6
+
+# What to page through for each index: endpoint, fields= projection and the names to match on
+NAME_INDEX_SOURCES = {
+    "lists": {
+        "path": "/lists",
+        "fields": "lists.id,lists.web_id,lists.name,lists.date_created,lists.stats,total_items",
+        "names": ("name",)
+    },
+    "campaigns": {
+        "path": "/campaigns",
+        "fields": (
+            "campaigns.id,campaigns.web_id,campaigns.type,campaigns.status,campaigns.create_time,"
+            "campaigns.send_time,campaigns.emails_sent,campaigns.recipients.list_id,"
+            "campaigns.recipients.list_name,campaigns.settings.title,campaigns.settings.subject_line,total_items"
+        ),
+        "names": ("settings.title", "settings.subject_line")
+    }
+}
+
+
+async def fetch_full_records(context: ExecutionContext, source: str, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Fetch complete objects for index matches; the index itself only holds the fields= projection"""
+    base_url = get_mailchimp_base_url(get_data_center(context))
+    path = NAME_INDEX_SOURCES[source]["path"]
+    return list(await asyncio.gather(*(
+        rate_limiter.make_request(context, f"{base_url}{path}/{record['id']}", method="GET")
+        for record in records
+    )))
+
+
+def normalize_name(value: Any) -> str:
+    """Casefold and collapse whitespace so lookups ignore case and spacing"""
+    return " ".join(str(value or "").casefold().split())
+
+
+def _get_path(record: Dict[str, Any], path: str) -> Any:
+    value: Any = record
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def _fuzzy_ratio(query: str, name: str) -> float:
+    """Similarity of the query to the whole name or to any run of words of the query's length"""
+    best = difflib.SequenceMatcher(None, query, name).ratio()
+    words = name.split()
+    width = len(query.split())
+    if len(words) > width:
+        for i in range(len(words) - width + 1):
+            window = " ".join(words[i:i + width])
+            best = max(best, difflib.SequenceMatcher(None, query, window).ratio())
+    return best
+
+
+class _NameIndex:
+    """Records of one kind for one account, keyed by their normalized names."""
+
+    def __init__(self, records: List[Dict[str, Any]], name_paths: tuple, expires_at: float):
+        self.records = records
+        self.expires_at = expires_at
+        self.names: List[List[str]] = []
+        self.exact: Dict[str, List[int]] = {}
+        for position, record in enumerate(records):
+            names = [normalize_name(_get_path(record, path)) for path in name_paths]
+            names = [name for name in names if name]
+            self.names.append(names)
+            for name in names:
+                self.exact.setdefault(name, []).append(position)
+        self.sorted_names = sorted((name, position) for position, names in enumerate(self.names) for name in names)
+
+    def lookup(self, query: str, match_mode: str = "contains", limit: int = 10,
+               min_score: float = DEFAULT_FUZZY_MIN_SCORE) -> List[tuple]:
+        """Return (score, record) pairs, best first; exact > prefix > contains > fuzzy"""
+        query = normalize_name(query)
+        scores: Dict[int, float] = {}
+
+        def add(position: int, score: float):
+            scores[position] = max(scores.get(position, 0.0), score)
+
+        for position in self.exact.get(query, []):
+            add(position, 1.0)
+        if match_mode != "exact":
+            start = bisect.bisect_left(self.sorted_names, (query, -1))
+            for name, position in self.sorted_names[start:]:
+                if not name.startswith(query):
+                    break
+                add(position, 0.9)
+        if match_mode in ("contains", "fuzzy"):
+            for position, names in enumerate(self.names):
+                if position not in scores and any(query in name for name in names):
+                    add(position, 0.8)
+        if match_mode == "fuzzy":
+            for position, names in enumerate(self.names):
+                if position in scores or not names:
+                    continue
+                ratio = max(_fuzzy_ratio(query, name) for name in names)
+                if ratio >= min_score:
+                    # Keep fuzzy hits below every literal match
+                    add(position, round(0.8 * ratio, 3))
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(score, self.records[position]) for position, score in ranked[:limit]]
+
+
+class MailchimpNameIndexCache:
+    def __init__(self, ttl_seconds: int = NAME_INDEX_TTL):
+        """
+        Account-scoped name indexes for lists and campaigns.
+
+        The first lookup pages through every list or campaign with a fields=
+        projection; later lookups within ttl_seconds are answered locally.
+        Concurrent lookups for the same account share a single build.
+        """
+        self.ttl_seconds = ttl_seconds
+        self._indexes: Dict[tuple, _NameIndex] = {}
+        self._building: Dict[tuple, asyncio.Task] = {}
+
+    def invalidate(self, context: ExecutionContext, kind: Optional[str] = None) -> None:
+        account_key = get_account_key(context)
+        for key in list(self._indexes):
+            if key[0] == account_key and (kind is None or key[1] == kind):
+                del self._indexes[key]
+
+    async def _fetch_all(self, context: ExecutionContext, kind: str) -> List[Dict[str, Any]]:
+        source = NAME_INDEX_SOURCES[kind]
+        url = f"{get_mailchimp_base_url(get_data_center(context))}{source['path']}"
+
+        async def fetch_page(offset: int) -> Dict[str, Any]:
+            params = {"count": NAME_INDEX_PAGE_SIZE, "offset": offset, "fields": source["fields"]}
+            return await rate_limiter.make_request(context, url, method="GET", params=params)
+
+        first = await fetch_page(0)
+        records = list(first.get(kind, []))
+        total = first.get("total_items", len(records))
+        # The total is known after the first page, so the rest can be fetched together
+        pages = await asyncio.gather(*(fetch_page(offset) for offset in range(NAME_INDEX_PAGE_SIZE, total, NAME_INDEX_PAGE_SIZE)))
+        for page in pages:
+            records.extend(page.get(kind, []))
+        return records
+
+    async def get(self, context: ExecutionContext, kind: str, refresh: bool = False) -> _NameIndex:
+        key = (get_account_key(context), kind)
+        index = self._indexes.get(key)
+        if index is not None and not refresh and index.expires_at > time.monotonic():
+            return index
+
+        task = self._building.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(self._fetch_all(context, kind))
+            self._building[key] = task
+        try:
+            records = await asyncio.shield(task)
+        finally:
+            if self._building.get(key) is task and task.done():
+                del self._building[key]
+
+        index = self._indexes.get(key)
+        if index is None or index.records is not records:
+            index = _NameIndex(records, NAME_INDEX_SOURCES[kind]["names"], time.monotonic() + self.ttl_seconds)
+            self._indexes[key] = index
+        return index
+
+
+# Global name index instance
+name_index = MailchimpNameIndexCache()
+
+
+# ---- Bulk Member Import ----
+
+# POST /lists/{list_id} accepts at most 500 members per request
+BATCH_SUBSCRIBE_CHUNK_SIZE = 500
+# Chunks sent at once; stays well under Mailchimp's 10 simultaneous connections
+BATCH_SUBSCRIBE_CONCURRENCY = 3
+BATCH_POLL_INITIAL_DELAY = 2
+BATCH_POLL_MAX_DELAY = 30
+BATCH_DEFAULT_MAX_WAIT = 240
+
+
+def build_batch_operations(list_id: str, members: List[Dict[str, Any]], default_status: str,
+                           update_existing: bool) -> List[Dict[str, Any]]:
+    """
+    Build /batches operations that add or upsert each member.
+
+    With update_existing the member is upserted with PUT, which takes status_if_new
+    for new members; otherwise it is created with POST, which requires status.
+    operation_id is the email address so results can be matched back to members.
+    """
+    operations = []
+    for member in members:
+        email = member["email_address"]
+        status = member.get("status", default_status)
+        if update_existing:
+            body = {"email_address": email, "status_if_new": status, "status": status}
+        else:
+            body = {"email_address": email, "status": status}
+        if member.get("merge_fields"):
+            body["merge_fields"] = member["merge_fields"]
+        operations.append({
+            "method": "PUT" if update_existing else "POST",
+            "path": f"/lists/{list_id}/members/{get_subscriber_hash(email)}" if update_existing else f"/lists/{list_id}/members",
+            "operation_id": email,
+            "body": json.dumps(body)
+        })
+    return operations
+
+
+def build_tag_operations(list_id: str, members: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Build /batches operations that add each member's tags.
+
+    Mailchimp does not order operations within a batch, so these go in a second
+    batch once the members exist. operation_id is the email with a ":tags" suffix.
+    """
+    return [
+        {
+            "method": "POST",
+            "path": f"/lists/{list_id}/members/{get_subscriber_hash(member['email_address'])}/tags",
+            "operation_id": f"{member['email_address']}:tags",
+            "body": json.dumps({"tags": [{"name": tag, "status": "active"} for tag in member["tags"]]})
+        }
+        for member in members
+        if member.get("tags")
+    ]
+
+
+def parse_batch_results_archive(archive: bytes) -> List[Dict[str, Any]]:
+    """Read the per-operation results from a finished batch's .tar.gz response archive"""
+    results = []
+    with tarfile.open(fileobj=io.BytesIO(archive), mode="r:gz") as tar:
+        for entry in tar.getmembers():
+            if not entry.isfile() or not entry.name.endswith(".json"):
+                continue
+            content = tar.extractfile(entry).read()
+            if content:
+                results.extend(json.loads(content))
+    return results
+
+
+def batch_results_to_outcomes(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Turn batch operation results into one outcome per member"""
+    outcomes: Dict[str, Dict[str, Any]] = {}
+    for result in results:
+        operation_id = result.get("operation_id") or ""
+        is_tags = operation_id.endswith(":tags")
+        email = operation_id[:-len(":tags")] if is_tags else operation_id
+        outcome = outcomes.setdefault(email, {"email_address": email, "success": True})
+        status_code = result.get("status_code", 0)
+        if 200 <= status_code < 300:
+            continue
+        try:
+            detail = json.loads(result.get("response") or "{}")
+        except ValueError:
+            detail = {}
+        outcome["success"] = False
+        error = detail.get("detail") or detail.get("title") or f"HTTP {status_code}"
+        outcome["error"] = f"tags: {error}" if is_tags else error
+    return list(outcomes.values())
+
+
+
 # ---- Action Handlers ----
 
 
@@ -197,38 +626,32 @@ class FindListAction(ActionHandler):
             )
 
         try:
-            # Get data center from metadata
-            dc = get_data_center(context)
-            base_url = get_mailchimp_base_url(dc)
-
-            # Build URL - fetch lists and filter by name
-            url = f"{base_url}/lists"
-            params = {
-                "count": 100,  # Fetch enough to find the match
-                "offset": 0
-            }
+            match_mode = inputs.get("match_mode", "contains")
+            if match_mode not in MATCH_MODES:
+                return ActionResult(
+                    data={
+                        "result": False,
+                        "error": f"match_mode must be one of: {', '.join(MATCH_MODES)}"
+                    },
+                    cost_usd=0.0
+                )
 
-            # Make rate-limited request
-            response = await rate_limiter.make_request(
-                context,
-                url,
-                method="GET",
-                params=params
+            index = await name_index.get(context, "lists", refresh=inputs.get("refresh_index", False))
+            matches = index.lookup(
+                name,
+                match_mode=match_mode,
+                limit=inputs.get("limit", 10),
+                min_score=inputs.get("min_score", DEFAULT_FUZZY_MIN_SCORE)
             )
 
-            # Search for matching list (case-insensitive)
-            search_name = name.lower()
-            matching_list = None
-            for lst in response.get("lists", []):
-                if search_name in lst.get("name", "").lower():
-                    matching_list = lst
-                    break
-
-            if matching_list:
+            if matches:
+                lists = await fetch_full_records(context, "lists", [lst for _, lst in matches])
                 return ActionResult(
                     data={
                         "result": True,
-                        "list": matching_list
+                        "list": lists[0],
+                        "matches": [{**lst, "match_score": score} for (score, _), lst in zip(matches, lists)],
+                        "total_indexed": len(index.records)
                     },
                     cost_usd=0.0
                 )
@@ -362,6 +785,7 @@ class CreateListAction(ActionHandler):
                 method="POST",
                 json=list_data
             )
+            name_index.invalidate(context, "lists")
 
             return ActionResult(
                 data={
@@ -720,41 +1144,33 @@ class FindCampaignAction(ActionHandler):
             )
 
         try:
-            # Get data center from metadata
-            dc = get_data_center(context)
-            base_url = get_mailchimp_base_url(dc)
-
-            # Build URL - fetch campaigns and filter by title/subject
-            url = f"{base_url}/campaigns"
-            params = {
-                "count": 100,  # Fetch enough to find the match
-                "offset": 0
-            }
+            match_mode = inputs.get("match_mode", "contains")
+            if match_mode not in MATCH_MODES:
+                return ActionResult(
+                    data={
+                        "result": False,
+                        "error": f"match_mode must be one of: {', '.join(MATCH_MODES)}"
+                    },
+                    cost_usd=0.0
+                )
 
-            # Make rate-limited request
-            response = await rate_limiter.make_request(
-                context,
-                url,
-                method="GET",
-                params=params
+            # Matches on title or subject_line
+            index = await name_index.get(context, "campaigns", refresh=inputs.get("refresh_index", False))
+            matches = index.lookup(
+                query,
+                match_mode=match_mode,
+                limit=inputs.get("limit", 10),
+                min_score=inputs.get("min_score", DEFAULT_FUZZY_MIN_SCORE)
             )
 
-            # Search for matching campaign (case-insensitive in title or subject_line)
-            search_query = query.lower()
-            matching_campaign = None
-            for campaign in response.get("campaigns", []):
-                settings = campaign.get("settings", {})
-                title = settings.get("title", "").lower()
-                subject_line = settings.get("subject_line", "").lower()
-                if search_query in title or search_query in subject_line:
-                    matching_campaign = campaign
-                    break
-
-            if matching_campaign:
+            if matches:
+                campaigns = await fetch_full_records(context, "campaigns", [campaign for _, campaign in matches])
                 return ActionResult(
                     data={
                         "result": True,
-                        "campaign": matching_campaign
+                        "campaign": campaigns[0],
+                        "matches": [{**campaign, "match_score": score} for (score, _), campaign in zip(matches, campaigns)],
+                        "total_indexed": len(index.records)
                     },
                     cost_usd=0.0
                 )
@@ -902,6 +1318,7 @@ class CreateCampaignAction(ActionHandler):
                 method="POST",
                 json=campaign_data
             )
+            name_index.invalidate(context, "campaigns")
 
             return ActionResult(
                 data={
@@ -990,6 +1407,211 @@ class GetCampaignAction(ActionHandler):
                 cost_usd=0.0
             )
 
+
+@mailchimp.action("bulk_upsert_members")
+class BulkUpsertMembersAction(ActionHandler):
+    """
+    Add or update many list members in as few requests as possible.
+
+    "batch_subscribe" sends members to POST /lists/{list_id} in chunks of 500 and
+    returns results straight away. "batch_operations" submits one /batches job,
+    polls it with backoff and reads per-member results from the result archive.
+    "auto" picks batch_operations only when tags are set. POST /lists/{list_id}
+    cannot set tags, so in either mode members' tags are applied afterwards in a
+    /batches job. If a batch is still running after max_wait_seconds, its batch_id
+    is returned and can be passed back in to collect the results later.
+    """
+
+    async def _batch_subscribe(self, context: ExecutionContext, base_url: str, list_id: str,
+                               members: List[Dict[str, Any]], default_status: str,
+                               update_existing: bool) -> Dict[str, Any]:
+        semaphore = asyncio.Semaphore(BATCH_SUBSCRIBE_CONCURRENCY)
+
+        async def send(chunk):
+            payload = {
+                "members": [
+                    {
+                        "email_address": member["email_address"],
+                        "status": member.get("status", default_status),
+                        **({"merge_fields": member["merge_fields"]} if member.get("merge_fields") else {})
+                    }
+                    for member in chunk
+                ],
+                "update_existing": update_existing
+            }
+            async with semaphore:
+                return await rate_limiter.make_request(
+                    context,
+                    f"{base_url}/lists/{list_id}",
+                    method="POST",
+                    json=payload
+                )
+
+        chunks = [members[i:i + BATCH_SUBSCRIBE_CHUNK_SIZE] for i in range(0, len(members), BATCH_SUBSCRIBE_CHUNK_SIZE)]
+        responses = await asyncio.gather(*(send(chunk) for chunk in chunks))
+
+        outcomes = []
+        for response in responses:
+            for member in response.get("new_members", []):
+                outcomes.append({"email_address": member.get("email_address"), "success": True, "action": "created"})
+            for member in response.get("updated_members", []):
+                outcomes.append({"email_address": member.get("email_address"), "success": True, "action": "updated"})
+            for error in response.get("errors", []):
+                outcomes.append({
+                    "email_address": error.get("email_address"),
+                    "success": False,
+                    "error": error.get("error"),
+                    "error_code": error.get("error_code")
+                })
+        return {"status": "finished", "outcomes": outcomes}
+
+    async def _wait_for_batch(self, context: ExecutionContext, base_url: str, batch_id: str,
+                              max_wait_seconds: float) -> Dict[str, Any]:
+        """Poll a batch with exponential backoff until it finishes or max_wait_seconds passes"""
+        delay = BATCH_POLL_INITIAL_DELAY
+        waited = 0.0
+        while True:
+            batch = await rate_limiter.make_request(context, f"{base_url}/batches/{batch_id}", method="GET")
+            if batch.get("status") == "finished" or waited >= max_wait_seconds:
+                return batch
+            sleep_for = min(delay, max_wait_seconds - waited)
+            await asyncio.sleep(sleep_for)
+            waited += sleep_for
+            delay = min(delay * 2, BATCH_POLL_MAX_DELAY)
+
+    async def _collect_batch(self, context: ExecutionContext, base_url: str, batch_id: str,
+                             max_wait_seconds: float) -> Dict[str, Any]:
+        batch = await self._wait_for_batch(context, base_url, batch_id, max_wait_seconds)
+        result = {
+            "status": batch.get("status"),
+            "batch_id": batch_id,
+            "total_operations": batch.get("total_operations"),
+            "finished_operations": batch.get("finished_operations"),
+            "errored_operations": batch.get("errored_operations")
+        }
+        if batch.get("status") != "finished":
+            return result
+
+        outcomes = []
+        if batch.get("response_body_url"):
+            # The archive is a pre-signed download link, so no Mailchimp auth is sent
+            async with aiohttp.ClientSession() as session:
+                async with session.get(batch["response_body_url"]) as response:
+                    response.raise_for_status()
+                    archive = await response.read()
+            results = parse_batch_results_archive(archive)
+            result["is_tag_batch"] = any((item.get("operation_id") or "").endswith(":tags") for item in results)
+            outcomes = batch_results_to_outcomes(results)
+        result["outcomes"] = outcomes
+        return result
+
+    async def _submit_batch(self, context: ExecutionContext, base_url: str, operations: List[Dict[str, Any]],
+                            max_wait_seconds: float) -> Dict[str, Any]:
+        batch = await rate_limiter.make_request(
+            context,
+            f"{base_url}/batches",
+            method="POST",
+            json={"operations": operations}
+        )
+        return await self._collect_batch(context, base_url, batch["id"], max_wait_seconds)
+
+    async def _apply_tags(self, context: ExecutionContext, base_url: str, list_id: str,
+                          members: List[Dict[str, Any]], outcome: Dict[str, Any],
+                          max_wait_seconds: float) -> Dict[str, Any]:
+        """Once the member batch has finished, tag the members it added or updated in a second batch"""
+        outcomes = outcome.get("outcomes", [])
+        upserted = {item["email_address"] for item in outcomes if item["success"]}
+        operations = build_tag_operations(list_id, [member for member in members if member["email_address"] in upserted])
+        if not operations:
+            return outcome
+
+        tag_outcome = await self._submit_batch(context, base_url, operations, max_wait_seconds)
+        if tag_outcome.get("status") != "finished":
+            # Members are done; the tag batch can be collected later with its batch_id
+            return {**tag_outcome, "outcomes": outcomes}
+
+        by_email = {item["email_address"]: item for item in outcomes}
+        for tag_result in tag_outcome.get("outcomes", []):
+            member_outcome = by_email.get(tag_result["email_address"])
+            if member_outcome is not None and not tag_result["success"]:
+                member_outcome["success"] = False
+                member_outcome["error"] = tag_result.get("error")
+        return {**outcome, "outcomes": outcomes}
+
+    async def execute(self, inputs: Dict[str, Any], context: ExecutionContext):
+        list_id = inputs.get("list_id")
+        members = inputs.get("members") or []
+        batch_id = inputs.get("batch_id")
+        started_at = time.monotonic()
+
+        if not batch_id:
+            if not list_id:
+                return ActionResult(data={"result": False, "error": "list_id is required"}, cost_usd=0.0)
+            if not members:
+                return ActionResult(data={"result": False, "error": "members is required"}, cost_usd=0.0)
+            if any(not member.get("email_address") for member in members):
+                return ActionResult(data={"result": False, "error": "every member needs an email_address"}, cost_usd=0.0)
+
+        default_status = inputs.get("status", "subscribed")
+        update_existing = inputs.get("update_existing", True)
+        max_wait_seconds = inputs.get("max_wait_seconds", BATCH_DEFAULT_MAX_WAIT)
+        mode = inputs.get("mode", "auto")
+        if mode == "auto":
+            mode = "batch_operations" if any(member.get("tags") for member in members) else "batch_subscribe"
+
+        try:
+            # Get data center from metadata
+            dc = get_data_center(context)
+            base_url = get_mailchimp_base_url(dc)
+
+            if batch_id:
+                # Collect results of a batch submitted earlier
+                mode = "batch_operations"
+                outcome = await self._collect_batch(context, base_url, batch_id, max_wait_seconds)
+            elif mode == "batch_subscribe":
+                outcome = await self._batch_subscribe(context, base_url, list_id, members, default_status, update_existing)
+            else:
+                operations = build_batch_operations(list_id, members, default_status, update_existing)
+                outcome = await self._submit_batch(context, base_url, operations, max_wait_seconds)
+
+            # Finished member writes (either mode) are followed by a tag batch when any member has tags
+            if (list_id and outcome.get("status") == "finished"
+                    and not outcome.get("is_tag_batch") and any(member.get("tags") for member in members)):
+                remaining_wait = max(0.0, max_wait_seconds - (time.monotonic() - started_at))
+                outcome = await self._apply_tags(context, base_url, list_id, members, outcome, remaining_wait)
+
+            outcomes = outcome.get("outcomes", [])
+            return ActionResult(
+                data={
+                    "result": True,
+                    "mode": mode,
+                    "status": outcome.get("status"),
+                    "batch_id": outcome.get("batch_id"),
+                    "succeeded_count": sum(1 for item in outcomes if item["success"]),
+                    "failed_count": sum(1 for item in outcomes if not item["success"]),
+                    "outcomes": outcomes
+                },
+                cost_usd=0.0
+            )
+
+        except MailchimpRateLimitException as e:
+            return ActionResult(
+                data={
+                    "result": False,
+                    "error": f"Rate limit exceeded. Retry after {e.retry_after} seconds."
+                },
+                cost_usd=0.0
+            )
+        except Exception as e:
+            return ActionResult(
+                data={
+                    "result": False,
+                    "error": str(e)
+                },
+                cost_usd=0.0
+            )
+
+
 # ---- Connected Account Handler ----
 
 
@@ -186,6 +186,33 @@ async def test_get_list_members():
             return None
 
 
+async def test_bulk_upsert_members():
+    """Test adding or updating several members in one call."""
+    auth = {
+        "credentials": {
+            "access_token": "your_access_token_here"
+        }
+    }
+
+    inputs = {
+        "list_id": "your_list_id_here",
+        "members": [
+            {"email_address": "bulk1@example.com", "merge_fields": {"FNAME": "Ann"}},
+            {"email_address": "bulk2@example.com", "status": "pending"}
+        ],
+        "update_existing": True
+    }
+
+    async with ExecutionContext(auth=auth) as context:
+        try:
+            result = await mailchimp.execute_action("bulk_upsert_members", inputs, context)
+            print(f"Bulk Upsert Members Result: {result}")
+            return result
+        except Exception as e:
+            print(f"Error testing bulk_upsert_members: {e}")
+            return None
+
+
 async def test_get_campaigns():
     """Test retrieving all campaigns."""
     auth = {
@@ -293,16 +320,20 @@ async def main():
     await test_get_list_members()
     print()
 
+    print("8. Testing bulk_upsert_members...")
+    await test_bulk_upsert_members()
+    print()
+
     # Test campaign management actions
-    print("8. Testing get_campaigns...")
+    print("9. Testing get_campaigns...")
     await test_get_campaigns()
     print()
 
-    print("9. Testing create_campaign...")
+    print("10. Testing create_campaign...")
     await test_create_campaign()
     print()
 
-    print("10. Testing get_campaign...")
+    print("11. Testing get_campaign...")
     await test_get_campaign()
     print()
 
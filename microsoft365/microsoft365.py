@@ -1,8 +1,9 @@
 from autohive_integrations_sdk import (
     Integration, ExecutionContext, ActionHandler, ActionResult
 )
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
+import asyncio
 import base64
 import aiohttp
 import urllib.parse
@@ -13,18 +14,282 @@ microsoft365 = Integration.load()
 # Microsoft Graph API Base URL
 GRAPH_API_BASE = "https://graph.microsoft.com/v1.0"
 
-async def fetch_binary_content(url: str, context: ExecutionContext) -> bytes:
-    """Fetch binary content directly without SDK text parsing"""
+# Pooled session settings for binary downloads
+BINARY_POOL_SIZE = 20
+BINARY_CHUNK_SIZE = 64 * 1024
+DEFAULT_MAX_DOWNLOAD_BYTES = 50 * 1024 * 1024
+
+# One keep-alive session per worker event loop, shared by all binary downloads on that loop.
+# A plain dict rather than weak keys: each session references its loop, so a weakly keyed
+# entry would never be dropped; entries are pruned once their loop has closed instead.
+_binary_sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+
+# Close tasks for sessions whose loop has closed, kept referenced until done
+_stale_session_closes: set = set()
+
+def _prune_binary_sessions(loop: asyncio.AbstractEventLoop) -> None:
+    """Drop the sessions of event loops that have closed.
+
+    A running loop's session is never touched here, so downloads on other worker
+    loops are unaffected. A closed loop has already torn down its transports, so
+    closing its session only releases the connector and runs no I/O on that loop.
+    """
+    for session_loop, session in list(_binary_sessions.items()):
+        if session_loop.is_closed():
+            del _binary_sessions[session_loop]
+            if not session.closed:
+                task = loop.create_task(session.close())
+                _stale_session_closes.add(task)
+                task.add_done_callback(_stale_session_closes.discard)
+
+def get_binary_session() -> aiohttp.ClientSession:
+    """Return the running loop's pooled binary download session, creating it on first use.
+
+    Reusing the session keeps TCP+TLS connections to Graph and its download hosts
+    alive between files instead of paying the handshake for every download.
+    """
+    loop = asyncio.get_running_loop()
+    session = _binary_sessions.get(loop)
+    if session is None or session.closed:
+        _prune_binary_sessions(loop)
+        connector = aiohttp.TCPConnector(limit=BINARY_POOL_SIZE, keepalive_timeout=60, ttl_dns_cache=300)
+        session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=120)
+        )
+        _binary_sessions[loop] = session
+    return session
+
+def _binary_auth_headers(context: ExecutionContext) -> Dict[str, str]:
     headers = {}
     if context.auth and "credentials" in context.auth:
         access_token = context.auth["credentials"]["access_token"]
         headers["Authorization"] = f"Bearer {access_token}"
+    return headers
+
+def _check_download_size(size: int, max_bytes: Optional[int]) -> None:
+    if max_bytes is not None and size > max_bytes:
+        raise Exception(f"File size {size} bytes exceeds the maximum download size of {max_bytes} bytes")
+
+async def fetch_binary_content_base64(
+    url: str, context: ExecutionContext, max_bytes: Optional[int] = DEFAULT_MAX_DOWNLOAD_BYTES
+) -> str:
+    """Stream binary content and base64 encode it incrementally.
+
+    Chunks are encoded as they arrive (in multiples of 3 bytes so the pieces join
+    into valid base64), so the raw file is never held in memory as a whole.
+    Raises if the Content-Length or the streamed size exceeds max_bytes.
+    """
+    session = get_binary_session()
+    async with session.get(url, headers=_binary_auth_headers(context)) as response:
+        if not response.ok:
+            raise Exception(f"HTTP {response.status}: {await response.text()}")
+        if response.content_length is not None:
+            _check_download_size(response.content_length, max_bytes)
+
+        encoded_parts = []
+        remainder = b""
+        total = 0
+        async for chunk in response.content.iter_chunked(BINARY_CHUNK_SIZE):
+            total += len(chunk)
+            _check_download_size(total, max_bytes)
+            data = remainder + chunk
+            cut = len(data) - len(data) % 3
+            encoded_parts.append(base64.b64encode(data[:cut]).decode('ascii'))
+            remainder = data[cut:]
+        if remainder:
+            encoded_parts.append(base64.b64encode(remainder).decode('ascii'))
+        return "".join(encoded_parts)
+
+def _max_download_bytes(inputs: Dict[str, Any]) -> int:
+    """Resolve the optional max_size_mb action input to a byte limit."""
+    max_size_mb = inputs.get("max_size_mb")
+    if max_size_mb is None:
+        return DEFAULT_MAX_DOWNLOAD_BYTES
+    return int(float(max_size_mb) * 1024 * 1024)
+
+# Microsoft Graph JSON batching limits
+GRAPH_BATCH_MAX_REQUESTS = 20
+GRAPH_BATCH_RETRY_STATUSES = {429, 503, 504}
+GRAPH_BATCH_DEFAULT_RETRY_AFTER = 5
+
+def _chunk_batch_requests(requests: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """Split sub-requests into $batch payloads of at most GRAPH_BATCH_MAX_REQUESTS.
+
+    Requests linked through dependsOn are kept in the same payload because Graph
+    only resolves dependencies within a single batch.
+    """
+    parents = {request["id"]: request["id"] for request in requests}
+
+    def find_root(request_id: str) -> str:
+        while parents[request_id] != request_id:
+            parents[request_id] = parents[parents[request_id]]
+            request_id = parents[request_id]
+        return request_id
+
+    for request in requests:
+        for dependency in request.get("dependsOn", []):
+            if dependency in parents:
+                parents[find_root(request["id"])] = find_root(dependency)
+
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for request in requests:
+        groups.setdefault(find_root(request["id"]), []).append(request)
+
+    chunks = []
+    current: List[Dict[str, Any]] = []
+    for group in groups.values():
+        if len(group) > GRAPH_BATCH_MAX_REQUESTS:
+            raise ValueError(
+                f"Dependency chain of {len(group)} requests exceeds the Graph batch limit of {GRAPH_BATCH_MAX_REQUESTS}"
+            )
+        if len(current) + len(group) > GRAPH_BATCH_MAX_REQUESTS:
+            chunks.append(current)
+            current = []
+        current.extend(group)
+    if current:
+        chunks.append(current)
+    return chunks
+
+def _batch_retry_after(response: Dict[str, Any]) -> int:
+    """Read the Retry-After header (seconds) from a batch sub-response."""
+    for name, value in (response.get("headers") or {}).items():
+        if name.lower() == "retry-after":
+            try:
+                return max(int(value), 0)
+            except (TypeError, ValueError):
+                break
+    return GRAPH_BATCH_DEFAULT_RETRY_AFTER
+
+def _batch_error_message(response: Dict[str, Any]) -> str:
+    """Extract a readable error message from a failed batch sub-response."""
+    body = response.get("body")
+    if isinstance(body, dict) and isinstance(body.get("error"), dict):
+        return body["error"].get("message") or body["error"].get("code") or f"HTTP {response.get('status')}"
+    return f"HTTP {response.get('status')}"
+
+async def execute_graph_batch(
+    requests: List[Dict[str, Any]], context: ExecutionContext, max_retries: int = 3
+) -> Dict[str, Dict[str, Any]]:
+    """Execute sub-requests through Graph JSON batching (POST /$batch).
+
+    Each request is a dict with id, method, url (relative to the API version,
+    e.g. /me/messages/{id}) and optional headers, body and dependsOn. Requests are
+    packed GRAPH_BATCH_MAX_REQUESTS at a time. Sub-requests throttled with 429
+    (or 503/504) are retried after the largest Retry-After the batch returned,
+    together with dependents that failed with 424 because of them.
+
+    Returns the sub-responses (id, status, headers, body) keyed by request id.
+    """
+    requests_by_id = {request["id"]: request for request in requests}
+    responses: Dict[str, Dict[str, Any]] = {}
+    pending = list(requests)
+    attempt = 0
+
+    while pending:
+        pending_ids = {request["id"] for request in pending}
+
+        for chunk in _chunk_batch_requests(pending):
+            payload = []
+            for request in chunk:
+                sub_request = dict(request)
+                # Dependencies that already completed in an earlier round are not resent
+                depends_on = [dep for dep in request.get("dependsOn", []) if dep in pending_ids]
+                if depends_on:
+                    sub_request["dependsOn"] = depends_on
+                else:
+                    sub_request.pop("dependsOn", None)
+                payload.append(sub_request)
+
+            response = await context.fetch(
+                f"{GRAPH_API_BASE}/$batch",
+                method="POST",
+                json={"requests": payload}
+            )
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url, headers=headers) as response:
-            if not response.ok:
-                raise Exception(f"HTTP {response.status}: {await response.text()}")
-            return await response.read()  # Returns bytes directly
+            for sub_response in response.get("responses", []):
+                responses[sub_response["id"]] = sub_response
+
+        retry_ids = {
+            request_id for request_id in pending_ids
+            if responses.get(request_id, {}).get("status") in GRAPH_BATCH_RETRY_STATUSES
+        }
+
+        # Dependents that failed only because a throttled request never ran
+        added = True
+        while added:
+            added = False
+            for request_id in pending_ids - retry_ids:
+                if responses.get(request_id, {}).get("status") != 424:
+                    continue
+                if any(dep in retry_ids for dep in requests_by_id[request_id].get("dependsOn", [])):
+                    retry_ids.add(request_id)
+                    added = True
+
+        if not retry_ids or attempt >= max_retries:
+            break
+
+        attempt += 1
+        delay = max(
+            (_batch_retry_after(responses[request_id]) for request_id in retry_ids
+             if responses[request_id].get("status") in GRAPH_BATCH_RETRY_STATUSES),
+            default=GRAPH_BATCH_DEFAULT_RETRY_AFTER
+        )
+        await asyncio.sleep(delay)
+        pending = [request for request in requests if request["id"] in retry_ids]
+
+    return responses
+
+# Delta query paging defaults
+DELTA_PAGE_SIZE = 100
+DELTA_MAX_PAGES = 50
+
+async def fetch_delta_pages(
+    url: str, context: ExecutionContext, params: Optional[Dict[str, Any]] = None,
+    page_size: int = DELTA_PAGE_SIZE, max_pages: int = DELTA_MAX_PAGES
+) -> Dict[str, Any]:
+    """Follow a Graph delta query until its @odata.deltaLink (or max_pages).
+
+    url is either the initial /delta endpoint (with params) or a deltaLink/nextLink
+    returned by a previous sync, which already carries its own query string.
+
+    Returns the changed items, the link to resume from and whether more pages remain.
+    When has_more is False the link is a deltaLink for the next incremental sync;
+    otherwise it is a nextLink that continues the current round.
+    """
+    headers = {"Prefer": f"odata.maxpagesize={page_size}"}
+    items = []
+    next_url = url
+    request_params = params
+    pages = 0
+
+    while next_url and pages < max_pages:
+        if request_params:
+            response = await context.fetch(next_url, params=request_params, headers=headers)
+            request_params = None
+        else:
+            # deltaLink/nextLink already contain query params, don't pass params again
+            response = await context.fetch(next_url, headers=headers)
+        pages += 1
+
+        items.extend(response.get("value", []))
+
+        if response.get("@odata.deltaLink"):
+            return {"items": items, "delta_link": response["@odata.deltaLink"], "has_more": False}
+        next_url = response.get("@odata.nextLink")
+
+    return {"items": items, "delta_link": next_url or "", "has_more": bool(next_url)}
+
+def _split_delta_removed(items: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Separate changed items from @removed tombstones in a delta response."""
+    changed = []
+    removed = []
+    for item in items:
+        if "@removed" in item:
+            removed.append({"id": item["id"], "reason": item["@removed"].get("reason", "deleted")})
+        else:
+            changed.append(item)
+    return changed, removed
 
 # ---- Action Handlers ----
 
@@ -468,6 +733,208 @@ class ListEmailsAction(ActionHandler):
                 cost_usd=0.0
             )
 
+@microsoft365.action("sync_emails_delta")
+class SyncEmailsDeltaAction(ActionHandler):
+    """Incrementally sync messages in a mail folder using Graph delta queries.
+
+    The first call (no delta_link) returns every message in the folder along with a
+    delta_link. Passing that delta_link back returns only messages created, updated
+    or removed since then.
+    """
+    async def execute(self, inputs: Dict[str, Any], context: ExecutionContext) -> ActionResult:
+        try:
+            delta_link = inputs.get("delta_link")
+            folder = inputs.get("folder", "Inbox")
+            max_pages = inputs.get("max_pages", DELTA_MAX_PAGES)
+
+            if delta_link:
+                delta = await fetch_delta_pages(delta_link, context, max_pages=max_pages)
+            else:
+                params = {
+                    "$select": "id,subject,sender,receivedDateTime,bodyPreview,hasAttachments,isRead,importance,parentFolderId"
+                }
+                delta = await fetch_delta_pages(
+                    f"{GRAPH_API_BASE}/me/mailFolders/{folder}/messages/delta",
+                    context, params=params, max_pages=max_pages
+                )
+
+            changed, removed = _split_delta_removed(delta["items"])
+
+            emails = []
+            for email in changed:
+                emails.append({
+                    "id": email["id"],
+                    "subject": email.get("subject") or "",
+                    "sender": email.get("sender", {}),
+                    "receivedDateTime": email.get("receivedDateTime", ""),
+                    "bodyPreview": email.get("bodyPreview") or "",
+                    "hasAttachments": email.get("hasAttachments", False),
+                    "isRead": email.get("isRead", False),
+                    "importance": email.get("importance", "normal"),
+                    "parentFolderId": email.get("parentFolderId", "")
+                })
+
+            return ActionResult(
+                data={
+                    "emails": emails,
+                    "removed": removed,
+                    "delta_link": delta["delta_link"],
+                    "has_more": delta["has_more"],
+                    "result": True
+                },
+                cost_usd=0.0
+            )
+
+        except Exception as e:
+            return ActionResult(
+                data={
+                    "emails": [],
+                    "removed": [],
+                    "delta_link": inputs.get("delta_link", ""),
+                    "has_more": False,
+                    "result": False,
+                    "error": str(e)
+                },
+                cost_usd=0.0
+            )
+
+@microsoft365.action("sync_calendar_events_delta")
+class SyncCalendarEventsDeltaAction(ActionHandler):
+    """Incrementally sync calendar events in a date range using calendarView delta.
+
+    The date range is fixed by the first call; later calls only need the delta_link.
+    """
+    async def execute(self, inputs: Dict[str, Any], context: ExecutionContext) -> ActionResult:
+        try:
+            delta_link = inputs.get("delta_link")
+            max_pages = inputs.get("max_pages", DELTA_MAX_PAGES)
+
+            if delta_link:
+                delta = await fetch_delta_pages(delta_link, context, max_pages=max_pages)
+            else:
+                if "start_datetime" in inputs:
+                    start_datetime = inputs["start_datetime"]
+                    end_datetime = inputs.get("end_datetime", start_datetime)
+                else:
+                    # Same default window as list_calendar_events: next 30 days
+                    now = datetime.utcnow()
+                    start_datetime = now.strftime("%Y-%m-%dT%H:%M:%SZ")
+                    end_datetime = (now + timedelta(days=30)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+                # calendarView delta does not support $select, $filter or $orderby
+                params = {"startDateTime": start_datetime, "endDateTime": end_datetime}
+                delta = await fetch_delta_pages(
+                    f"{GRAPH_API_BASE}/me/calendarView/delta", context, params=params, max_pages=max_pages
+                )
+
+            changed, removed = _split_delta_removed(delta["items"])
+
+            events = []
+            for event in changed:
+                organizer_email = ""
+                if event.get("organizer") and event["organizer"].get("emailAddress"):
+                    organizer_email = event["organizer"]["emailAddress"].get("address", "")
+
+                events.append({
+                    "id": event["id"],
+                    "subject": event.get("subject") or "",
+                    "start": event.get("start", {}),
+                    "end": event.get("end", {}),
+                    "location": (event.get("location") or {}).get("displayName") or "",
+                    "bodyPreview": event.get("bodyPreview") or "",
+                    "organizer": organizer_email,
+                    "webLink": event.get("webLink", ""),
+                    "isAllDay": event.get("isAllDay", False),
+                    "isCancelled": event.get("isCancelled", False)
+                })
+
+            return ActionResult(
+                data={
+                    "events": events,
+                    "removed": removed,
+                    "delta_link": delta["delta_link"],
+                    "has_more": delta["has_more"],
+                    "result": True
+                },
+                cost_usd=0.0
+            )
+
+        except Exception as e:
+            return ActionResult(
+                data={
+                    "events": [],
+                    "removed": [],
+                    "delta_link": inputs.get("delta_link", ""),
+                    "has_more": False,
+                    "result": False,
+                    "error": str(e)
+                },
+                cost_usd=0.0
+            )
+
+@microsoft365.action("sync_files_delta")
+class SyncFilesDeltaAction(ActionHandler):
+    """Incrementally sync the user's OneDrive using drive delta queries."""
+    async def execute(self, inputs: Dict[str, Any], context: ExecutionContext) -> ActionResult:
+        try:
+            delta_link = inputs.get("delta_link")
+            max_pages = inputs.get("max_pages", DELTA_MAX_PAGES)
+
+            if delta_link:
+                delta = await fetch_delta_pages(delta_link, context, max_pages=max_pages)
+            else:
+                params = {
+                    "$select": "id,name,size,lastModifiedDateTime,webUrl,folder,file,parentReference,deleted"
+                }
+                delta = await fetch_delta_pages(
+                    f"{GRAPH_API_BASE}/me/drive/root/delta", context, params=params, max_pages=max_pages
+                )
+
+            files = []
+            removed = []
+            for item in delta["items"]:
+                # Drive delta marks removed items with a deleted facet instead of @removed
+                if "deleted" in item or "@removed" in item:
+                    removed.append({"id": item["id"], "reason": "deleted"})
+                    continue
+
+                file_item = {
+                    "id": item["id"],
+                    "name": item.get("name", ""),
+                    "size": item.get("size", 0),
+                    "lastModifiedDateTime": item.get("lastModifiedDateTime", ""),
+                    "webUrl": item.get("webUrl", ""),
+                    "path": (item.get("parentReference") or {}).get("path", "")
+                }
+                # Only include folder property if it exists (for folders only)
+                if "folder" in item:
+                    file_item["folder"] = item["folder"]
+                files.append(file_item)
+
+            return ActionResult(
+                data={
+                    "files": files,
+                    "removed": removed,
+                    "delta_link": delta["delta_link"],
+                    "has_more": delta["has_more"],
+                    "result": True
+                },
+                cost_usd=0.0
+            )
+
+        except Exception as e:
+            return ActionResult(
+                data={
+                    "files": [],
+                    "removed": [],
+                    "delta_link": inputs.get("delta_link", ""),
+                    "has_more": False,
+                    "result": False,
+                    "error": str(e)
+                },
+                cost_usd=0.0
+            )
+
 @microsoft365.action("list_emails_from_contact")
 class ListEmailsFromContactAction(ActionHandler):
     async def execute(self, inputs: Dict[str, Any], context: ExecutionContext) -> ActionResult:
@@ -565,13 +1032,20 @@ class ListMailFoldersAction(ActionHandler):
     """List mail folders in the user's mailbox.
 
     Returns root-level folders by default. Use include_hidden to show hidden folders.
-    Use include_children to recursively fetch all nested folders.
+    Use include_children to fetch all nested folders. The tree is expanded level by
+    level: each request uses $expand=childFolders so a folder's children arrive with
+    it, and the remaining childFolders requests of a level run concurrently.
     """
+    FOLDER_SELECT = "id,displayName,parentFolderId,childFolderCount,unreadItemCount,totalItemCount,isHidden"
+    MAX_CONCURRENT_REQUESTS = 8
+    DEFAULT_MAX_FOLDERS = 1000
+
     async def execute(self, inputs: Dict[str, Any], context: ExecutionContext) -> ActionResult:
         try:
             include_hidden = inputs.get("include_hidden", False)
             include_children = inputs.get("include_children", False)
             folder_id = inputs.get("folder_id")  # Optional: list children of specific folder
+            max_folders = inputs.get("max_folders", self.DEFAULT_MAX_FOLDERS)
 
             # Build API URL
             if folder_id:
@@ -579,55 +1053,39 @@ class ListMailFoldersAction(ActionHandler):
             else:
                 api_url = f"{GRAPH_API_BASE}/me/mailFolders"
 
-            # Build query parameters
-            params = {
-                "$select": "id,displayName,parentFolderId,childFolderCount,unreadItemCount,totalItemCount,isHidden"
-            }
-
-            if include_hidden:
-                params["includeHiddenFolders"] = "true"
-
-            # Fetch all pages (default page size is 10)
-            all_folder_items = []
-            next_url = api_url
-            is_first_request = True
+            all_folder_items = await self._fetch_folder_pages(
+                api_url, context, include_hidden, expand_children=include_children
+            )
 
-            while next_url:
-                if is_first_request:
-                    response = await context.fetch(next_url, params=params)
-                    is_first_request = False
-                else:
-                    # nextLink already contains query params, don't pass params again
-                    response = await context.fetch(next_url)
+            # max_folders only bounds the recursive walk; a flat listing returns every folder
+            top_level = all_folder_items
+            truncated = False
+            descendants = []
+            if include_children:
+                top_level = all_folder_items[:max_folders]
+                truncated = len(all_folder_items) > max_folders
+                if not truncated:
+                    descendants, truncated = await self._fetch_descendants_breadth_first(
+                        top_level, context, include_hidden, max_folders - len(top_level)
+                    )
 
-                all_folder_items.extend(response.get("value", []))
-                next_url = response.get("@odata.nextLink")
+            # Emit parents followed by their subtrees, as the depth-first walk did
+            children_by_parent: Dict[str, List[Dict[str, Any]]] = {}
+            for folder in descendants:
+                children_by_parent.setdefault(folder.get("parentFolderId", ""), []).append(folder)
 
-            # Format folders
             folders = []
-            for folder in all_folder_items:
-                folder_data = {
-                    "id": folder["id"],
-                    "displayName": folder.get("displayName", ""),
-                    "parentFolderId": folder.get("parentFolderId", ""),
-                    "childFolderCount": folder.get("childFolderCount", 0),
-                    "unreadItemCount": folder.get("unreadItemCount", 0),
-                    "totalItemCount": folder.get("totalItemCount", 0),
-                    "isHidden": folder.get("isHidden", False)
-                }
-                folders.append(folder_data)
-
-                # Recursively fetch child folders if requested
-                if include_children and folder.get("childFolderCount", 0) > 0:
-                    child_folders = await self._fetch_child_folders_recursive(
-                        folder["id"], context, include_hidden
-                    )
-                    folders.extend(child_folders)
+            stack = list(reversed(top_level))
+            while stack:
+                folder = stack.pop()
+                folders.append(self._format_folder(folder))
+                stack.extend(reversed(children_by_parent.get(folder["id"], [])))
 
             return ActionResult(
                 data={
                     "folders": folders,
                     "total_count": len(folders),
+                    "truncated": truncated,
                     "result": True
                 },
                 cost_usd=0.0
@@ -638,64 +1096,96 @@ class ListMailFoldersAction(ActionHandler):
                 data={
                     "folders": [],
                     "total_count": 0,
+                    "truncated": False,
                     "result": False,
                     "error": str(e)
                 },
                 cost_usd=0.0
             )
 
-    async def _fetch_child_folders_recursive(
-        self, parent_folder_id: str, context: ExecutionContext, include_hidden: bool
+    @staticmethod
+    def _format_folder(folder: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "id": folder["id"],
+            "displayName": folder.get("displayName", ""),
+            "parentFolderId": folder.get("parentFolderId", ""),
+            "childFolderCount": folder.get("childFolderCount", 0),
+            "unreadItemCount": folder.get("unreadItemCount", 0),
+            "totalItemCount": folder.get("totalItemCount", 0),
+            "isHidden": folder.get("isHidden", False)
+        }
+
+    async def _fetch_folder_pages(
+        self, api_url: str, context: ExecutionContext, include_hidden: bool, expand_children: bool
     ) -> List[Dict[str, Any]]:
-        """Recursively fetch all child folders under a parent folder."""
-        try:
-            api_url = f"{GRAPH_API_BASE}/me/mailFolders/{parent_folder_id}/childFolders"
-            params = {
-                "$select": "id,displayName,parentFolderId,childFolderCount,unreadItemCount,totalItemCount,isHidden"
-            }
-            if include_hidden:
-                params["includeHiddenFolders"] = "true"
-
-            # Fetch all pages (default page size is 10)
-            all_folder_items = []
-            next_url = api_url
-            is_first_request = True
-
-            while next_url:
-                if is_first_request:
-                    response = await context.fetch(next_url, params=params)
-                    is_first_request = False
-                else:
-                    # nextLink already contains query params, don't pass params again
-                    response = await context.fetch(next_url)
+        """Fetch every page of a mail folder collection."""
+        params = {"$select": self.FOLDER_SELECT}
+        if expand_children:
+            params["$expand"] = f"childFolders($select={self.FOLDER_SELECT})"
+        if include_hidden:
+            params["includeHiddenFolders"] = "true"
+
+        # Fetch all pages (default page size is 10)
+        all_folder_items = []
+        next_url = api_url
+        is_first_request = True
+
+        while next_url:
+            if is_first_request:
+                response = await context.fetch(next_url, params=params)
+                is_first_request = False
+            else:
+                # nextLink already contains query params, don't pass params again
+                response = await context.fetch(next_url)
+
+            all_folder_items.extend(response.get("value", []))
+            next_url = response.get("@odata.nextLink")
+
+        return all_folder_items
+
+    async def _fetch_descendants_breadth_first(
+        self, parents: List[Dict[str, Any]], context: ExecutionContext, include_hidden: bool, max_folders: int
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """Expand all folders below parents one tree level at a time.
+
+        Children already returned through $expand are used as-is; other folders with
+        children are fetched concurrently (at most MAX_CONCURRENT_REQUESTS at once).
+        Stops after max_folders descendants and reports whether the tree was truncated.
+        """
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+
+        async def fetch_children(folder: Dict[str, Any]) -> List[Dict[str, Any]]:
+            expanded = folder.get("childFolders")
+            if expanded is not None and len(expanded) >= folder.get("childFolderCount", 0):
+                return expanded
+            async with semaphore:
+                try:
+                    return await self._fetch_folder_pages(
+                        f"{GRAPH_API_BASE}/me/mailFolders/{folder['id']}/childFolders",
+                        context, include_hidden, expand_children=True
+                    )
+                except Exception:
+                    # If fetching children fails, skip this subtree but don't fail the whole operation
+                    return []
 
-                all_folder_items.extend(response.get("value", []))
-                next_url = response.get("@odata.nextLink")
+        descendants = []
+        level = [folder for folder in parents if folder.get("childFolderCount", 0) > 0]
 
-            folders = []
-            for folder in all_folder_items:
-                folder_data = {
-                    "id": folder["id"],
-                    "displayName": folder.get("displayName", ""),
-                    "parentFolderId": folder.get("parentFolderId", ""),
-                    "childFolderCount": folder.get("childFolderCount", 0),
-                    "unreadItemCount": folder.get("unreadItemCount", 0),
-                    "totalItemCount": folder.get("totalItemCount", 0),
-                    "isHidden": folder.get("isHidden", False)
-                }
-                folders.append(folder_data)
+        while level:
+            results = await asyncio.gather(*(fetch_children(folder) for folder in level))
 
-                # Recursively fetch children if this folder has child folders
-                if folder.get("childFolderCount", 0) > 0:
-                    child_folders = await self._fetch_child_folders_recursive(
-                        folder["id"], context, include_hidden
-                    )
-                    folders.extend(child_folders)
+            next_level = []
+            for parent, children in zip(level, results):
+                for child in children:
+                    if len(descendants) >= max_folders:
+                        return descendants, True
+                    child.setdefault("parentFolderId", parent["id"])
+                    descendants.append(child)
+                    if child.get("childFolderCount", 0) > 0:
+                        next_level.append(child)
+            level = next_level
 
-            return folders
-        except Exception:
-            # If fetching children fails, return empty list but don't fail the whole operation
-            return []
+        return descendants, False
 
 
 @microsoft365.action("get_mail_folder")
@@ -1046,6 +1536,7 @@ class ReadOneDriveFileContentAction(ActionHandler):
     async def execute(self, inputs: Dict[str, Any], context: ExecutionContext) -> ActionResult:
         try:
             file_id = inputs["file_id"]
+            max_bytes = _max_download_bytes(inputs)
             
             # Get file metadata first
             metadata_params = {
@@ -1067,22 +1558,16 @@ class ReadOneDriveFileContentAction(ActionHandler):
                 # For Office documents, use Microsoft's PDF conversion API
                 if any(ext in file_name.lower() for ext in ['.docx', '.doc', '.pptx', '.ppt', '.xlsx', '.xls']):
                     content_url = f"{GRAPH_API_BASE}/me/drive/items/{file_id}/content?format=pdf"
-                    # Use binary fetch to avoid SDK text parsing for converted PDFs
-                    content_bytes = await fetch_binary_content(content_url, context)
-
-                    # Encode as base64 for JSON serialization
-                    content = base64.b64encode(content_bytes).decode('utf-8')
+                    # Stream binary content straight into base64 (no SDK text parsing)
+                    content = await fetch_binary_content_base64(content_url, context, max_bytes)
                     content_type = "application/pdf"
                     content_available = True
                     content_info = "Office document converted to PDF and encoded for LLM processing"
                 elif file_name.lower().endswith('.pdf'):
                     # For native PDF files, get content directly (no conversion needed)
                     content_url = f"{GRAPH_API_BASE}/me/drive/items/{file_id}/content"
-                    # Use binary fetch to avoid SDK text parsing for PDFs
-                    content_bytes = await fetch_binary_content(content_url, context)
-
-                    # Encode as base64 for JSON serialization
-                    content = base64.b64encode(content_bytes).decode('utf-8')
+                    # Stream binary content straight into base64 (no SDK text parsing)
+                    content = await fetch_binary_content_base64(content_url, context, max_bytes)
                     content_type = "application/pdf"
                     content_available = True
                     content_info = "PDF content retrieved and encoded for LLM processing"
@@ -1413,6 +1898,7 @@ class DownloadEmailAttachmentAction(ActionHandler):
             message_id = inputs["message_id"]
             attachment_id = inputs["attachment_id"]
             include_content = inputs.get("include_content", True)
+            max_bytes = _max_download_bytes(inputs)
 
             # Get attachment metadata using Microsoft Graph API
             attachment_response = await context.fetch(
@@ -1434,13 +1920,10 @@ class DownloadEmailAttachmentAction(ActionHandler):
 
             if include_content:
                 try:
-                    # Use binary fetch helper for /$value endpoint to get raw content
+                    # Stream raw content from the /$value endpoint straight into base64
                     # GET /me/messages/{message-id}/attachments/{attachment-id}/$value
                     content_url = f"{GRAPH_API_BASE}/me/messages/{message_id}/attachments/{attachment_id}/$value"
-                    content_bytes = await fetch_binary_content(content_url, context)
-
-                    # Base64 encode for JSON serialization (same as OneDrive/SharePoint)
-                    content = base64.b64encode(content_bytes).decode('utf-8')
+                    content = await fetch_binary_content_base64(content_url, context, max_bytes)
                     content_available = True
 
                 except Exception as content_error:
@@ -1518,6 +2001,317 @@ class DownloadEmailAttachmentAction(ActionHandler):
                 cost_usd=0.0
             )
 
+@microsoft365.action("batch_mark_emails_read")
+class BatchMarkEmailsReadAction(ActionHandler):
+    """Mark many emails as read or unread using Graph JSON batching (20 per request)."""
+    async def execute(self, inputs: Dict[str, Any], context: ExecutionContext) -> ActionResult:
+        try:
+            email_ids = inputs["email_ids"]
+            is_read = inputs["is_read"]
+
+            batch_requests = [
+                {
+                    "id": str(index),
+                    "method": "PATCH",
+                    "url": f"/me/messages/{email_id}",
+                    "headers": {"Content-Type": "application/json"},
+                    "body": {"isRead": is_read}
+                } for index, email_id in enumerate(email_ids)
+            ]
+
+            responses = await execute_graph_batch(batch_requests, context)
+
+            results = []
+            for index, email_id in enumerate(email_ids):
+                response = responses.get(str(index), {})
+                if 200 <= response.get("status", 0) < 300:
+                    body = response.get("body") or {}
+                    results.append({
+                        "email_id": email_id,
+                        "isRead": body.get("isRead", is_read),
+                        "result": True
+                    })
+                else:
+                    results.append({
+                        "email_id": email_id,
+                        "result": False,
+                        "error": _batch_error_message(response)
+                    })
+
+            succeeded = sum(1 for item in results if item["result"])
+
+            return ActionResult(
+                data={
+                    "results": results,
+                    "succeeded_count": succeeded,
+                    "failed_count": len(results) - succeeded,
+                    "result": True
+                },
+                cost_usd=0.0
+            )
+
+        except Exception as e:
+            return ActionResult(
+                data={
+                    "results": [],
+                    "succeeded_count": 0,
+                    "failed_count": 0,
+                    "result": False,
+                    "error": str(e)
+                },
+                cost_usd=0.0
+            )
+
+@microsoft365.action("batch_move_emails")
+class BatchMoveEmailsAction(ActionHandler):
+    """Move many emails to a folder using Graph JSON batching.
+
+    When mark_as_read is set, each move depends on a read-status update of the same
+    message (dependsOn), since moving a message changes its ID.
+    """
+    async def execute(self, inputs: Dict[str, Any], context: ExecutionContext) -> ActionResult:
+        try:
+            email_ids = inputs["email_ids"]
+            destination_folder_id = inputs["destination_folder_id"]
+            mark_as_read = inputs.get("mark_as_read", False)
+
+            batch_requests = []
+            for index, email_id in enumerate(email_ids):
+                move_request = {
+                    "id": f"{index}-move",
+                    "method": "POST",
+                    "url": f"/me/messages/{email_id}/move",
+                    "headers": {"Content-Type": "application/json"},
+                    "body": {"destinationId": destination_folder_id}
+                }
+                if mark_as_read:
+                    batch_requests.append({
+                        "id": f"{index}-read",
+                        "method": "PATCH",
+                        "url": f"/me/messages/{email_id}",
+                        "headers": {"Content-Type": "application/json"},
+                        "body": {"isRead": True}
+                    })
+                    move_request["dependsOn"] = [f"{index}-read"]
+                batch_requests.append(move_request)
+
+            responses = await execute_graph_batch(batch_requests, context)
+
+            results = []
+            for index, email_id in enumerate(email_ids):
+                response = responses.get(f"{index}-move", {})
+                if 200 <= response.get("status", 0) < 300:
+                    body = response.get("body") or {}
+                    results.append({
+                        "email_id": email_id,
+                        "id": body.get("id", ""),
+                        "parentFolderId": body.get("parentFolderId", ""),
+                        "subject": body.get("subject") or "",
+                        "result": True
+                    })
+                else:
+                    # A 424 means the read-status update this move depended on failed
+                    if response.get("status") == 424:
+                        response = responses.get(f"{index}-read", response)
+                    results.append({
+                        "email_id": email_id,
+                        "result": False,
+                        "error": _batch_error_message(response)
+                    })
+
+            succeeded = sum(1 for item in results if item["result"])
+
+            return ActionResult(
+                data={
+                    "results": results,
+                    "succeeded_count": succeeded,
+                    "failed_count": len(results) - succeeded,
+                    "result": True
+                },
+                cost_usd=0.0
+            )
+
+        except Exception as e:
+            return ActionResult(
+                data={
+                    "results": [],
+                    "succeeded_count": 0,
+                    "failed_count": 0,
+                    "result": False,
+                    "error": str(e)
+                },
+                cost_usd=0.0
+            )
+
+@microsoft365.action("batch_read_emails")
+class BatchReadEmailsAction(ActionHandler):
+    """Read many emails (with attachment metadata) using Graph JSON batching."""
+    async def execute(self, inputs: Dict[str, Any], context: ExecutionContext) -> ActionResult:
+        try:
+            email_ids = inputs["email_ids"]
+            include_attachments = inputs.get("include_attachments", True)
+
+            query = "$select=id,subject,sender,receivedDateTime,body,hasAttachments"
+            if include_attachments:
+                # Attachment metadata only, same as read_email
+                query += "&$expand=attachments($select=id,name,size,contentType)"
+
+            batch_requests = [
+                {
+                    "id": str(index),
+                    "method": "GET",
+                    "url": f"/me/messages/{email_id}?{query}"
+                } for index, email_id in enumerate(email_ids)
+            ]
+
+            responses = await execute_graph_batch(batch_requests, context)
+
+            emails = []
+            for index, email_id in enumerate(email_ids):
+                response = responses.get(str(index), {})
+                if not 200 <= response.get("status", 0) < 300:
+                    emails.append({
+                        "email_id": email_id,
+                        "email": {},
+                        "attachments": [],
+                        "result": False,
+                        "error": _batch_error_message(response)
+                    })
+                    continue
+
+                body = response.get("body") or {}
+                attachments = [
+                    {
+                        "id": attachment["id"],
+                        "name": attachment.get("name") or "",
+                        "size": attachment.get("size", 0),
+                        "contentType": attachment.get("contentType") or "application/octet-stream"
+                    } for attachment in body.get("attachments", [])
+                ]
+                emails.append({
+                    "email_id": email_id,
+                    "email": {
+                        "id": body.get("id", email_id),
+                        "subject": body.get("subject") or "",
+                        "sender": body.get("sender", {}),
+                        "receivedDateTime": body.get("receivedDateTime", ""),
+                        "body": body.get("body", {}),
+                        "hasAttachments": body.get("hasAttachments", False)
+                    },
+                    "attachments": attachments,
+                    "result": True
+                })
+
+            succeeded = sum(1 for item in emails if item["result"])
+
+            return ActionResult(
+                data={
+                    "emails": emails,
+                    "succeeded_count": succeeded,
+                    "failed_count": len(emails) - succeeded,
+                    "result": True
+                },
+                cost_usd=0.0
+            )
+
+        except Exception as e:
+            return ActionResult(
+                data={
+                    "emails": [],
+                    "succeeded_count": 0,
+                    "failed_count": 0,
+                    "result": False,
+                    "error": str(e)
+                },
+                cost_usd=0.0
+            )
+
+@microsoft365.action("batch_download_email_attachments")
+class BatchDownloadEmailAttachmentsAction(ActionHandler):
+    """Download many email attachments using Graph JSON batching.
+
+    File attachments carry their content as base64 contentBytes in the batch
+    response, so no per-attachment /$value request is needed.
+    """
+    async def execute(self, inputs: Dict[str, Any], context: ExecutionContext) -> ActionResult:
+        try:
+            attachments = inputs["attachments"]
+            include_content = inputs.get("include_content", True)
+
+            batch_requests = []
+            for index, attachment in enumerate(attachments):
+                url = f"/me/messages/{attachment['message_id']}/attachments/{attachment['attachment_id']}"
+                if not include_content:
+                    url += "?$select=id,name,size,contentType,isInline"
+                batch_requests.append({"id": str(index), "method": "GET", "url": url})
+
+            responses = await execute_graph_batch(batch_requests, context)
+
+            files = []
+            for index, attachment in enumerate(attachments):
+                response = responses.get(str(index), {})
+                metadata = {
+                    "id": attachment["attachment_id"],
+                    "name": "",
+                    "size": 0,
+                    "contentType": "",
+                    "message_id": attachment["message_id"],
+                    "is_inline": False
+                }
+                if not 200 <= response.get("status", 0) < 300:
+                    files.append({
+                        "file": {"content": "", "name": "", "contentType": "application/octet-stream"},
+                        "metadata": metadata,
+                        "result": False,
+                        "error": _batch_error_message(response)
+                    })
+                    continue
+
+                body = response.get("body") or {}
+                attachment_name = body.get("name") or ""
+                content_type = body.get("contentType") or "application/octet-stream"
+                metadata.update({
+                    "name": attachment_name,
+                    "size": body.get("size", 0),
+                    "contentType": content_type,
+                    "is_inline": body.get("isInline", False)
+                })
+
+                content = (body.get("contentBytes") or "") if include_content else ""
+                item = {
+                    "file": {"content": content, "name": attachment_name, "contentType": content_type},
+                    "metadata": metadata,
+                    "result": bool(content) or not include_content
+                }
+                if include_content and not content:
+                    # Item and reference attachments have no contentBytes
+                    item["error"] = "Content not available"
+                files.append(item)
+
+            succeeded = sum(1 for item in files if item["result"])
+
+            return ActionResult(
+                data={
+                    "files": files,
+                    "succeeded_count": succeeded,
+                    "failed_count": len(files) - succeeded,
+                    "result": True
+                },
+                cost_usd=0.0
+            )
+
+        except Exception as e:
+            return ActionResult(
+                data={
+                    "files": [],
+                    "succeeded_count": 0,
+                    "failed_count": 0,
+                    "result": False,
+                    "error": str(e)
+                },
+                cost_usd=0.0
+            )
+
 @microsoft365.action("search_emails")
 class SearchEmailsAction(ActionHandler):
     async def execute(self, inputs: Dict[str, Any], context: ExecutionContext) -> ActionResult:
@@ -1909,6 +2703,7 @@ class ReadSharePointDocumentAction(ActionHandler):
             site_id = inputs["site_id"]
             file_id = inputs["file_id"]
             drive_id = inputs.get("drive_id")  # Optional: specific drive ID
+            max_bytes = _max_download_bytes(inputs)
 
             # Get file metadata - use drive-specific endpoint if drive_id provided
             # GET /drives/{drive-id}/items/{file-id} OR /sites/{site-id}/drive/items/{file-id}
@@ -1939,11 +2734,8 @@ class ReadSharePointDocumentAction(ActionHandler):
                         content_url = f"{GRAPH_API_BASE}/drives/{drive_id}/items/{file_id}/content?format=pdf"
                     else:
                         content_url = f"{GRAPH_API_BASE}/sites/{site_id}/drive/items/{file_id}/content?format=pdf"
-                    # Use binary fetch to avoid SDK text parsing for converted PDFs
-                    content_bytes = await fetch_binary_content(content_url, context)
-
-                    # Encode as base64 for JSON serialization
-                    content = base64.b64encode(content_bytes).decode('utf-8')
+                    # Stream binary content straight into base64 (no SDK text parsing)
+                    content = await fetch_binary_content_base64(content_url, context, max_bytes)
                     content_type = "application/pdf"
                     content_available = True
                     content_info = "Office document converted to PDF and encoded for LLM processing"
@@ -1953,11 +2745,8 @@ class ReadSharePointDocumentAction(ActionHandler):
                         content_url = f"{GRAPH_API_BASE}/drives/{drive_id}/items/{file_id}/content"
                     else:
                         content_url = f"{GRAPH_API_BASE}/sites/{site_id}/drive/items/{file_id}/content"
-                    # Use binary fetch to avoid SDK text parsing for PDFs
-                    content_bytes = await fetch_binary_content(content_url, context)
-
-                    # Encode as base64 for JSON serialization
-                    content = base64.b64encode(content_bytes).decode('utf-8')
+                    # Stream binary content straight into base64 (no SDK text parsing)
+                    content = await fetch_binary_content_base64(content_url, context, max_bytes)
                     content_type = "application/pdf"
                     content_available = True
                     content_info = "PDF content retrieved and encoded for LLM processing"
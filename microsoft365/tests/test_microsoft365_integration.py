@@ -1,6 +1,8 @@
+import asyncio
 import unittest
 from unittest.mock import AsyncMock, Mock, patch
 import json
+import base64
 from context import microsoft365
 
 class TestMicrosoft365Integration(unittest.TestCase):
@@ -212,7 +214,7 @@ class TestMicrosoft365Integration(unittest.TestCase):
         api_url = call_args[0][0]
         self.assertIn("search(q='quarterly%20report')", api_url)
     
-    @patch('microsoft365.microsoft365.fetch_binary_content')
+    @patch('microsoft365.microsoft365.fetch_binary_content_base64')
     async def test_read_onedrive_file_content_success(self, mock_fetch_binary):
         """Test successful OneDrive file content reading."""
         # Mock metadata response
@@ -227,9 +229,9 @@ class TestMicrosoft365Integration(unittest.TestCase):
         # Mock content response (PDF conversion)
         mock_content = b"%PDF-1.4\n%fake PDF content for testing"
 
-        # Mock context.fetch for metadata and fetch_binary_content for content
+        # Mock context.fetch for metadata and fetch_binary_content_base64 for content
         self.mock_context.fetch.return_value = mock_metadata
-        mock_fetch_binary.return_value = mock_content
+        mock_fetch_binary.return_value = base64.b64encode(mock_content).decode('utf-8')
 
         handler = microsoft365.ReadOneDriveFileContentAction()
         inputs = {"file_id": "file123"}
@@ -288,7 +290,7 @@ class TestMicrosoft365Integration(unittest.TestCase):
         self.assertIn("/drive/items/file456/content", content_call[0][0])
         self.assertNotIn("format=pdf", content_call[0][0])
 
-    @patch('microsoft365.microsoft365.fetch_binary_content')
+    @patch('microsoft365.microsoft365.fetch_binary_content_base64')
     async def test_read_onedrive_file_content_native_pdf(self, mock_fetch_binary):
         """Test file content reading for native PDF files."""
         # Mock metadata response for PDF file
@@ -303,9 +305,9 @@ class TestMicrosoft365Integration(unittest.TestCase):
         # Mock PDF binary content
         mock_content = b"%PDF-1.4\n%\xc4\xe5\xf2\xe5\xeb\xa7\xf3\xa0\xd0\xc4\xc6 Native PDF content with binary data"
 
-        # Mock context.fetch for metadata and fetch_binary_content for content
+        # Mock context.fetch for metadata and fetch_binary_content_base64 for content
         self.mock_context.fetch.return_value = mock_metadata
-        mock_fetch_binary.return_value = mock_content
+        mock_fetch_binary.return_value = base64.b64encode(mock_content).decode('utf-8')
 
         handler = microsoft365.ReadOneDriveFileContentAction()
         inputs = {"file_id": "file789"}
@@ -607,7 +609,7 @@ class TestDownloadEmailAttachmentAction(unittest.TestCase):
         self.mock_context = Mock()
         self.mock_context.fetch = AsyncMock()
 
-    @patch('microsoft365.microsoft365.fetch_binary_content')
+    @patch('microsoft365.microsoft365.fetch_binary_content_base64')
     async def test_download_attachment_success(self, mock_fetch_binary):
         """Test successful attachment download."""
         # Mock attachment metadata
@@ -623,7 +625,7 @@ class TestDownloadEmailAttachmentAction(unittest.TestCase):
         mock_binary_content = b"PDF binary data here"
 
         self.mock_context.fetch.return_value = mock_metadata
-        mock_fetch_binary.return_value = mock_binary_content
+        mock_fetch_binary.return_value = base64.b64encode(mock_binary_content).decode('utf-8')
 
         handler = microsoft365.DownloadEmailAttachmentAction()
         inputs = {
@@ -1124,7 +1126,7 @@ class TestReadSharePointDocumentAction(unittest.TestCase):
         self.mock_context = Mock()
         self.mock_context.fetch = AsyncMock()
 
-    @patch('microsoft365.microsoft365.fetch_binary_content')
+    @patch('microsoft365.microsoft365.fetch_binary_content_base64')
     async def test_read_sharepoint_document_success(self, mock_fetch_binary):
         """Test successful SharePoint document reading."""
         # Mock metadata response
@@ -1140,7 +1142,7 @@ class TestReadSharePointDocumentAction(unittest.TestCase):
         mock_content = b"%PDF-1.4\n%SharePoint document converted to PDF"
 
         self.mock_context.fetch.return_value = mock_metadata
-        mock_fetch_binary.return_value = mock_content
+        mock_fetch_binary.return_value = base64.b64encode(mock_content).decode('utf-8')
 
         handler = microsoft365.ReadSharePointDocumentAction()
         inputs = {"site_id": "test-site-id", "file_id": "doc123"}
@@ -1162,7 +1164,7 @@ class TestReadSharePointDocumentAction(unittest.TestCase):
         self.assertIn("/sites/test-site-id/drive/items/doc123/content", binary_call_args[0])
         self.assertIn("format=pdf", binary_call_args[0])
 
-    @patch('microsoft365.microsoft365.fetch_binary_content')
+    @patch('microsoft365.microsoft365.fetch_binary_content_base64')
     async def test_read_sharepoint_document_with_drive_id_success(self, mock_fetch_binary):
         """Test successful SharePoint document reading with specific drive ID."""
         # Mock metadata response
@@ -1176,7 +1178,7 @@ class TestReadSharePointDocumentAction(unittest.TestCase):
         # Mock PDF content
         mock_content = b"%PDF-1.4\n%HR Policy document"
         self.mock_context.fetch.return_value = mock_metadata
-        mock_fetch_binary.return_value = mock_content
+        mock_fetch_binary.return_value = base64.b64encode(mock_content).decode('utf-8')
 
         handler = microsoft365.ReadSharePointDocumentAction()
         inputs = {
@@ -1425,6 +1427,72 @@ class TestListMailFoldersAction(unittest.TestCase):
         call_args = self.mock_context.fetch.call_args
         self.assertIn("/me/mailFolders/AQMkADYAAAIBDAAAAA==/childFolders", call_args[0][0])
 
+    async def test_list_mail_folders_uses_expanded_children(self):
+        """Test children returned through $expand=childFolders need no extra request."""
+        mock_response = {
+            "value": [
+                {
+                    "id": "inbox",
+                    "displayName": "Inbox",
+                    "childFolderCount": 2,
+                    "childFolders": [
+                        {"id": "clients", "displayName": "Clients", "parentFolderId": "inbox", "childFolderCount": 0},
+                        {"id": "projects", "displayName": "Projects", "parentFolderId": "inbox", "childFolderCount": 0}
+                    ]
+                },
+                {"id": "sent", "displayName": "Sent Items", "childFolderCount": 0}
+            ]
+        }
+        self.mock_context.fetch.return_value = mock_response
+
+        handler = microsoft365.ListMailFoldersAction()
+        result = await handler.execute({"include_children": True}, self.mock_context)
+
+        self.assertTrue(result.data["result"])
+        self.mock_context.fetch.assert_called_once()
+        self.assertIn("childFolders", self.mock_context.fetch.call_args[1]["params"]["$expand"])
+
+        # Parents are followed by their subtrees
+        folder_names = [f["displayName"] for f in result.data["folders"]]
+        self.assertEqual(folder_names, ["Inbox", "Clients", "Projects", "Sent Items"])
+        self.assertFalse(result.data["truncated"])
+
+    async def test_list_mail_folders_respects_max_folders(self):
+        """Test the node budget stops the walk and reports truncation."""
+        mock_root_response = {
+            "value": [{"id": "inbox", "displayName": "Inbox", "childFolderCount": 3}]
+        }
+        mock_child_response = {
+            "value": [
+                {"id": f"child{i}", "displayName": f"Child {i}", "parentFolderId": "inbox", "childFolderCount": 0}
+                for i in range(3)
+            ]
+        }
+        self.mock_context.fetch.side_effect = [mock_root_response, mock_child_response]
+
+        handler = microsoft365.ListMailFoldersAction()
+        result = await handler.execute({"include_children": True, "max_folders": 2}, self.mock_context)
+
+        self.assertTrue(result.data["result"])
+        self.assertEqual(result.data["total_count"], 2)
+        self.assertTrue(result.data["truncated"])
+
+    async def test_list_mail_folders_ignores_max_folders_without_children(self):
+        """Test max_folders does not cap a flat (non-recursive) listing."""
+        self.mock_context.fetch.return_value = {
+            "value": [
+                {"id": f"folder{i}", "displayName": f"Folder {i}", "childFolderCount": 0}
+                for i in range(3)
+            ]
+        }
+
+        handler = microsoft365.ListMailFoldersAction()
+        result = await handler.execute({"max_folders": 2}, self.mock_context)
+
+        self.assertTrue(result.data["result"])
+        self.assertEqual(result.data["total_count"], 3)
+        self.assertFalse(result.data["truncated"])
+
 
 class TestGetMailFolderAction(unittest.TestCase):
     def setUp(self):
@@ -1571,6 +1639,265 @@ class TestMoveEmailAction(unittest.TestCase):
         self.assertIn("Folder not found", result.data["error"])
 
 
+class TestDeltaSyncActions(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures for delta sync tests."""
+        self.mock_context = Mock()
+        self.mock_context.fetch = AsyncMock()
+
+    async def test_sync_emails_delta_initial_sync_follows_pages(self):
+        """Test initial sync pages until the deltaLink is returned."""
+        self.mock_context.fetch.side_effect = [
+            {
+                "value": [{"id": "msg1", "subject": "First", "isRead": False}],
+                "@odata.nextLink": "https://graph.microsoft.com/v1.0/me/mailFolders/Inbox/messages/delta?$skiptoken=abc"
+            },
+            {
+                "value": [{"id": "msg2", "@removed": {"reason": "deleted"}}],
+                "@odata.deltaLink": "https://graph.microsoft.com/v1.0/me/mailFolders/Inbox/messages/delta?$deltatoken=xyz"
+            }
+        ]
+
+        handler = microsoft365.SyncEmailsDeltaAction()
+        result = await handler.execute({"folder": "Inbox"}, self.mock_context)
+
+        self.assertTrue(result.data["result"])
+        self.assertEqual([e["id"] for e in result.data["emails"]], ["msg1"])
+        self.assertEqual(result.data["removed"], [{"id": "msg2", "reason": "deleted"}])
+        self.assertIn("$deltatoken=xyz", result.data["delta_link"])
+        self.assertFalse(result.data["has_more"])
+
+        first_call = self.mock_context.fetch.call_args_list[0]
+        self.assertIn("/me/mailFolders/Inbox/messages/delta", first_call[0][0])
+        self.assertIn("$select", first_call[1]["params"])
+        second_call = self.mock_context.fetch.call_args_list[1]
+        self.assertNotIn("params", second_call[1])
+
+    async def test_sync_emails_delta_incremental_uses_delta_link(self):
+        """Test incremental sync calls the stored deltaLink directly."""
+        delta_link = "https://graph.microsoft.com/v1.0/me/mailFolders/Inbox/messages/delta?$deltatoken=xyz"
+        self.mock_context.fetch.return_value = {
+            "value": [],
+            "@odata.deltaLink": "https://graph.microsoft.com/v1.0/me/mailFolders/Inbox/messages/delta?$deltatoken=next"
+        }
+
+        handler = microsoft365.SyncEmailsDeltaAction()
+        result = await handler.execute({"delta_link": delta_link}, self.mock_context)
+
+        self.assertTrue(result.data["result"])
+        self.assertEqual(result.data["emails"], [])
+        self.assertEqual(self.mock_context.fetch.call_args[0][0], delta_link)
+        self.assertIn("$deltatoken=next", result.data["delta_link"])
+
+    async def test_sync_files_delta_stops_at_max_pages(self):
+        """Test has_more and the nextLink are returned when max_pages is reached."""
+        self.mock_context.fetch.return_value = {
+            "value": [
+                {"id": "file1", "name": "a.txt", "size": 10, "parentReference": {"path": "/drive/root:"}},
+                {"id": "file2", "deleted": {}}
+            ],
+            "@odata.nextLink": "https://graph.microsoft.com/v1.0/me/drive/root/delta?token=page2"
+        }
+
+        handler = microsoft365.SyncFilesDeltaAction()
+        result = await handler.execute({"max_pages": 1}, self.mock_context)
+
+        self.assertTrue(result.data["has_more"])
+        self.assertIn("token=page2", result.data["delta_link"])
+        self.assertEqual(result.data["files"][0]["path"], "/drive/root:")
+        self.assertEqual(result.data["removed"][0]["id"], "file2")
+        self.mock_context.fetch.assert_called_once()
+
+
+class TestBinaryDownloads(unittest.TestCase):
+    def setUp(self):
+        """Set up a fake pooled session streaming content in uneven chunks."""
+        self.mock_context = Mock()
+        self.mock_context.auth = {"credentials": {"access_token": "token"}}
+
+        self.chunks = [b"%PD", b"F-1.4\n", b"binary", b"\x00\xff\x10 data"]
+
+        async def iter_chunked(size):
+            for chunk in self.chunks:
+                yield chunk
+
+        self.mock_response = Mock()
+        self.mock_response.ok = True
+        self.mock_response.content_length = None
+        self.mock_response.content.iter_chunked = iter_chunked
+
+        response_cm = AsyncMock()
+        response_cm.__aenter__.return_value = self.mock_response
+        self.mock_session = Mock()
+        self.mock_session.get.return_value = response_cm
+
+    def test_binary_session_is_reused_within_a_loop(self):
+        """Test one pooled session serves every download on the same event loop."""
+        async def run():
+            session = microsoft365.get_binary_session()
+            try:
+                return session is microsoft365.get_binary_session()
+            finally:
+                await session.close()
+
+        self.assertTrue(asyncio.run(run()))
+
+    def test_binary_session_is_per_loop(self):
+        """Test a new event loop gets its own session and only closed loops' sessions are pruned."""
+        async def open_session():
+            return microsoft365.get_binary_session()
+
+        first = asyncio.run(open_session())
+
+        async def open_second():
+            second = microsoft365.get_binary_session()
+            await asyncio.sleep(0)
+            try:
+                return second, second.closed, len(microsoft365._binary_sessions)
+            finally:
+                await second.close()
+
+        second, second_closed, session_count = asyncio.run(open_second())
+
+        self.assertIsNot(first, second)
+        self.assertTrue(first.closed)
+        self.assertFalse(second_closed)
+        self.assertEqual(session_count, 1)
+
+    @patch('microsoft365.microsoft365.get_binary_session')
+    async def test_streaming_base64_matches_full_encoding(self, mock_get_session):
+        """Test incremental encoding produces the same output as encoding the whole body."""
+        mock_get_session.return_value = self.mock_session
+
+        content = await microsoft365.fetch_binary_content_base64("https://example.com/file", self.mock_context)
+
+        self.assertEqual(content, base64.b64encode(b"".join(self.chunks)).decode('utf-8'))
+        headers = self.mock_session.get.call_args[1]["headers"]
+        self.assertEqual(headers["Authorization"], "Bearer token")
+
+    @patch('microsoft365.microsoft365.get_binary_session')
+    async def test_streaming_download_enforces_max_size(self, mock_get_session):
+        """Test downloads larger than max_bytes are rejected."""
+        mock_get_session.return_value = self.mock_session
+
+        with self.assertRaises(Exception) as error:
+            await microsoft365.fetch_binary_content_base64(
+                "https://example.com/file", self.mock_context, max_bytes=10
+            )
+
+        self.assertIn("exceeds the maximum download size", str(error.exception))
+
+    @patch('microsoft365.microsoft365.get_binary_session')
+    async def test_streaming_download_checks_content_length_first(self, mock_get_session):
+        """Test a Content-Length above the limit is rejected before reading the body."""
+        self.mock_response.content_length = 1024
+        mock_get_session.return_value = self.mock_session
+
+        with self.assertRaises(Exception):
+            await microsoft365.fetch_binary_content_base64(
+                "https://example.com/file", self.mock_context, max_bytes=100
+            )
+
+
+class TestBatchEmailActions(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures for Graph batch tests."""
+        self.mock_context = Mock()
+        self.mock_context.fetch = AsyncMock()
+
+    def test_chunk_batch_requests_respects_limit_and_dependencies(self):
+        """Test that batches hold at most 20 requests and keep dependsOn chains together."""
+        requests = [{"id": str(i), "method": "GET", "url": f"/me/messages/{i}"} for i in range(19)]
+        requests.append({"id": "read", "method": "PATCH", "url": "/me/messages/x"})
+        requests.append({"id": "move", "method": "POST", "url": "/me/messages/x/move", "dependsOn": ["read"]})
+
+        chunks = microsoft365._chunk_batch_requests(requests)
+
+        self.assertEqual(len(chunks), 2)
+        self.assertTrue(all(len(chunk) <= 20 for chunk in chunks))
+        self.assertEqual([r["id"] for r in chunks[1]], ["read", "move"])
+
+    async def test_batch_mark_emails_read_success(self):
+        """Test marking emails read with a single $batch call."""
+        self.mock_context.fetch.return_value = {
+            "responses": [
+                {"id": "0", "status": 200, "body": {"id": "msg1", "isRead": True}},
+                {"id": "1", "status": 404, "body": {"error": {"code": "ErrorItemNotFound", "message": "Not found"}}}
+            ]
+        }
+
+        handler = microsoft365.BatchMarkEmailsReadAction()
+        result = await handler.execute({"email_ids": ["msg1", "msg2"], "is_read": True}, self.mock_context)
+
+        self.assertTrue(result.data["result"])
+        self.assertEqual(result.data["succeeded_count"], 1)
+        self.assertEqual(result.data["failed_count"], 1)
+        self.assertEqual(result.data["results"][1]["error"], "Not found")
+
+        call_args = self.mock_context.fetch.call_args
+        self.assertIn("/$batch", call_args[0][0])
+        self.assertEqual(len(call_args[1]["json"]["requests"]), 2)
+
+    @patch("asyncio.sleep", new_callable=AsyncMock)
+    async def test_batch_retries_throttled_items(self, mock_sleep):
+        """Test that 429 sub-responses are retried after Retry-After."""
+        self.mock_context.fetch.side_effect = [
+            {"responses": [
+                {"id": "0", "status": 200, "body": {"id": "msg1", "isRead": True}},
+                {"id": "1", "status": 429, "headers": {"Retry-After": "2"}, "body": {}}
+            ]},
+            {"responses": [
+                {"id": "1", "status": 200, "body": {"id": "msg2", "isRead": True}}
+            ]}
+        ]
+
+        handler = microsoft365.BatchMarkEmailsReadAction()
+        result = await handler.execute({"email_ids": ["msg1", "msg2"], "is_read": True}, self.mock_context)
+
+        self.assertEqual(result.data["succeeded_count"], 2)
+        mock_sleep.assert_awaited_once_with(2)
+        retry_payload = self.mock_context.fetch.call_args_list[1][1]["json"]["requests"]
+        self.assertEqual([r["id"] for r in retry_payload], ["1"])
+
+    async def test_batch_move_emails_with_mark_as_read(self):
+        """Test that moves depend on the read-status update of the same email."""
+        self.mock_context.fetch.return_value = {
+            "responses": [
+                {"id": "0-read", "status": 200, "body": {"id": "msg1", "isRead": True}},
+                {"id": "0-move", "status": 201, "body": {"id": "msg1-moved", "parentFolderId": "archive-id"}}
+            ]
+        }
+
+        handler = microsoft365.BatchMoveEmailsAction()
+        inputs = {"email_ids": ["msg1"], "destination_folder_id": "archive", "mark_as_read": True}
+        result = await handler.execute(inputs, self.mock_context)
+
+        self.assertTrue(result.data["results"][0]["result"])
+        self.assertEqual(result.data["results"][0]["id"], "msg1-moved")
+
+        requests = self.mock_context.fetch.call_args[1]["json"]["requests"]
+        self.assertEqual(requests[1]["dependsOn"], ["0-read"])
+
+    async def test_batch_download_email_attachments(self):
+        """Test attachment content is taken from contentBytes in the batch response."""
+        self.mock_context.fetch.return_value = {
+            "responses": [
+                {"id": "0", "status": 200, "body": {
+                    "id": "att1", "name": "report.pdf", "contentType": "application/pdf",
+                    "size": 3, "isInline": False, "contentBytes": "YWJj"
+                }}
+            ]
+        }
+
+        handler = microsoft365.BatchDownloadEmailAttachmentsAction()
+        inputs = {"attachments": [{"message_id": "msg1", "attachment_id": "att1"}]}
+        result = await handler.execute(inputs, self.mock_context)
+
+        self.assertTrue(result.data["files"][0]["result"])
+        self.assertEqual(result.data["files"][0]["file"]["content"], "YWJj")
+        self.assertEqual(result.data["files"][0]["metadata"]["message_id"], "msg1")
+
+
 class TestReadSharePointPageContentAction(unittest.TestCase):
     def setUp(self):
         """Set up test fixtures for SharePoint page content tests."""
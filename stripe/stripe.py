@@ -2,7 +2,13 @@ from autohive_integrations_sdk import (
     Integration, ExecutionContext, ActionHandler,
     ActionResult
 )
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, AsyncIterator, Tuple
+from collections import OrderedDict
+import asyncio
+import hashlib
+import json
+import random
+import time
 
 
 # Load integration from config.json
@@ -73,6 +79,338 @@ def build_list_params(inputs: Dict[str, Any]) -> Dict[str, Any]:
     return params
 
 
+# ---- Pagination ----
+
+# Stripe returns at most 100 objects per list request
+MAX_PAGE_SIZE = 100
+# Items returned by auto_paginate when no max_items is given
+DEFAULT_MAX_ITEMS = 1000
+# Upper bound for a single action call, including fetch_all
+MAX_ITEMS_LIMIT = 100000
+
+
+def build_expand_params(expand: Optional[List[str]], prefix: str = "data.") -> Dict[str, str]:
+    """
+    Build expand[] query parameters.
+    On list endpoints Stripe expects paths relative to the list, e.g. data.customer,
+    so the prefix is added when the caller leaves it off.
+    """
+    params = {}
+    for i, path in enumerate(expand or []):
+        if prefix and not path.startswith(prefix):
+            path = f"{prefix}{path}"
+        params[f"expand[{i}]"] = path
+    return params
+
+
+async def iter_list_pages(context: ExecutionContext, url: str, params: Dict[str, Any],
+                          max_items: int) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Yield pages of a Stripe list endpoint until max_items objects have been returned.
+
+    Follows starting_after (or ending_before, when paging backwards) from the
+    last object of each page. The next page is requested as soon as a page
+    arrives, so it downloads while the caller handles the current one.
+    """
+    backwards = 'ending_before' in params and 'starting_after' not in params
+    cursor_key = 'ending_before' if backwards else 'starting_after'
+    headers = get_common_headers()
+    remaining = max_items
+
+    def request(cursor: Optional[str], limit: int):
+        page_params = dict(params, limit=limit)
+        if cursor:
+            page_params[cursor_key] = cursor
+        return asyncio.ensure_future(context.fetch(url, method="GET", headers=headers, params=page_params))
+
+    pending = request(params.get(cursor_key), min(MAX_PAGE_SIZE, remaining))
+    try:
+        while pending is not None:
+            page = await pending
+            pending = None
+            data = page.get('data', [])[:remaining]
+            remaining -= len(data)
+
+            if data and page.get('has_more') and remaining > 0:
+                # Backwards pages are still newest-first, so the cursor is their first object
+                cursor = data[0]['id'] if backwards else data[-1]['id']
+                pending = request(cursor, min(MAX_PAGE_SIZE, remaining))
+
+            yield page
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+
+async def fetch_list(context: ExecutionContext, resource: str, params: Dict[str, Any],
+                     inputs: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Fetch a Stripe list endpoint using the shared pagination inputs.
+
+    Without auto_paginate or fetch_all this is a single request, as before.
+    With them, pages are followed until max_items objects (default 1000, or
+    everything up to 100000 for fetch_all) have been collected. The returned
+    next_starting_after resumes where this call stopped, so very large result
+    sets can also be read in chunks across several calls.
+
+    Returns the objects and the pagination fields for the action's output.
+    """
+    params = dict(params)
+    params.update(build_expand_params(inputs.get('expand')))
+    url = f"{STRIPE_API_BASE_URL}/{API_VERSION}/{resource}"
+
+    # A single page is just a budget of `limit` objects
+    limit = params.pop('limit', None) or 10
+    if inputs.get('fetch_all'):
+        max_items = min(inputs.get('max_items') or MAX_ITEMS_LIMIT, MAX_ITEMS_LIMIT)
+    elif inputs.get('auto_paginate'):
+        max_items = min(inputs.get('max_items') or DEFAULT_MAX_ITEMS, MAX_ITEMS_LIMIT)
+    else:
+        max_items = limit
+
+    items: List[Dict[str, Any]] = []
+    pages_fetched = 0
+    has_more = False
+    last_page: List[Dict[str, Any]] = []
+    async for page in iter_list_pages(context, url, params, max_items):
+        pages_fetched += 1
+        last_page = page.get('data', [])[:max_items - len(items)]
+        items.extend(last_page)
+        has_more = page.get('has_more', False)
+
+    backwards = 'ending_before' in params and 'starting_after' not in params
+    next_cursor = None
+    if has_more and last_page:
+        next_cursor = last_page[0]['id'] if backwards else last_page[-1]['id']
+
+    return items, {
+        "has_more": has_more,
+        "next_ending_before" if backwards else "next_starting_after": next_cursor,
+        "pages_fetched": pages_fetched
+    }
+
+
+# ---- Search ----
+
+# Stripe's search index lags writes by up to a minute, so a short cache hides nothing new
+SEARCH_CACHE_TTL = 60
+SEARCH_CACHE_MAX_ENTRIES = 256
+
+
+class SearchResultCache:
+    """
+    Short-lived cache of search results, keyed by account, resource and query.
+    Identical searches running at the same time share one request.
+    """
+
+    def __init__(self, ttl_seconds: int = SEARCH_CACHE_TTL, max_entries: int = SEARCH_CACHE_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._pending: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(context: ExecutionContext, resource: str, request: Dict[str, Any]) -> str:
+        # Hash the credentials so results are never shared between Stripe accounts
+        auth = json.dumps(getattr(context, 'auth', None) or {}, sort_keys=True, default=str)
+        payload = json.dumps({"auth": auth, "resource": resource, "request": request}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    async def get_or_fetch(self, key: str, fetch) -> Tuple[Any, bool]:
+        """Return (value, from_cache), calling fetch() on a miss"""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1], True
+
+        pending = self._pending.get(key)
+        if pending is not None and pending.get_loop() is asyncio.get_running_loop():
+            self.hits += 1
+            return await asyncio.shield(pending), True
+
+        self.misses += 1
+        future = asyncio.ensure_future(fetch())
+        self._pending[key] = future
+        try:
+            value = await asyncio.shield(future)
+        finally:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return value, False
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# Global search cache instance
+search_cache = SearchResultCache()
+
+
+async def fetch_search(context: ExecutionContext, resource: str,
+                       inputs: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Run a Stripe search query, following next_page cursors like fetch_list.
+
+    Uses the same limit / auto_paginate / fetch_all / max_items / expand inputs.
+    `page` resumes from the next_page cursor of an earlier call.
+    """
+    url = f"{STRIPE_API_BASE_URL}/{API_VERSION}/{resource}/search"
+    headers = get_common_headers()
+    params: Dict[str, Any] = {"query": inputs['query']}
+    params.update(build_expand_params(inputs.get('expand')))
+
+    limit = min(inputs.get('limit') or 10, MAX_PAGE_SIZE)
+    if inputs.get('fetch_all'):
+        max_items = min(inputs.get('max_items') or MAX_ITEMS_LIMIT, MAX_ITEMS_LIMIT)
+    elif inputs.get('auto_paginate'):
+        max_items = min(inputs.get('max_items') or DEFAULT_MAX_ITEMS, MAX_ITEMS_LIMIT)
+    else:
+        max_items = limit
+
+    def request(page_token: Optional[str], page_limit: int):
+        page_params = dict(params, limit=page_limit)
+        if page_token:
+            page_params['page'] = page_token
+        return asyncio.ensure_future(context.fetch(url, method="GET", headers=headers, params=page_params))
+
+    items: List[Dict[str, Any]] = []
+    pages_fetched = 0
+    response: Dict[str, Any] = {}
+    pending = request(inputs.get('page'), min(MAX_PAGE_SIZE, max_items))
+    try:
+        while pending is not None:
+            response = await pending
+            pending = None
+            pages_fetched += 1
+            items.extend(response.get('data', [])[:max_items - len(items)])
+            if response.get('has_more') and response.get('next_page') and len(items) < max_items:
+                # Fetch the next page while this one is being collected
+                pending = request(response['next_page'], min(MAX_PAGE_SIZE, max_items - len(items)))
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+    has_more = bool(response.get('has_more'))
+    return items, {
+        "has_more": has_more,
+        "next_page": response.get('next_page') if has_more else None,
+        "pages_fetched": pages_fetched
+    }
+
+
+async def run_search(context: ExecutionContext, resource: str, inputs: Dict[str, Any]) -> ActionResult:
+    """Shared implementation of the search_* actions"""
+    try:
+        if not inputs.get('query'):
+            raise ValueError("query is required")
+
+        request = {name: inputs.get(name) for name in
+                   ('query', 'limit', 'page', 'auto_paginate', 'fetch_all', 'max_items', 'expand')}
+        if inputs.get('use_cache', True):
+            key = search_cache.make_key(context, resource, request)
+            (items, pagination), from_cache = await search_cache.get_or_fetch(
+                key, lambda: fetch_search(context, resource, inputs)
+            )
+        else:
+            (items, pagination), from_cache = await fetch_search(context, resource, inputs), False
+
+        return ActionResult(
+            data={
+                resource: items,
+                **pagination,
+                "from_cache": from_cache,
+                "result": True
+            },
+            cost_usd=0.0
+        )
+
+    except Exception as e:
+        return ActionResult(
+            data={
+                resource: [],
+                "has_more": False,
+                "result": False,
+                "error": str(e)
+            },
+            cost_usd=0.0
+        )
+
+
+# ---- Idempotent Writes ----
+
+# Item writes in flight at once; Stripe allows 25 requests/second in test mode
+BULK_WRITE_CONCURRENCY = 8
+WRITE_MAX_RETRIES = 3
+WRITE_BASE_BACKOFF = 0.5
+
+
+def make_idempotency_key(*parts: Any) -> str:
+    """Deterministic Idempotency-Key: the same parts always give the same key"""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _stripe_should_retry(error: Exception) -> Optional[bool]:
+    """Stripe's own verdict from the Stripe-Should-Retry response header, if the error carries it"""
+    for source in (error, getattr(error, 'response', None)):
+        headers = getattr(source, 'headers', None) or {}
+        value = headers.get('Stripe-Should-Retry') if hasattr(headers, 'get') else None
+        if value is not None:
+            return str(value).lower() == 'true'
+    return None
+
+
+def _is_retryable_error(error: Exception) -> bool:
+    """
+    Whether repeating a write with the same Idempotency-Key can succeed.
+
+    Stripe stores the result of a request that started executing, including a 500,
+    and replays it for the same key, so server errors are only retried when Stripe
+    says so. 429s (which also cover lock_timeout when writes to the same invoice
+    overlap) are not stored, and a timeout leaves nothing to replay but success.
+    """
+    should_retry = _stripe_should_retry(error)
+    if should_retry is not None:
+        return should_retry
+    status = getattr(error, 'status', None) or getattr(error, 'status_code', None)
+    if isinstance(status, int):
+        return status == 429
+    return isinstance(error, asyncio.TimeoutError)
+
+
+async def post_idempotent(context: ExecutionContext, path: str, body: Dict[str, Any],
+                          idempotency_key: str) -> Dict[str, Any]:
+    """
+    POST to Stripe with an Idempotency-Key, retrying with jittered backoff when
+    _is_retryable_error allows it. Stripe replays the original response for a
+    repeated key, so a retry can never create a second object.
+    """
+    headers = dict(get_common_headers(), **{"Idempotency-Key": idempotency_key})
+    form_data = build_form_data(body) if body else {}
+
+    for attempt in range(WRITE_MAX_RETRIES + 1):
+        try:
+            return await context.fetch(
+                f"{STRIPE_API_BASE_URL}/{API_VERSION}/{path}",
+                method="POST",
+                headers=headers,
+                data=form_data
+            )
+        except Exception as e:
+            if attempt >= WRITE_MAX_RETRIES or not _is_retryable_error(e):
+                raise
+            delay = WRITE_BASE_BACKOFF * (2 ** attempt)
+            await asyncio.sleep(delay / 2 + random.uniform(0, delay / 2))
+
+
 # ---- Customer Action Handlers ----
 
 @stripe.action("list_customers")
@@ -91,21 +429,12 @@ class ListCustomersAction(ActionHandler):
             if 'created_lte' in inputs and inputs['created_lte']:
                 params['created[lte]'] = inputs['created_lte']
 
-            headers = get_common_headers()
-
-            response = await context.fetch(
-                f"{STRIPE_API_BASE_URL}/{API_VERSION}/customers",
-                method="GET",
-                headers=headers,
-                params=params
-            )
-
-            customers = response.get('data', [])
+            customers, pagination = await fetch_list(context, "customers", params, inputs)
 
             return ActionResult(
                 data={
                     "customers": customers,
-                    "has_more": response.get('has_more', False),
+                    **pagination,
                     "result": True
                 },
                 cost_usd=0.0
@@ -316,21 +645,12 @@ class ListInvoicesAction(ActionHandler):
             if 'created_lte' in inputs and inputs['created_lte']:
                 params['created[lte]'] = inputs['created_lte']
 
-            headers = get_common_headers()
-
-            response = await context.fetch(
-                f"{STRIPE_API_BASE_URL}/{API_VERSION}/invoices",
-                method="GET",
-                headers=headers,
-                params=params
-            )
-
-            invoices = response.get('data', [])
+            invoices, pagination = await fetch_list(context, "invoices", params, inputs)
 
             return ActionResult(
                 data={
                     "invoices": invoices,
-                    "has_more": response.get('has_more', False),
+                    **pagination,
                     "result": True
                 },
                 cost_usd=0.0
@@ -671,6 +991,126 @@ class VoidInvoiceAction(ActionHandler):
             )
 
 
+@stripe.action("create_invoice_with_items")
+class CreateInvoiceWithItemsAction(ActionHandler):
+    """Create a draft invoice, add all of its line items concurrently and finalize it in one call."""
+
+    @staticmethod
+    def _item_body(item: Dict[str, Any], customer: str, invoice_id: str, currency: Optional[str]) -> Dict[str, Any]:
+        body = {
+            "customer": customer,
+            "invoice": invoice_id
+        }
+        if item.get('amount') is not None:
+            body['amount'] = item['amount']
+        if item.get('currency') or currency:
+            body['currency'] = item.get('currency') or currency
+        if item.get('description'):
+            body['description'] = item['description']
+        if item.get('quantity') is not None:
+            body['quantity'] = item['quantity']
+        if item.get('unit_amount') is not None:
+            body['unit_amount_decimal'] = item['unit_amount']
+        if item.get('metadata'):
+            body['metadata'] = item['metadata']
+        return body
+
+    async def execute(self, inputs: Dict[str, Any], context: ExecutionContext):
+        invoice: Dict[str, Any] = {}
+        invoice_items: List[Dict[str, Any]] = []
+        failed_items: List[Dict[str, Any]] = []
+        # Caller-supplied so a retry after a timeout or failure reuses every write's key:
+        # a new key per call would let a retry create a second invoice and bill the items again
+        base_key = inputs.get('idempotency_key')
+        try:
+            if not base_key:
+                raise ValueError(
+                    "idempotency_key is required: pass a reference unique to this invoice, such as an order ID"
+                )
+            customer = inputs['customer']
+            items = inputs['items']
+            if not items:
+                raise ValueError("items must contain at least one invoice item")
+
+            invoice_body = {
+                "customer": customer,
+                # Only the items created here belong on this invoice
+                "pending_invoice_items_behavior": "exclude"
+            }
+            for field in ('currency', 'description', 'collection_method', 'days_until_due', 'metadata'):
+                if inputs.get(field):
+                    invoice_body[field] = inputs[field]
+            if 'auto_advance' in inputs:
+                invoice_body['auto_advance'] = inputs['auto_advance']
+
+            invoice = await post_idempotent(
+                context, "invoices", invoice_body, make_idempotency_key(base_key, "invoice")
+            )
+            invoice_id = invoice['id']
+
+            semaphore = asyncio.Semaphore(1 if inputs.get('preserve_order') else BULK_WRITE_CONCURRENCY)
+
+            async def create_item(index: int, item: Dict[str, Any]):
+                body = self._item_body(item, customer, invoice_id, inputs.get('currency'))
+                async with semaphore:
+                    return await post_idempotent(
+                        context, "invoiceitems", body, make_idempotency_key(base_key, "item", index, body)
+                    )
+
+            results = await asyncio.gather(
+                *(create_item(index, item) for index, item in enumerate(items)),
+                return_exceptions=True
+            )
+
+            for index, outcome in enumerate(results):
+                if isinstance(outcome, Exception):
+                    failed_items.append({"index": index, "error": str(outcome)})
+                else:
+                    invoice_items.append(outcome)
+
+            finalized = False
+            if not failed_items and inputs.get('finalize', True):
+                finalize_body = {}
+                if 'auto_advance' in inputs:
+                    finalize_body['auto_advance'] = inputs['auto_advance']
+                invoice = await post_idempotent(
+                    context, f"invoices/{invoice_id}/finalize", finalize_body,
+                    make_idempotency_key(base_key, "finalize")
+                )
+                finalized = True
+
+            data = {
+                "invoice": invoice,
+                "invoice_items": invoice_items,
+                "failed_items": failed_items,
+                "finalized": finalized,
+                "idempotency_key": base_key,
+                "result": not failed_items
+            }
+            if failed_items:
+                data["error"] = (
+                    f"{len(failed_items)} of {len(items)} items failed; the invoice was left as a draft. "
+                    "Call again with the same inputs and idempotency_key to retry; items already "
+                    "created are not duplicated. Items that failed with a server error Stripe recorded "
+                    "return the same error for that key."
+                )
+            return ActionResult(data=data, cost_usd=0.0)
+
+        except Exception as e:
+            return ActionResult(
+                data={
+                    "invoice": invoice,
+                    "invoice_items": invoice_items,
+                    "failed_items": failed_items,
+                    "finalized": False,
+                    "idempotency_key": base_key,
+                    "result": False,
+                    "error": str(e)
+                },
+                cost_usd=0.0
+            )
+
+
 # ---- Invoice Item Action Handlers ----
 
 @stripe.action("list_invoice_items")
@@ -689,21 +1129,12 @@ class ListInvoiceItemsAction(ActionHandler):
             if 'pending' in inputs:
                 params['pending'] = 'true' if inputs['pending'] else 'false'
 
-            headers = get_common_headers()
-
-            response = await context.fetch(
-                f"{STRIPE_API_BASE_URL}/{API_VERSION}/invoiceitems",
-                method="GET",
-                headers=headers,
-                params=params
-            )
-
-            invoice_items = response.get('data', [])
+            invoice_items, pagination = await fetch_list(context, "invoiceitems", params, inputs)
 
             return ActionResult(
                 data={
                     "invoice_items": invoice_items,
-                    "has_more": response.get('has_more', False),
+                    **pagination,
                     "result": True
                 },
                 cost_usd=0.0
@@ -916,21 +1347,12 @@ class ListProductsAction(ActionHandler):
             if 'created_lte' in inputs and inputs['created_lte']:
                 params['created[lte]'] = inputs['created_lte']
 
-            headers = get_common_headers()
-
-            response = await context.fetch(
-                f"{STRIPE_API_BASE_URL}/{API_VERSION}/products",
-                method="GET",
-                headers=headers,
-                params=params
-            )
-
-            products = response.get('data', [])
+            products, pagination = await fetch_list(context, "products", params, inputs)
 
             return ActionResult(
                 data={
                     "products": products,
-                    "has_more": response.get('has_more', False),
+                    **pagination,
                     "result": True
                 },
                 cost_usd=0.0
@@ -1121,21 +1543,12 @@ class ListPricesAction(ActionHandler):
             if 'created_lte' in inputs and inputs['created_lte']:
                 params['created[lte]'] = inputs['created_lte']
 
-            headers = get_common_headers()
-
-            response = await context.fetch(
-                f"{STRIPE_API_BASE_URL}/{API_VERSION}/prices",
-                method="GET",
-                headers=headers,
-                params=params
-            )
-
-            prices = response.get('data', [])
+            prices, pagination = await fetch_list(context, "prices", params, inputs)
 
             return ActionResult(
                 data={
                     "prices": prices,
-                    "has_more": response.get('has_more', False),
+                    **pagination,
                     "result": True
                 },
                 cost_usd=0.0
@@ -1325,21 +1738,12 @@ class ListSubscriptionsAction(ActionHandler):
             if 'current_period_start_lte' in inputs and inputs['current_period_start_lte']:
                 params['current_period_start[lte]'] = inputs['current_period_start_lte']
 
-            headers = get_common_headers()
-
-            response = await context.fetch(
-                f"{STRIPE_API_BASE_URL}/{API_VERSION}/subscriptions",
-                method="GET",
-                headers=headers,
-                params=params
-            )
-
-            subscriptions = response.get('data', [])
+            subscriptions, pagination = await fetch_list(context, "subscriptions", params, inputs)
 
             return ActionResult(
                 data={
                     "subscriptions": subscriptions,
-                    "has_more": response.get('has_more', False),
+                    **pagination,
                     "result": True
                 },
                 cost_usd=0.0
@@ -1596,21 +2000,12 @@ class ListPaymentMethodsAction(ActionHandler):
             # Type is required by Stripe API - default to 'card'
             params['type'] = inputs.get('type', 'card')
 
-            headers = get_common_headers()
-
-            response = await context.fetch(
-                f"{STRIPE_API_BASE_URL}/{API_VERSION}/payment_methods",
-                method="GET",
-                headers=headers,
-                params=params
-            )
-
-            payment_methods = response.get('data', [])
+            payment_methods, pagination = await fetch_list(context, "payment_methods", params, inputs)
 
             return ActionResult(
                 data={
                     "payment_methods": payment_methods,
-                    "has_more": response.get('has_more', False),
+                    **pagination,
                     "result": True
                 },
                 cost_usd=0.0
@@ -1734,3 +2129,45 @@ class DetachPaymentMethodAction(ActionHandler):
                 },
                 cost_usd=0.0
             )
+
+
+# ---- Search Action Handlers ----
+
+@stripe.action("search_customers")
+class SearchCustomersAction(ActionHandler):
+    """Search customers with Stripe's search query language, e.g. metadata['crm_id']:'123'."""
+
+    async def execute(self, inputs: Dict[str, Any], context: ExecutionContext):
+        return await run_search(context, "customers", inputs)
+
+
+@stripe.action("search_invoices")
+class SearchInvoicesAction(ActionHandler):
+    """Search invoices with Stripe's search query language, e.g. status:'open' AND total>10000."""
+
+    async def execute(self, inputs: Dict[str, Any], context: ExecutionContext):
+        return await run_search(context, "invoices", inputs)
+
+
+@stripe.action("search_subscriptions")
+class SearchSubscriptionsAction(ActionHandler):
+    """Search subscriptions with Stripe's search query language, e.g. status:'past_due'."""
+
+    async def execute(self, inputs: Dict[str, Any], context: ExecutionContext):
+        return await run_search(context, "subscriptions", inputs)
+
+
+@stripe.action("search_charges")
+class SearchChargesAction(ActionHandler):
+    """Search charges with Stripe's search query language, e.g. amount>5000 AND status:'failed'."""
+
+    async def execute(self, inputs: Dict[str, Any], context: ExecutionContext):
+        return await run_search(context, "charges", inputs)
+
+
+@stripe.action("search_prices")
+class SearchPricesAction(ActionHandler):
+    """Search prices with Stripe's search query language, e.g. active:'true' AND currency:'usd'."""
+
+    async def execute(self, inputs: Dict[str, Any], context: ExecutionContext):
+        return await run_search(context, "prices", inputs)
@@ -13,8 +13,9 @@ Usage:
 import asyncio
 import os
 import sys
+import uuid
 
-from context import stripe_integration
+from context import stripe_integration, stripe_module
 from autohive_integrations_sdk import ExecutionContext
 
 
@@ -48,6 +49,28 @@ async def test_list_customers():
             print(f"Error: {e}")
 
 
+async def test_search_customers():
+    """Test searching customers, then repeating the search from the cache."""
+    print("\n=== Test: Search Customers ===")
+    auth = {"credentials": {"api_key": API_KEY}}
+
+    async with ExecutionContext(auth=auth) as context:
+        try:
+            for attempt in range(2):
+                result = await stripe_integration.execute_action(
+                    "search_customers",
+                    {"query": "email:'test@example.com'", "limit": 5},
+                    context
+                )
+
+                data = result.result.data
+                print(f"Result: {data.get('result')}")
+                print(f"Customers found: {len(data.get('customers', []))}")
+                print(f"From cache: {data.get('from_cache')}")
+        except Exception as e:
+            print(f"Error: {e}")
+
+
 async def test_create_customer():
     """Test creating a customer."""
     print("\n=== Test: Create Customer ===")
@@ -189,6 +212,140 @@ async def test_create_invoice_item(customer_id: str, invoice_id: str):
             return None
 
 
+async def test_create_invoice_with_items(customer_id: str):
+    """Test building a draft invoice with several items in one call."""
+    print("\n=== Test: Create Invoice With Items ===")
+    auth = {"credentials": {"api_key": API_KEY}}
+
+    async with ExecutionContext(auth=auth) as context:
+        try:
+            result = await stripe_integration.execute_action(
+                "create_invoice_with_items",
+                {
+                    "customer": customer_id,
+                    "currency": "nzd",
+                    "description": "Bulk invoice created by integration test",
+                    "items": [
+                        {"amount": 1000 * (i + 1), "description": f"Test line {i + 1}"}
+                        for i in range(5)
+                    ],
+                    # Keep as a draft so it can be deleted afterwards
+                    "finalize": False,
+                    "idempotency_key": f"integration-test-{uuid.uuid4().hex}"
+                },
+                context
+            )
+
+            data = result.result.data
+            print(f"Result: {data.get('result')}")
+            invoice = data.get('invoice', {})
+            print(f"Invoice ID: {invoice.get('id')}")
+            print(f"Items created: {len(data.get('invoice_items', []))}")
+            print(f"Failed items: {data.get('failed_items')}")
+
+            return invoice.get('id')
+        except Exception as e:
+            print(f"Error: {e}")
+            return None
+
+
+class StripeRequestError(Exception):
+    """Error shaped like a failed Stripe response"""
+
+    def __init__(self, status: int, message: str, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+class FakeStripeContext:
+    """Offline stand-in for ExecutionContext that fails chosen Stripe endpoints"""
+
+    def __init__(self, fail_path: str, error: Exception):
+        self.auth = {"credentials": {"api_key": "sk_test_offline"}}
+        self.fail_path = fail_path
+        self.error = error
+        self.requests = []
+
+    async def fetch(self, url, method="GET", headers=None, data=None, **kwargs):
+        path = url.split(f"/{stripe_module.API_VERSION}/", 1)[1]
+        self.requests.append((path, headers.get("Idempotency-Key")))
+        if path == self.fail_path:
+            raise self.error
+        if path == "invoices":
+            return {"id": "in_offline", "status": "draft"}
+        if path.endswith("/finalize"):
+            return {"id": "in_offline", "status": "open"}
+        return {"id": f"ii_{len(self.requests)}", "amount": int(data["amount"])}
+
+
+async def test_create_invoice_with_items_invoice_create_fails():
+    """Test a failed invoice create returns the idempotency key so the call can be retried."""
+    print("\n=== Test: Create Invoice With Items (invoice create fails) ===")
+    stripe_module.WRITE_BASE_BACKOFF = 0
+    inputs = {
+        "customer": "cus_offline",
+        "items": [{"amount": 1000}, {"amount": 2000}],
+        "idempotency_key": "order-1001"
+    }
+
+    context = FakeStripeContext("invoices", StripeRequestError(429, "Too many requests"))
+    result = await stripe_integration.execute_action("create_invoice_with_items", inputs, context)
+    data = result.result.data
+
+    assert data["result"] is False
+    assert data["idempotency_key"] == "order-1001"
+    assert data["invoice_items"] == []
+    assert len(context.requests) == stripe_module.WRITE_MAX_RETRIES + 1
+    assert len({key for _, key in context.requests}) == 1, "Retries must reuse one Idempotency-Key"
+
+    # Retrying with the same key sends the same Idempotency-Key, so Stripe cannot create a second invoice
+    retry_context = FakeStripeContext("", None)
+    retry = await stripe_integration.execute_action("create_invoice_with_items", inputs, retry_context)
+    assert retry.result.data["result"] is True
+    assert retry_context.requests[0][1] == context.requests[0][1]
+    print("Invoice create failure returns the idempotency key: OK")
+
+
+async def test_create_invoice_with_items_finalize_fails():
+    """Test a failed finalize returns the items already created and the idempotency key."""
+    print("\n=== Test: Create Invoice With Items (finalize fails) ===")
+    inputs = {
+        "customer": "cus_offline",
+        "items": [{"amount": 1000}, {"amount": 2000}, {"amount": 3000}],
+        "idempotency_key": "order-1002"
+    }
+
+    context = FakeStripeContext("invoices/in_offline/finalize", StripeRequestError(400, "Invoice cannot be finalized"))
+    result = await stripe_integration.execute_action("create_invoice_with_items", inputs, context)
+    data = result.result.data
+
+    assert data["result"] is False
+    assert data["finalized"] is False
+    assert data["idempotency_key"] == "order-1002"
+    assert data["invoice"]["id"] == "in_offline"
+    assert sorted(item["amount"] for item in data["invoice_items"]) == [1000, 2000, 3000]
+    assert "cannot be finalized" in data["error"]
+    print("Finalize failure returns created items and the idempotency key: OK")
+
+
+async def test_create_invoice_with_items_requires_idempotency_key():
+    """Test the action refuses to write without a caller-supplied idempotency key."""
+    print("\n=== Test: Create Invoice With Items (no idempotency key) ===")
+    context = FakeStripeContext("", None)
+    # Called directly: the input schema would reject the missing field before the handler runs
+    result = await stripe_module.CreateInvoiceWithItemsAction().execute(
+        {"customer": "cus_offline", "items": [{"amount": 1000}]},
+        context
+    )
+    data = result.data
+
+    assert data["result"] is False
+    assert "idempotency_key is required" in data["error"]
+    assert context.requests == []
+    print("Missing idempotency key is rejected before any write: OK")
+
+
 async def test_list_invoices():
     """Test listing invoices."""
     print("\n=== Test: List Invoices ===")
@@ -209,6 +366,29 @@ async def test_list_invoices():
             print(f"Error: {e}")
 
 
+async def test_list_invoices_auto_paginate():
+    """Test listing invoices across several pages."""
+    print("\n=== Test: List Invoices (auto-paginate) ===")
+    auth = {"credentials": {"api_key": API_KEY}}
+
+    async with ExecutionContext(auth=auth) as context:
+        try:
+            result = await stripe_integration.execute_action(
+                "list_invoices",
+                {"auto_paginate": True, "max_items": 250, "expand": ["customer"]},
+                context
+            )
+
+            data = result.result.data
+            print(f"Result: {data.get('result')}")
+            print(f"Invoices found: {len(data.get('invoices', []))}")
+            print(f"Pages fetched: {data.get('pages_fetched')}")
+            print(f"Has more: {data.get('has_more')}")
+            print(f"Next starting after: {data.get('next_starting_after')}")
+        except Exception as e:
+            print(f"Error: {e}")
+
+
 async def test_get_invoice(invoice_id: str):
     """Test getting a specific invoice."""
     print("\n=== Test: Get Invoice ===")
@@ -679,6 +859,12 @@ async def run_all_tests():
         print("Set STRIPE_TEST_API_KEY environment variable with your test key.")
         print("=" * 60)
 
+    # Offline tests against a fake context
+    print("\n" + "-" * 40)
+    print("OFFLINE TESTS")
+    print("-" * 40)
+    await run_offline_tests()
+
     # Test customer CRUD
     print("\n" + "-" * 40)
     print("CUSTOMER TESTS")
@@ -704,6 +890,10 @@ async def run_all_tests():
             # Clean up - delete invoice
             await test_delete_invoice(invoice_id)
 
+        bulk_invoice_id = await test_create_invoice_with_items(customer_id)
+        if bulk_invoice_id:
+            await test_delete_invoice(bulk_invoice_id)
+
         # Test product CRUD
         print("\n" + "-" * 40)
         print("PRODUCT TESTS")
@@ -753,6 +943,13 @@ async def run_all_tests():
     print("=" * 60)
 
 
+async def run_offline_tests():
+    """Run tests that use a fake context instead of the Stripe API."""
+    await test_create_invoice_with_items_invoice_create_fails()
+    await test_create_invoice_with_items_finalize_fails()
+    await test_create_invoice_with_items_requires_idempotency_key()
+
+
 async def run_quick_tests():
     """Run quick read-only tests (no create/update/delete)."""
     print("=" * 60)
@@ -764,8 +961,11 @@ async def run_quick_tests():
         print("Set STRIPE_TEST_API_KEY environment variable with your test key.")
         print("=" * 60)
 
+    await run_offline_tests()
     await test_list_customers()
+    await test_search_customers()
     await test_list_invoices()
+    await test_list_invoices_auto_paginate()
     await test_list_products()
     await test_list_prices()
     await test_list_subscriptions()
@@ -145,6 +145,37 @@ async def test_fetch_events_extended_range():
             return None
 
 
+async def test_fetch_events_cached():
+    """Test that a repeated fetch is served from the calendar cache."""
+    print("\n[TEST] Fetching events twice to exercise the cache...")
+
+    inputs = {
+        "webcal_url": TEST_WEBCAL_URL,
+        "look_ahead_days": 30
+    }
+
+    async with ExecutionContext(auth=TEST_AUTH) as context:
+        try:
+            first = await webcal.execute_action("fetch_events", inputs, context)
+            second = await webcal.execute_action("fetch_events", inputs, context)
+
+            first_data = first.result.data
+            second_data = second.result.data
+
+            assert first_data.get("result") is True, "Should have result=True"
+            assert second_data.get("result") is True, "Should have result=True"
+            assert second_data.get("cache_status") == "hit", "Second fetch should be served from cache"
+            assert len(first_data["events"]) == len(second_data["events"]), "Cached fetch should return the same events"
+
+            print(f"✓ First fetch: {first_data.get('cache_status')}, second fetch: {second_data.get('cache_status')}")
+
+            return second
+
+        except Exception as e:
+            print(f"✗ Error: {e}")
+            return None
+
+
 async def test_search_events_basic():
     """Test searching events with a search term."""
     print("\n[TEST] Searching events for 'Day'...")
@@ -297,6 +328,39 @@ async def test_search_events_with_timezone():
             return None
 
 
+async def test_get_free_busy():
+    """Test computing busy and free periods."""
+    print("\n[TEST] Getting free/busy times for the next 30 days...")
+
+    inputs = {
+        "webcal_url": TEST_WEBCAL_URL,
+        "look_ahead_days": 30
+    }
+
+    async with ExecutionContext(auth=TEST_AUTH) as context:
+        try:
+            result = await webcal.execute_action("get_free_busy", inputs, context)
+
+            response_data = result.result.data
+
+            assert response_data.get("result") is True, "Should have result=True"
+            assert "busy" in response_data, "Should return busy array"
+            assert "free" in response_data, "Should return free array"
+            assert len(response_data["free"]) >= 1, "Should have at least one free period"
+
+            busy = response_data["busy"]
+            for earlier, later in zip(busy, busy[1:]):
+                assert earlier["end_time"] < later["start_time"], "Busy periods should be merged and ordered"
+
+            print(f"✓ Found {len(busy)} busy and {len(response_data['free'])} free period(s)")
+
+            return result
+
+        except Exception as e:
+            print(f"✗ Error: {e}")
+            return None
+
+
 async def main():
     print("=" * 70)
     print("Webcal Integration Test Suite")
@@ -309,12 +373,13 @@ async def main():
     try:
         # Test fetch_events action
         print("\n" + "=" * 70)
-        print("FETCH EVENTS (4 tests)")
+        print("FETCH EVENTS (5 tests)")
         print("=" * 70)
         await test_fetch_events_basic()
         await test_fetch_events_with_timezone()
         await test_fetch_events_webcal_protocol()
         await test_fetch_events_extended_range()
+        await test_fetch_events_cached()
 
         # Test search_events action
         print("\n" + "=" * 70)
@@ -326,12 +391,19 @@ async def main():
         await test_search_events_no_results()
         await test_search_events_with_timezone()
 
+        # Test get_free_busy action
+        print("\n" + "=" * 70)
+        print("FREE/BUSY (1 test)")
+        print("=" * 70)
+        await test_get_free_busy()
+
         print("\n" + "=" * 70)
         print("✓ Test suite completed!")
         print("=" * 70)
-        print("\n📊 Summary: 9 tests executed")
-        print("  - fetch_events: 4 tests")
+        print("\n📊 Summary: 11 tests executed")
+        print("  - fetch_events: 5 tests")
         print("  - search_events: 5 tests")
+        print("  - get_free_busy: 1 test")
         print("  - No authentication required")
         print("  - No costs (free public calendar feeds)")
         print("=" * 70)
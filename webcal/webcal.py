@@ -1,13 +1,288 @@
 from autohive_integrations_sdk import Integration, ExecutionContext, ActionHandler, ActionResult
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from bisect import bisect_left
+import asyncio
+import time
+import aiohttp
 import requests
+from dateutil.rrule import rruleset, rrulestr
 from icalendar import Calendar
+from icalendar.prop import vRecur
 import pytz
 import re
 
 webcal = Integration.load()
 
+# Parsed calendars are served from memory for this long before being revalidated
+DEFAULT_CACHE_TTL_SECONDS = 300
+CALENDAR_CACHE_MAX_ENTRIES = 32
+CALENDAR_FETCH_TIMEOUT_SECONDS = 60
+
+# Recurring events are expanded this far past the requested window so that later
+# calls with a slightly later "now" can reuse the same occurrence index
+RECURRENCE_EXPANSION_MARGIN = timedelta(days=30)
+# Safety cap on occurrences generated for a single recurring event
+MAX_OCCURRENCES_PER_EVENT = 5000
+
+
+def _to_utc(value) -> datetime:
+    """Make an icalendar date/datetime value UTC-aware (dates become midnight, naive is UTC)."""
+    if not isinstance(value, datetime):
+        return pytz.utc.localize(datetime.combine(value, datetime.min.time()))
+    if value.tzinfo is None:
+        return value.replace(tzinfo=pytz.utc)
+    return value.astimezone(pytz.utc)
+
+
+class RecurrenceExpander:
+    """Expands VEVENTs into concrete occurrences within a time range.
+
+    Handles RRULE and RDATE (added occurrences), EXDATE (removed occurrences) and
+    RECURRENCE-ID overrides, which replace the matching generated occurrence with
+    the override's own times and fields. Rules are evaluated in the event's local
+    wall-clock time so occurrences keep their local time across DST changes.
+    """
+
+    @staticmethod
+    def expand(calendar: Calendar, range_start: datetime, range_end: datetime) -> List[Tuple[datetime, datetime, Any]]:
+        """Return (start_utc, end_utc, component) for every occurrence overlapping the range."""
+        masters = []
+        overrides: Dict[str, Dict[datetime, Any]] = {}
+        for component in calendar.walk("VEVENT"):
+            if not component.get('dtstart'):
+                continue
+            if component.get('recurrence-id'):
+                uid = str(component.get('uid', ''))
+                recurrence_id = _to_utc(component.get('recurrence-id').dt)
+                overrides.setdefault(uid, {})[recurrence_id] = component
+            else:
+                masters.append(component)
+
+        occurrences = []
+        for component in masters:
+            event_start, event_end = WebCalendarAPI.normalize_event_times(component)
+            if not RecurrenceExpander.is_recurring(component):
+                if event_start < range_end and event_end >= range_start:
+                    occurrences.append((event_start, event_end, component))
+                continue
+
+            replaced = overrides.get(str(component.get('uid', '')), {})
+            duration = event_end - event_start
+            for occurrence_start in RecurrenceExpander._occurrence_starts(component, range_start - duration, range_end):
+                if occurrence_start in replaced:
+                    continue
+                occurrences.append((occurrence_start, occurrence_start + duration, component))
+
+        # Overrides stand on their own times, which may have moved into or out of the range
+        for by_recurrence_id in overrides.values():
+            for component in by_recurrence_id.values():
+                if str(component.get('status', '')).upper() == 'CANCELLED':
+                    continue
+                event_start, event_end = WebCalendarAPI.normalize_event_times(component)
+                if event_start < range_end and event_end >= range_start:
+                    occurrences.append((event_start, event_end, component))
+
+        return occurrences
+
+    @staticmethod
+    def is_recurring(component) -> bool:
+        return bool(component.get('rrule') or component.get('rdate'))
+
+    @staticmethod
+    def _occurrence_starts(component, range_start: datetime, range_end: datetime) -> List[datetime]:
+        """UTC start times of a recurring event's occurrences that start within the range."""
+        dtstart = component.get('dtstart').dt
+        if isinstance(dtstart, datetime) and dtstart.tzinfo is not None:
+            tz = dtstart.tzinfo
+        else:
+            # All-day and floating events are handled in UTC, as elsewhere in this module
+            tz = pytz.utc
+
+        def to_local(value):
+            """Naive wall-clock time in the event's timezone, the form the rules are evaluated in."""
+            if isinstance(value, tuple):
+                # RDATE periods are (start, end|duration); only the start matters here
+                value = value[0]
+            if not isinstance(value, datetime):
+                return datetime.combine(value, datetime.min.time())
+            if value.tzinfo is None:
+                return value
+            return value.astimezone(tz).replace(tzinfo=None)
+
+        def from_local(value: datetime) -> datetime:
+            if hasattr(tz, 'localize'):
+                return tz.localize(value).astimezone(pytz.utc)
+            return value.replace(tzinfo=tz).astimezone(pytz.utc)
+
+        local_start = to_local(dtstart)
+        rules = rruleset()
+        # DTSTART is always the first occurrence, even if the rule would not generate it
+        rules.rdate(local_start)
+
+        for rule in RecurrenceExpander._as_list(component.get('rrule')):
+            rule = vRecur(rule)
+            if 'UNTIL' in rule:
+                # UNTIL is usually given in UTC; rules are evaluated on naive local time
+                rule['UNTIL'] = [to_local(until) if isinstance(until, datetime) else until for until in rule['UNTIL']]
+            rules.rrule(rrulestr(rule.to_ical().decode(), dtstart=local_start))
+        for rdate in RecurrenceExpander._as_list(component.get('rdate')):
+            for value in rdate.dts:
+                rules.rdate(to_local(value.dt))
+        for exdate in RecurrenceExpander._as_list(component.get('exdate')):
+            for value in exdate.dts:
+                rules.exdate(to_local(value.dt))
+
+        local_range_start = range_start.astimezone(tz).replace(tzinfo=None)
+        starts = []
+        for local_occurrence in rules.xafter(local_range_start, count=MAX_OCCURRENCES_PER_EVENT, inc=True):
+            occurrence_start = from_local(local_occurrence)
+            if occurrence_start >= range_end:
+                break
+            if occurrence_start >= range_start:
+                starts.append(occurrence_start)
+        return starts
+
+    @staticmethod
+    def _as_list(value) -> List[Any]:
+        if value is None:
+            return []
+        return value if isinstance(value, list) else [value]
+
+
+class OccurrenceIndex:
+    """Occurrences sorted by start time for fast window and free/busy queries.
+
+    Alongside the sorted start times it keeps a running maximum of end times, so a
+    query only bisects to the first occurrence that could still be ongoing and the
+    last one starting before the window ends, instead of scanning every event.
+    """
+
+    def __init__(self, occurrences: List[Tuple[datetime, datetime, Any]]):
+        self.occurrences = sorted(occurrences, key=lambda occurrence: (occurrence[0], occurrence[1]))
+        self._starts = [occurrence[0] for occurrence in self.occurrences]
+        self._max_ends = []
+        max_end = None
+        for _, event_end, _ in self.occurrences:
+            max_end = event_end if max_end is None or event_end > max_end else max_end
+            self._max_ends.append(max_end)
+
+    def query(self, window_start: datetime, window_end: datetime) -> List[Tuple[datetime, datetime, Any]]:
+        """Occurrences starting before window_end that have not ended before window_start."""
+        first = bisect_left(self._max_ends, window_start)
+        last = bisect_left(self._starts, window_end)
+        return [
+            occurrence for occurrence in self.occurrences[first:last]
+            if occurrence[1] >= window_start
+        ]
+
+    def busy_intervals(self, window_start: datetime, window_end: datetime) -> List[Tuple[datetime, datetime]]:
+        """Merged busy periods within the window, skipping transparent and cancelled events."""
+        busy = []
+        for event_start, event_end, component in self.query(window_start, window_end):
+            if str(component.get('transp', '')).upper() == 'TRANSPARENT':
+                continue
+            if str(component.get('status', '')).upper() == 'CANCELLED':
+                continue
+            event_start = max(event_start, window_start)
+            event_end = min(event_end, window_end)
+            if event_end <= event_start:
+                continue
+            if busy and event_start <= busy[-1][1]:
+                busy[-1] = (busy[-1][0], max(busy[-1][1], event_end))
+            else:
+                busy.append((event_start, event_end))
+        return busy
+
+
+class CachedCalendar:
+    """A parsed calendar feed plus the validators needed to revalidate it."""
+
+    def __init__(self, calendar: Calendar, etag: Optional[str], last_modified: Optional[str]):
+        self.calendar = calendar
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = time.monotonic()
+        self.index: Optional[OccurrenceIndex] = None
+        self._expanded_range: Optional[Tuple[datetime, datetime]] = None
+
+    def occurrence_index(self, window_start: datetime, window_end: datetime) -> OccurrenceIndex:
+        """Index of occurrences covering the window, expanding recurrences again only when needed."""
+        if self._expanded_range is None:
+            range_start, range_end = window_start, window_end + RECURRENCE_EXPANSION_MARGIN
+        elif window_start < self._expanded_range[0] or window_end > self._expanded_range[1]:
+            range_start = min(window_start, self._expanded_range[0])
+            range_end = max(window_end + RECURRENCE_EXPANSION_MARGIN, self._expanded_range[1])
+        else:
+            return self.index
+
+        self.index = OccurrenceIndex(RecurrenceExpander.expand(self.calendar, range_start, range_end))
+        self._expanded_range = (range_start, range_end)
+        return self.index
+
+    def occurrences(self, window_start: datetime, window_end: datetime) -> List[Tuple[datetime, datetime, Any]]:
+        """(start, end, component) for every occurrence overlapping the window, ordered by start."""
+        return self.occurrence_index(window_start, window_end).query(window_start, window_end)
+
+
+class CalendarCache:
+    """In-memory cache of parsed calendar feeds, keyed by URL.
+
+    Within the TTL a feed is served from memory without any request. After that it
+    is revalidated with If-None-Match / If-Modified-Since; a 304 keeps the parsed
+    copy, so the ICS is only downloaded and parsed again when it changed.
+    Concurrent lookups of the same URL share a single fetch.
+    """
+
+    def __init__(self, max_entries: int = CALENDAR_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CachedCalendar]" = OrderedDict()
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0}
+
+    async def get(self, url: str, ttl_seconds: float = DEFAULT_CACHE_TTL_SECONDS) -> Tuple[CachedCalendar, str]:
+        """Return the cached calendar for url and how it was served (hit, revalidated or miss)."""
+        lock = self._locks.setdefault(url, asyncio.Lock())
+        async with lock:
+            entry = self._entries.get(url)
+            if entry and time.monotonic() - entry.fetched_at < ttl_seconds:
+                self._entries.move_to_end(url)
+                self.stats["hits"] += 1
+                return entry, "hit"
+
+            headers = {}
+            if entry and entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry and entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+            timeout = aiohttp.ClientTimeout(total=CALENDAR_FETCH_TIMEOUT_SECONDS)
+            async with aiohttp.ClientSession(timeout=timeout) as session:
+                async with session.get(url, headers=headers) as response:
+                    if response.status == 304 and entry:
+                        entry.fetched_at = time.monotonic()
+                        self._entries.move_to_end(url)
+                        self.stats["revalidated"] += 1
+                        return entry, "revalidated"
+                    if response.status != 200:
+                        raise Exception(f"Failed to fetch calendar: HTTP {response.status}")
+                    body = await response.read()
+                    etag = response.headers.get("ETag")
+                    last_modified = response.headers.get("Last-Modified")
+
+            entry = CachedCalendar(Calendar.from_ical(body), etag, last_modified)
+            self._entries[url] = entry
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.max_entries:
+                evicted_url, _ = self._entries.popitem(last=False)
+                self._locks.pop(evicted_url, None)
+            self.stats["misses"] += 1
+            return entry, "miss"
+
+
+calendar_cache = CalendarCache()
+
 
 class WebCalendarAPI:
     """Helper class for WebCalendar API operations"""
@@ -15,57 +290,80 @@ class WebCalendarAPI:
     @staticmethod
     async def fetch_calendar(context: ExecutionContext, webcal_url: str) -> Calendar:
         """Fetch and parse a webcal URL into a Calendar object"""
-        url = webcal_url.replace("webcal://", "https://")
-
-        # Fetch the calendar data
-        response = await context.fetch(url)
-
-        # Parse the iCal data
-        return Calendar.from_ical(response)
+        cached, _ = await WebCalendarAPI.fetch_cached_calendar(context, webcal_url)
+        return cached.calendar
 
     @staticmethod
-    def convert_to_timezone(dt, timezone_str: str):
-        """Convert a datetime object to the specified timezone."""
-        # Make sure the datetime is timezone-aware
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=pytz.utc)
-
-        # Convert to the target timezone
-        target_tz = pytz.timezone(timezone_str)
-        return dt.astimezone(target_tz)
+    async def fetch_cached_calendar(
+        context: ExecutionContext, webcal_url: str, ttl_seconds: float = DEFAULT_CACHE_TTL_SECONDS
+    ) -> Tuple[CachedCalendar, str]:
+        """Get a parsed calendar from the cache, fetching or revalidating it as needed"""
+        url = webcal_url.replace("webcal://", "https://")
+        return await calendar_cache.get(url, ttl_seconds)
 
     @staticmethod
-    def extract_event_data(component, timezone_str: str) -> Dict[str, Any]:
-        """Extract relevant data from a calendar event component"""
-        # Extract start time
+    def normalize_event_times(component) -> Tuple[datetime, datetime]:
+        """Return an event's start and end as timezone-aware datetimes.
+
+        All-day dates become midnight UTC; naive datetimes are assumed to be UTC;
+        an end given as DURATION is added to the start; a missing end is taken to
+        be the start.
+        """
         event_start = component.get('dtstart').dt
 
-        # Determine if this is an all-day event
-        all_day = False
+        # Handle all-day events
         if not isinstance(event_start, datetime):
             # It's a date without time (all-day event)
-            all_day = True
-            # Convert to datetime at midnight
             event_start = datetime.combine(event_start, datetime.min.time())
             event_start = pytz.utc.localize(event_start)
         elif event_start.tzinfo is None:
             # Make naive datetime timezone-aware (assume UTC)
             event_start = event_start.replace(tzinfo=pytz.utc)
 
-        # Extract end time
+        # Get end time
         if component.get('dtend'):
             event_end = component.get('dtend').dt
             if not isinstance(event_end, datetime):
-                # Convert to datetime at midnight
+                # Convert to datetime
                 event_end = datetime.combine(event_end, datetime.min.time())
                 event_end = pytz.utc.localize(event_end)
             elif event_end.tzinfo is None:
                 # Make naive datetime timezone-aware (assume UTC)
                 event_end = event_end.replace(tzinfo=pytz.utc)
+        elif component.get('duration'):
+            event_end = event_start + component.get('duration').dt
         else:
             # If no end time, assume it's the same as start time
             event_end = event_start
 
+        return event_start, event_end
+
+    @staticmethod
+    def convert_to_timezone(dt, timezone_str: str):
+        """Convert a datetime object to the specified timezone."""
+        # Make sure the datetime is timezone-aware
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=pytz.utc)
+
+        # Convert to the target timezone
+        target_tz = pytz.timezone(timezone_str)
+        return dt.astimezone(target_tz)
+
+    @staticmethod
+    def extract_event_data(
+        component, timezone_str: str, event_start: Optional[datetime] = None, event_end: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """Extract relevant data from a calendar event component.
+
+        For an occurrence of a recurring event, pass its start and end; otherwise
+        the component's own DTSTART/DTEND are used.
+        """
+        # Determine if this is an all-day event
+        all_day = not isinstance(component.get('dtstart').dt, datetime)
+
+        if event_start is None or event_end is None:
+            event_start, event_end = WebCalendarAPI.normalize_event_times(component)
+
         # Convert times to the requested timezone
         event_start_local = WebCalendarAPI.convert_to_timezone(event_start, timezone_str)
         event_end_local = WebCalendarAPI.convert_to_timezone(event_end, timezone_str)
@@ -90,8 +388,8 @@ class WebCalendarAPI:
         if component.get('url'):
             url = str(component.get('url'))
 
-        # Check if the event is recurring
-        recurring = bool(component.get('rrule'))
+        # Check if the event is recurring (or an edited occurrence of one)
+        recurring = RecurrenceExpander.is_recurring(component) or bool(component.get('recurrence-id'))
 
         # Format the times as strings
         start_time_str = event_start_local.strftime('%Y-%m-%d %H:%M:%S')
@@ -122,8 +420,10 @@ class FetchEvents(ActionHandler):
         timezone_str = inputs.get('timezone', 'UTC')
         look_ahead_days = inputs.get('look_ahead_days', 7)
 
-        # Fetch the calendar
-        cal = await WebCalendarAPI.fetch_calendar(context, webcal_url)
+        # Get the parsed calendar (served from cache within the TTL)
+        cached, cache_status = await WebCalendarAPI.fetch_cached_calendar(
+            context, webcal_url, inputs.get('cache_ttl_seconds', DEFAULT_CACHE_TTL_SECONDS)
+        )
 
         # Define the local timezone
         local_timezone = pytz.timezone(timezone_str)
@@ -132,54 +432,19 @@ class FetchEvents(ActionHandler):
         utc_now = datetime.now(pytz.utc)
         utc_look_ahead = utc_now + timedelta(days=look_ahead_days)
 
-        # Convert the current date and look ahead date to the local timezone
-        now = WebCalendarAPI.convert_to_timezone(utc_now, timezone_str)
-        look_ahead_date = WebCalendarAPI.convert_to_timezone(utc_look_ahead, timezone_str)
-
         # Extract events happening in the specified range or ongoing
         events = []
-        for component in cal.walk():
-            if component.name == "VEVENT":
-                event_start = component.get('dtstart').dt
-
-                # Handle all-day events
-                if not isinstance(event_start, datetime):
-                    # It's a date without time (all-day event)
-                    event_start = datetime.combine(event_start, datetime.min.time())
-                    event_start = pytz.utc.localize(event_start)
-                elif event_start.tzinfo is None:
-                    # Make naive datetime timezone-aware (assume UTC)
-                    event_start = event_start.replace(tzinfo=pytz.utc)
-
-                # Get end time
-                if component.get('dtend'):
-                    event_end = component.get('dtend').dt
-                    if not isinstance(event_end, datetime):
-                        # Convert to datetime
-                        event_end = datetime.combine(event_end, datetime.min.time())
-                        event_end = pytz.utc.localize(event_end)
-                    elif event_end.tzinfo is None:
-                        # Make naive datetime timezone-aware (assume UTC)
-                        event_end = event_end.replace(tzinfo=pytz.utc)
-                else:
-                    # If no end time, assume it's the same as start time
-                    event_end = event_start
-
-                # Convert event times to the local timezone
-                event_start_local = WebCalendarAPI.convert_to_timezone(event_start, timezone_str)
-                event_end_local = WebCalendarAPI.convert_to_timezone(event_end, timezone_str)
-
-                # Check if the event is within the desired time range or ongoing
-                if (now <= event_start_local < look_ahead_date) or (event_start_local < now <= event_end_local):
-                    # Extract the event data
-                    event_data = WebCalendarAPI.extract_event_data(component, timezone_str)
-                    events.append(event_data)
+        for event_start, event_end, component in cached.occurrences(utc_now, utc_look_ahead):
+            # Extract the event data for this occurrence
+            event_data = WebCalendarAPI.extract_event_data(component, timezone_str, event_start, event_end)
+            events.append(event_data)
 
         # Return the events
         return ActionResult(
             data={
                 'timezone': timezone_str,
                 'events': events,
+                'cache_status': cache_status,
                 'result': True
             },
             cost_usd=0.0
@@ -199,8 +464,10 @@ class SearchEvents(ActionHandler):
         look_ahead_days = inputs.get('look_ahead_days', 30)
         case_sensitive = inputs.get('case_sensitive', False)
 
-        # Fetch the calendar
-        cal = await WebCalendarAPI.fetch_calendar(context, webcal_url)
+        # Get the parsed calendar (served from cache within the TTL)
+        cached, cache_status = await WebCalendarAPI.fetch_cached_calendar(
+            context, webcal_url, inputs.get('cache_ttl_seconds', DEFAULT_CACHE_TTL_SECONDS)
+        )
 
         # Define the local timezone
         local_timezone = pytz.timezone(timezone_str)
@@ -209,10 +476,6 @@ class SearchEvents(ActionHandler):
         utc_now = datetime.now(pytz.utc)
         utc_look_ahead = utc_now + timedelta(days=look_ahead_days)
 
-        # Convert the current date and look ahead date to the local timezone
-        now = WebCalendarAPI.convert_to_timezone(utc_now, timezone_str)
-        look_ahead_date = WebCalendarAPI.convert_to_timezone(utc_look_ahead, timezone_str)
-
         # Prepare search term for case-insensitive search if needed
         if not case_sensitive:
             search_pattern = re.compile(re.escape(search_term), re.IGNORECASE)
@@ -221,60 +484,28 @@ class SearchEvents(ActionHandler):
 
         # Search for events matching the criteria
         events = []
-        for component in cal.walk():
-            if component.name == "VEVENT":
-                event_start = component.get('dtstart').dt
-
-                # Handle all-day events
-                if not isinstance(event_start, datetime):
-                    # It's a date without time (all-day event)
-                    event_start = datetime.combine(event_start, datetime.min.time())
-                    event_start = pytz.utc.localize(event_start)
-                elif event_start.tzinfo is None:
-                    # Make naive datetime timezone-aware (assume UTC)
-                    event_start = event_start.replace(tzinfo=pytz.utc)
-
-                # Get end time
-                if component.get('dtend'):
-                    event_end = component.get('dtend').dt
-                    if not isinstance(event_end, datetime):
-                        # Convert to datetime
-                        event_end = datetime.combine(event_end, datetime.min.time())
-                        event_end = pytz.utc.localize(event_end)
-                    elif event_end.tzinfo is None:
-                        # Make naive datetime timezone-aware (assume UTC)
-                        event_end = event_end.replace(tzinfo=pytz.utc)
-                else:
-                    # If no end time, assume it's the same as start time
-                    event_end = event_start
-
-                # Convert event times to the local timezone
-                event_start_local = WebCalendarAPI.convert_to_timezone(event_start, timezone_str)
-                event_end_local = WebCalendarAPI.convert_to_timezone(event_end, timezone_str)
-
-                # Check if the event is within the desired time range or ongoing
-                if (now <= event_start_local < look_ahead_date) or (event_start_local < now <= event_end_local):
-                    # Extract fields to search in
-                    summary = str(component.get('summary', ''))
-                    description = str(component.get('description', '')) if component.get('description') else ''
-                    location = str(component.get('location', '')) if component.get('location') else ''
-
-                    # Search for the term in each field
-                    match_field = None
-                    if search_pattern.search(summary):
-                        match_field = 'summary'
-                    elif search_pattern.search(description):
-                        match_field = 'description'
-                    elif search_pattern.search(location):
-                        match_field = 'location'
-
-                    # If there's a match, add to results
-                    if match_field:
-                        # Get the event data
-                        event_data = WebCalendarAPI.extract_event_data(component, timezone_str)
-                        # Add the field where match was found
-                        event_data['match_field'] = match_field
-                        events.append(event_data)
+        for event_start, event_end, component in cached.occurrences(utc_now, utc_look_ahead):
+            # Extract fields to search in
+            summary = str(component.get('summary', ''))
+            description = str(component.get('description', '')) if component.get('description') else ''
+            location = str(component.get('location', '')) if component.get('location') else ''
+
+            # Search for the term in each field
+            match_field = None
+            if search_pattern.search(summary):
+                match_field = 'summary'
+            elif search_pattern.search(description):
+                match_field = 'description'
+            elif search_pattern.search(location):
+                match_field = 'location'
+
+            # If there's a match, add to results
+            if match_field:
+                # Get the event data for this occurrence
+                event_data = WebCalendarAPI.extract_event_data(component, timezone_str, event_start, event_end)
+                # Add the field where match was found
+                event_data['match_field'] = match_field
+                events.append(event_data)
 
         # Return the search results
         return ActionResult(
@@ -282,6 +513,55 @@ class SearchEvents(ActionHandler):
                 'timezone': timezone_str,
                 'search_term': search_term,
                 'events': events,
+                'cache_status': cache_status,
+                'result': True
+            },
+            cost_usd=0.0
+        )
+
+
+@webcal.action("get_free_busy")
+class GetFreeBusy(ActionHandler):
+    """
+    Action that returns the busy and free periods of a webcal feed within a time range.
+    """
+
+    async def execute(self, inputs: Dict[str, Any], context: ExecutionContext):
+        webcal_url = inputs['webcal_url']
+        timezone_str = inputs.get('timezone', 'UTC')
+        look_ahead_days = inputs.get('look_ahead_days', 7)
+
+        # Get the parsed calendar (served from cache within the TTL)
+        cached, cache_status = await WebCalendarAPI.fetch_cached_calendar(
+            context, webcal_url, inputs.get('cache_ttl_seconds', DEFAULT_CACHE_TTL_SECONDS)
+        )
+
+        utc_now = datetime.now(pytz.utc)
+        utc_look_ahead = utc_now + timedelta(days=look_ahead_days)
+
+        # Busy periods are merged overlapping occurrences; free periods are the gaps between them
+        busy_intervals = cached.occurrence_index(utc_now, utc_look_ahead).busy_intervals(utc_now, utc_look_ahead)
+        free_intervals = []
+        cursor = utc_now
+        for busy_start, busy_end in busy_intervals:
+            if busy_start > cursor:
+                free_intervals.append((cursor, busy_start))
+            cursor = busy_end
+        if cursor < utc_look_ahead:
+            free_intervals.append((cursor, utc_look_ahead))
+
+        def format_interval(interval_start, interval_end):
+            return {
+                'start_time': WebCalendarAPI.convert_to_timezone(interval_start, timezone_str).strftime('%Y-%m-%d %H:%M:%S'),
+                'end_time': WebCalendarAPI.convert_to_timezone(interval_end, timezone_str).strftime('%Y-%m-%d %H:%M:%S')
+            }
+
+        return ActionResult(
+            data={
+                'timezone': timezone_str,
+                'busy': [format_interval(start, end) for start, end in busy_intervals],
+                'free': [format_interval(start, end) for start, end in free_intervals],
+                'cache_status': cache_status,
                 'result': True
             },
             cost_usd=0.0
@@ -1 +1,4 @@
-from xero.xero import xero, XeroRateLimiter, XeroRateLimitExceededException, rate_limiter
+from xero.xero import (
+    xero, XeroRateLimiter, XeroRateLimitExceededException, rate_limiter,
+    XeroReportCache, MemoryReportCacheBackend, DiskReportCacheBackend
+)
@@ -1,11 +1,14 @@
 # Test for Xero Accounting integration
 import asyncio
+import importlib
 import pytest
 import base64
+import json
+from datetime import datetime
 from unittest.mock import Mock, AsyncMock, patch
 from context import xero
 from autohive_integrations_sdk import ExecutionContext
-from xero import XeroRateLimiter, XeroRateLimitExceededException
+from xero import XeroRateLimiter, XeroRateLimitExceededException, XeroReportCache, MemoryReportCacheBackend, DiskReportCacheBackend
 
 async def test_get_available_connections():
     """
@@ -209,6 +212,7 @@ class MockRateLimitError(Exception):
     """Mock exception that simulates a 429 rate limit error"""
     def __init__(self, message="429 Rate limit exceeded", headers=None):
         super().__init__(message)
+        self.status = 429
         self.headers = headers or {}
 
 
@@ -437,6 +441,7 @@ class MockRateLimitError(Exception):
     """Mock exception that simulates a 429 rate limit error"""
     def __init__(self, message="429 Rate limit exceeded", headers=None):
         super().__init__(message)
+        self.status = 429
         self.headers = headers or {}
 
 
@@ -557,6 +562,29 @@ async def test_rate_limiter_non_rate_limit_error():
     context.fetch.assert_called_once()
 
 
+@pytest.mark.asyncio
+async def test_rate_limiter_detects_rate_limits_by_status_only():
+    """Test that "429" in an error message is not a rate limit without a 429 status"""
+    limiter = XeroRateLimiter(default_retry_delay=0)
+    context = Mock()
+
+    context.fetch = AsyncMock(side_effect=Exception("Invoice INV-429 has a total of 1429.00"))
+    with pytest.raises(Exception, match="INV-429"):
+        await limiter.make_request(context, "https://api.xero.com/test", "tenant-123", method="GET")
+    context.fetch.assert_called_once()
+
+    class ErrorWithResponse(Exception):
+        def __init__(self):
+            super().__init__("Too Many Requests")
+            self.response = Mock(status=429, headers={"Retry-After": "0"})
+
+    context.fetch = AsyncMock(side_effect=[ErrorWithResponse(), {"success": True}])
+    result = await limiter.make_request(context, "https://api.xero.com/test", "tenant-123", method="GET")
+    assert result == {"success": True}
+    assert context.fetch.call_count == 2
+    assert limiter.get_metrics("tenant-123")["tenant-123"]["throttled"] == 1
+
+
 @pytest.mark.asyncio
 async def test_rate_limiter_default_delay_no_header():
     """Test that default delay is used when Retry-After header is missing"""
@@ -1427,5 +1455,569 @@ async def test_delete_purchase_order_success():
             assert payload["PurchaseOrders"][0]["Status"] == "DELETED"
 
 
+# ---- Per-Tenant Pacing Tests ----
+
+@pytest.mark.asyncio
+async def test_rate_limiter_paces_when_minute_budget_spent():
+    """Test that requests beyond the per-minute budget wait before being sent"""
+    limiter = XeroRateLimiter(calls_per_minute=2, max_wait_time=60)
+    context = Mock()
+    context.fetch = AsyncMock(return_value={"success": True})
+
+    with patch('asyncio.sleep') as mock_sleep:
+        for _ in range(3):
+            await limiter.make_request(context, "https://api.xero.com/test", "tenant-123", method="GET")
+
+    # Two calls fit in the bucket; the third waits about 30s for a token (2 per minute)
+    assert context.fetch.call_count == 3
+    mock_sleep.assert_called_once()
+    assert 29 < mock_sleep.call_args[0][0] <= 30
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_tenants_are_independent():
+    """Test that one tenant spending its budget does not slow down another"""
+    limiter = XeroRateLimiter(calls_per_minute=1, max_wait_time=60)
+    context = Mock()
+    context.fetch = AsyncMock(return_value={"success": True})
+
+    with patch('asyncio.sleep') as mock_sleep:
+        await limiter.make_request(context, "https://api.xero.com/test", "tenant-a", method="GET")
+        await limiter.make_request(context, "https://api.xero.com/test", "tenant-b", method="GET")
+
+    mock_sleep.assert_not_called()
+    metrics = limiter.get_metrics()
+    assert metrics["tenant-a"]["requests"] == 1
+    assert metrics["tenant-b"]["requests"] == 1
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_caps_concurrent_requests_per_tenant():
+    """Test that no more than max_concurrent requests run at once for a tenant"""
+    limiter = XeroRateLimiter(max_concurrent=2)
+    active = 0
+    peak = 0
+
+    async def slow_fetch(url, **kwargs):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return {"success": True}
+
+    context = Mock()
+    context.fetch = slow_fetch
+
+    await asyncio.gather(*[
+        limiter.make_request(context, "https://api.xero.com/test", "tenant-123", method="GET")
+        for _ in range(6)
+    ])
+
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_reads_remaining_limit_headers():
+    """Test that X-MinLimit-Remaining and X-DayLimit-Remaining update the tenant budget"""
+    limiter = XeroRateLimiter(max_wait_time=120, default_retry_delay=10)
+    context = Mock()
+    rate_limit_error = MockRateLimitError(
+        "429 Too Many Requests",
+        headers={"Retry-After": "5", "X-MinLimit-Remaining": "0", "X-DayLimit-Remaining": "4200"}
+    )
+    context.fetch = AsyncMock(side_effect=[rate_limit_error, {"success": True}])
+
+    with patch('asyncio.sleep'):
+        await limiter.make_request(context, "https://api.xero.com/test", "tenant-123", method="GET")
+
+    metrics = limiter.get_metrics("tenant-123")["tenant-123"]
+    assert metrics["minute_remaining"] == 0
+    assert metrics["day_remaining"] == 4200
+    assert metrics["throttled"] == 1
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_429_holds_back_other_requests():
+    """Test that a 429 pauses later requests for the same tenant until Retry-After passes"""
+    limiter = XeroRateLimiter(max_retries=0, max_wait_time=60)
+    context = Mock()
+    rate_limit_error = MockRateLimitError("429 Too Many Requests", headers={"Retry-After": "120"})
+    context.fetch = AsyncMock(side_effect=[rate_limit_error, {"success": True}])
+
+    with pytest.raises(MockRateLimitError):
+        await limiter.make_request(context, "https://api.xero.com/test", "tenant-123", method="GET")
+
+    # The next request would have to wait ~120s, which exceeds max_wait_time
+    with pytest.raises(XeroRateLimitExceededException):
+        await limiter.make_request(context, "https://api.xero.com/test", "tenant-123", method="GET")
+    assert context.fetch.call_count == 1
+
+
+# ---- Bulk Export Tests ----
+
+def make_invoice_pages(total, page_size):
+    """Build a make_request side effect serving `total` invoices in pages"""
+    async def fake_make_request(context, url, tenant_id, **kwargs):
+        page = int(kwargs["params"]["page"])
+        start = (page - 1) * page_size
+        count = max(0, min(page_size, total - start))
+        return {
+            "Invoices": [
+                {
+                    "InvoiceID": f"inv-{start + i}",
+                    # Milliseconds since the epoch, increasing with the invoice number
+                    "UpdatedDateUTC": f"/Date({1700000000000 + (start + i) * 1000}+0000)/"
+                }
+                for i in range(count)
+            ]
+        }
+    return fake_make_request
+
+
+@pytest.mark.asyncio
+async def test_export_records_pages_until_short_page():
+    """Test that export_records follows pages until a short page is returned"""
+    from context import xero
+    xero_module = importlib.import_module(XeroReportCache.__module__)
+
+    inputs = {
+        "tenant_id": "test-tenant",
+        "record_type": "invoices",
+        "page_size": 10
+    }
+
+    with patch.object(xero_module, 'rate_limiter') as mock_limiter:
+        mock_limiter.make_request = AsyncMock(side_effect=make_invoice_pages(25, 10))
+
+        async with ExecutionContext(auth={}) as context:
+            result = await xero.execute_action("export_records", inputs, context)
+            data = result.result.data
+
+    assert data["success"] is True
+    assert data["record_count"] == 25
+    assert data["pages_fetched"] == 3
+    assert data["complete"] is True
+    assert data["next_page"] is None
+    assert [r["InvoiceID"] for r in data["records"]] == [f"inv-{i}" for i in range(25)]
+    # Newest UpdatedDateUTC is 1700000024 seconds since the epoch
+    assert data["watermark"] == "2023-11-14T22:13:44"
+
+
+@pytest.mark.asyncio
+async def test_export_records_stops_at_max_records():
+    """Test that export_records returns next_page when max_records is reached"""
+    from context import xero
+    xero_module = importlib.import_module(XeroReportCache.__module__)
+
+    inputs = {
+        "tenant_id": "test-tenant",
+        "record_type": "invoices",
+        "page_size": 10,
+        "max_records": 20
+    }
+
+    with patch.object(xero_module, 'rate_limiter') as mock_limiter:
+        mock_limiter.make_request = AsyncMock(side_effect=make_invoice_pages(100, 10))
+
+        async with ExecutionContext(auth={}) as context:
+            result = await xero.execute_action("export_records", inputs, context)
+            data = result.result.data
+
+    assert data["record_count"] == 20
+    assert data["complete"] is False
+    assert data["next_page"] == 3
+
+
+@pytest.mark.asyncio
+async def test_export_records_sends_if_modified_since():
+    """Test that modified_since is sent as the If-Modified-Since header"""
+    from context import xero
+    xero_module = importlib.import_module(XeroReportCache.__module__)
+
+    inputs = {
+        "tenant_id": "test-tenant",
+        "record_type": "payments",
+        "modified_since": "2024-01-01T00:00:00"
+    }
+
+    with patch.object(xero_module, 'rate_limiter') as mock_limiter:
+        mock_limiter.make_request = AsyncMock(return_value={"Payments": []})
+
+        async with ExecutionContext(auth={}) as context:
+            result = await xero.execute_action("export_records", inputs, context)
+            data = result.result.data
+
+    call_kwargs = mock_limiter.make_request.call_args_list[0][1]
+    assert call_kwargs["headers"]["If-Modified-Since"] == "2024-01-01T00:00:00"
+    assert mock_limiter.make_request.call_args_list[0][0][1].endswith("/Payments")
+    assert data["record_count"] == 0
+    # Nothing changed, so the watermark stays where it was
+    assert data["watermark"] == "2024-01-01T00:00:00"
+
+
+@pytest.mark.asyncio
+async def test_export_records_only_treats_status_304_as_not_modified():
+    """Test that an error is only read as 'not modified' from its status code, not its message"""
+    from context import xero
+    xero_module = importlib.import_module(XeroReportCache.__module__)
+
+    class NotModified(Exception):
+        status = 304
+
+    inputs = {"tenant_id": "test-tenant", "record_type": "invoices", "modified_since": "2024-01-01T00:00:00"}
+
+    with patch.object(xero_module, 'rate_limiter') as mock_limiter:
+        mock_limiter.make_request = AsyncMock(side_effect=NotModified("Not Modified"))
+        async with ExecutionContext(auth={}) as context:
+            result = await xero.execute_action("export_records", inputs, context)
+        assert result.result.data["record_count"] == 0
+
+        mock_limiter.make_request = AsyncMock(side_effect=Exception("Invoice INV-304 is invalid"))
+        async with ExecutionContext(auth={}) as context:
+            with pytest.raises(Exception, match="INV-304"):
+                await xero.execute_action("export_records", inputs, context)
+
+
+# ---- Report Aggregation Tests ----
+
+def make_profit_and_loss(revenue, expenses):
+    """Minimal Xero ProfitAndLoss response with one section per category"""
+    return {
+        "Reports": [{
+            "ReportName": "Profit and Loss",
+            "Rows": [
+                {"RowType": "Header", "Cells": [{"Value": ""}, {"Value": "31 Mar 2024"}]},
+                {
+                    "RowType": "Section",
+                    "Title": "Income",
+                    "Rows": [
+                        {"RowType": "Row", "Cells": [
+                            {"Value": "Sales", "Attributes": [{"Id": "account", "Value": "acc-sales"}]},
+                            {"Value": str(revenue)}
+                        ]},
+                        {"RowType": "SummaryRow", "Cells": [{"Value": "Total Income"}, {"Value": str(revenue)}]}
+                    ]
+                },
+                {
+                    "RowType": "Section",
+                    "Title": "Operating Expenses",
+                    "Rows": [
+                        {"RowType": "Row", "Cells": [{"Value": "Rent"}, {"Value": str(expenses)}]}
+                    ]
+                }
+            ]
+        }]
+    }
+
+
+@pytest.mark.asyncio
+async def test_aggregate_report_merges_tenants_by_currency():
+    """Test that aggregate_report flattens each tenant's report and consolidates per currency"""
+    from context import xero
+    # The module that defines the report helpers, whether `xero` resolves to the package or the module
+    xero_module = importlib.import_module(XeroReportCache.__module__)
+
+    xero_module._tenant_currencies.clear()
+    xero_module.report_cache.clear()
+    currencies = {"t1": "NZD", "t2": "NZD", "t3": "AUD"}
+    reports = {"t1": make_profit_and_loss(1000, 400), "t2": make_profit_and_loss(500, 100), "t3": make_profit_and_loss(700, 300)}
+
+    async def fake_make_request(context, url, tenant_id, **kwargs):
+        if url.endswith("/Organisation"):
+            return {"Organisations": [{"BaseCurrency": currencies[tenant_id]}]}
+        assert url.endswith("/Reports/ProfitAndLoss")
+        assert kwargs["params"] == {"fromDate": "2024-01-01", "toDate": "2024-03-31"}
+        return reports[tenant_id]
+
+    connections = [{"tenantId": t, "tenantName": f"Org {t}"} for t in currencies]
+    inputs = {
+        "report_type": "profit_and_loss",
+        "tenant_ids": ["t1", "t2", "t3"],
+        "from_date": "2024-01-01",
+        "to_date": "2024-03-31"
+    }
+
+    with patch.object(xero_module, 'rate_limiter') as mock_limiter, \
+            patch.object(xero_module, 'get_all_connections', AsyncMock(return_value=connections)):
+        mock_limiter.make_request = AsyncMock(side_effect=fake_make_request)
+        mock_limiter.get_metrics = Mock(side_effect=lambda tenant_id: {tenant_id: {"requests": 2, "throttled": 0}})
+
+        async with ExecutionContext(auth={}) as context:
+            result = await xero.execute_action("aggregate_report", inputs, context)
+            data = result.result.data
+
+    assert data["success"] is True
+    assert data["errors"] == []
+    assert len(data["tenants"]) == 3
+    assert len(data["rows"]) == 9
+
+    sales_t1 = next(r for r in data["rows"] if r["tenant_id"] == "t1" and r["label"] == "Sales")
+    assert sales_t1["section"] == "Income"
+    assert sales_t1["account_id"] == "acc-sales"
+    assert sales_t1["currency"] == "NZD"
+    assert sales_t1["values"] == {"31 Mar 2024": 1000.0}
+
+    consolidated_sales = {
+        r["currency"]: r for r in data["consolidated"] if r["label"] == "Sales"
+    }
+    assert consolidated_sales["NZD"]["values"] == {"31 Mar 2024": 1500.0}
+    assert sorted(consolidated_sales["NZD"]["tenant_ids"]) == ["t1", "t2"]
+    assert consolidated_sales["AUD"]["values"] == {"31 Mar 2024": 700.0}
+    assert set(data["rate_limits"]) == {"t1", "t2", "t3"}
+    assert data["rate_limits"]["t1"]["requests"] == 2
+
+
+@pytest.mark.asyncio
+async def test_aggregate_report_reports_failing_tenants():
+    """Test that a failing tenant is listed in errors without failing the whole aggregation"""
+    from context import xero
+    # The module that defines the report helpers, whether `xero` resolves to the package or the module
+    xero_module = importlib.import_module(XeroReportCache.__module__)
+
+    xero_module._tenant_currencies.clear()
+    xero_module.report_cache.clear()
+
+    async def fake_make_request(context, url, tenant_id, **kwargs):
+        if tenant_id == "bad":
+            raise Exception("403 Forbidden")
+        if url.endswith("/Organisation"):
+            return {"Organisations": [{"BaseCurrency": "USD"}]}
+        return make_profit_and_loss(10, 5)
+
+    connections = [{"tenantId": "good", "tenantName": "Good Org"}, {"tenantId": "bad", "tenantName": "Bad Org"}]
+
+    with patch.object(xero_module, 'rate_limiter') as mock_limiter, \
+            patch.object(xero_module, 'get_all_connections', AsyncMock(return_value=connections)):
+        mock_limiter.make_request = AsyncMock(side_effect=fake_make_request)
+        mock_limiter.get_metrics = Mock(return_value={})
+
+        async with ExecutionContext(auth={}) as context:
+            result = await xero.execute_action("aggregate_report", {"report_type": "balance_sheet"}, context)
+            data = result.result.data
+
+    assert [t["tenant_id"] for t in data["tenants"]] == ["good"]
+    assert data["errors"][0]["tenant_id"] == "bad"
+    assert data["errors"][0]["tenant_name"] == "Bad Org"
+    assert "403" in data["errors"][0]["error"]
+
+
+def test_flatten_report_only_converts_value_columns():
+    """Test that numeric-looking text cells (account codes, invoice numbers) stay strings"""
+    xero_module = importlib.import_module(XeroReportCache.__module__)
+    report = {
+        "Reports": [{
+            "Rows": [
+                {"RowType": "Header", "Cells": [
+                    {"Value": "Contact"}, {"Value": "Invoice Number"}, {"Value": "Account Code"},
+                    {"Value": "Reference"}, {"Value": "Current"}, {"Value": "Total"}
+                ]},
+                {"RowType": "Section", "Title": "", "Rows": [
+                    {"RowType": "Row", "Cells": [
+                        {"Value": "ABC Ltd"}, {"Value": "1001"}, {"Value": "200"},
+                        {"Value": "0042"}, {"Value": "1,250.50"}, {"Value": "1250.50"}
+                    ]},
+                    {"RowType": "SummaryRow", "Cells": [
+                        {"Value": "Total"}, {"Value": ""}, {"Value": ""},
+                        {"Value": ""}, {"Value": "1250.50"}, {"Value": "1250.50"}
+                    ]}
+                ]}
+            ]
+        }]
+    }
+
+    columns, rows = xero_module.flatten_report(report)
+
+    assert columns == ["Invoice Number", "Account Code", "Reference", "Current", "Total"]
+    assert rows[0]["values"] == {
+        "Invoice Number": "1001",
+        "Account Code": "200",
+        "Reference": "0042",
+        "Current": 1250.5,
+        "Total": 1250.5
+    }
+
+    tagged = [{**row, "tenant_id": tenant, "currency": "NZD"} for tenant in ("t1", "t2") for row in rows]
+    consolidated = xero_module.consolidate_report_rows(tagged)
+    assert consolidated[0]["values"] == {"Current": 2501.0, "Total": 2501.0}
+
+
+def test_flatten_report_without_summary_rows_uses_numeric_columns():
+    """Test that reports without totals treat fully numeric columns as values, except known text columns"""
+    xero_module = importlib.import_module(XeroReportCache.__module__)
+    report = {
+        "Reports": [{
+            "Rows": [
+                {"RowType": "Header", "Cells": [
+                    {"Value": "Account"}, {"Value": "Code"}, {"Value": "Note"}, {"Value": "Debit"}
+                ]},
+                {"RowType": "Row", "Cells": [{"Value": "Sales"}, {"Value": "200"}, {"Value": "12"}, {"Value": "10.00"}]},
+                {"RowType": "Row", "Cells": [{"Value": "Rent"}, {"Value": "400"}, {"Value": "n/a"}, {"Value": ""}]}
+            ]
+        }]
+    }
+
+    _, rows = xero_module.flatten_report(report)
+
+    assert rows[0]["values"] == {"Code": "200", "Note": "12", "Debit": 10.0}
+    assert rows[1]["values"] == {"Code": "400", "Note": "n/a", "Debit": ""}
+
+
+# ---- Report Cache Tests ----
+
+def test_report_cache_ttl_closed_and_open_periods():
+    """Test that closed periods get the long TTL and current or undated periods the short one"""
+    cache = XeroReportCache(closed_period_ttl=1000, open_period_ttl=10)
+    today = datetime(2024, 5, 15).date()
+
+    assert cache.ttl_for({"toDate": "2024-03-31"}, today) == 1000
+    assert cache.ttl_for({"date": "2024-04-30"}, today) == 1000
+    assert cache.ttl_for({"toDate": "2024-05-31"}, today) == 10
+    assert cache.ttl_for({"date": "2024-05-01"}, today) == 10
+    assert cache.ttl_for({}, today) == 10
+    assert cache.ttl_for({"date": "not-a-date"}, today) == 10
+
+
+@pytest.mark.asyncio
+async def test_report_cache_hit_miss_and_refresh():
+    """Test that repeated lookups are served from the cache unless refresh is requested"""
+    cache = XeroReportCache(MemoryReportCacheBackend())
+    fetch = AsyncMock(return_value={"Reports": [{"ReportName": "Balance Sheet"}]})
+    params = {"date": "2023-12-31"}
+
+    first, first_cached = await cache.get_or_fetch("tenant-1", "BalanceSheet", params, fetch)
+    second, second_cached = await cache.get_or_fetch("tenant-1", "BalanceSheet", params, fetch)
+    await cache.get_or_fetch("tenant-2", "BalanceSheet", params, fetch)
+    await cache.get_or_fetch("tenant-1", "BalanceSheet", params, fetch, refresh=True)
+
+    assert first == second
+    assert (first_cached, second_cached) == (False, True)
+    assert fetch.call_count == 3
+    stats = cache.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 3
+    assert stats["hit_rate"] == 0.25
+
+
+@pytest.mark.asyncio
+async def test_report_cache_expired_entry_is_refetched():
+    """Test that an entry past its TTL counts as expired and is fetched again"""
+    cache = XeroReportCache(MemoryReportCacheBackend(), open_period_ttl=0)
+    fetch = AsyncMock(return_value={"Reports": []})
+
+    await cache.get_or_fetch("tenant-1", "TrialBalance", {}, fetch)
+    await cache.get_or_fetch("tenant-1", "TrialBalance", {}, fetch)
+
+    assert fetch.call_count == 2
+    assert cache.stats["expired"] == 1
+
+
+@pytest.mark.asyncio
+async def test_report_cache_disk_backend(tmp_path):
+    """Test that the disk backend serves reports stored by another cache instance"""
+    fetch = AsyncMock(return_value={"Reports": [{"ReportName": "Profit and Loss"}]})
+    params = {"fromDate": "2023-01-01", "toDate": "2023-12-31"}
+
+    writer = XeroReportCache(DiskReportCacheBackend(str(tmp_path)))
+    await writer.get_or_fetch("tenant-1", "ProfitAndLoss", params, fetch)
+
+    reader = XeroReportCache(DiskReportCacheBackend(str(tmp_path)))
+    report, from_cache = await reader.get_or_fetch("tenant-1", "ProfitAndLoss", params, fetch)
+
+    assert from_cache is True
+    assert report == {"Reports": [{"ReportName": "Profit and Loss"}]}
+    assert fetch.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_profit_and_loss_served_from_report_cache():
+    """Test that the report actions reuse cached responses for the same tenant and parameters"""
+    from context import xero
+    # The module that defines the report helpers, whether `xero` resolves to the package or the module
+    xero_module = importlib.import_module(XeroReportCache.__module__)
+
+    xero_module.report_cache.clear()
+    inputs = {
+        "tenant_id": "test-tenant",
+        "from_date": "2023-01-01",
+        "to_date": "2023-12-31"
+    }
+
+    with patch.object(xero_module, 'rate_limiter') as mock_limiter:
+        mock_limiter.make_request = AsyncMock(return_value={"Reports": [{"ReportName": "Profit and Loss"}]})
+
+        async with ExecutionContext(auth={}) as context:
+            first = await xero.execute_action("get_profit_and_loss", inputs, context)
+            second = await xero.execute_action("get_profit_and_loss", inputs, context)
+            await xero.execute_action("get_profit_and_loss", {**inputs, "refresh_cache": True}, context)
+
+    assert first.result.data == second.result.data
+    assert mock_limiter.make_request.call_count == 2
+
+
+def make_access_token(user_id: str, issued_at: int = 1700000000) -> str:
+    """Unsigned JWT shaped like a Xero access token"""
+    def encode(part):
+        return base64.urlsafe_b64encode(json.dumps(part).encode()).decode().rstrip("=")
+    claims = {"xero_userid": user_id, "sub": f"sub-{user_id}", "iat": issued_at, "exp": issued_at + 1800}
+    return f"{encode({'alg': 'RS256', 'typ': 'JWT'})}.{encode(claims)}.signature"
+
+
+@pytest.mark.asyncio
+async def test_report_cache_is_scoped_to_caller():
+    """Test that a report cached for one connection is not served to another for the same tenant"""
+    from context import xero
+    xero_module = importlib.import_module(XeroReportCache.__module__)
+
+    xero_module.report_cache.clear()
+    xero_module._tenant_currencies.clear()
+    inputs = {"tenant_id": "shared-tenant", "from_date": "2023-01-01", "to_date": "2023-12-31"}
+
+    with patch.object(xero_module, 'rate_limiter') as mock_limiter:
+        mock_limiter.make_request = AsyncMock(return_value={"Reports": [{"ReportName": "Profit and Loss"}]})
+
+        async with ExecutionContext(auth={"credentials": {"access_token": make_access_token("user-a")}}) as context_a:
+            await xero.execute_action("get_profit_and_loss", inputs, context_a)
+            await xero.execute_action("get_profit_and_loss", inputs, context_a)
+        async with ExecutionContext(auth={"credentials": {"access_token": make_access_token("user-b")}}) as context_b:
+            await xero.execute_action("get_profit_and_loss", inputs, context_b)
+
+    assert mock_limiter.make_request.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_report_cache_survives_token_refresh():
+    """Test that contexts differing only in access token share cached reports and currencies"""
+    from context import xero
+    xero_module = importlib.import_module(XeroReportCache.__module__)
+
+    xero_module.report_cache.clear()
+    xero_module._tenant_currencies.clear()
+    inputs = {"tenant_id": "tenant-1", "from_date": "2023-01-01", "to_date": "2023-12-31"}
+
+    with patch.object(xero_module, 'rate_limiter') as mock_limiter:
+        mock_limiter.make_request = AsyncMock(return_value={"Reports": [{"ReportName": "Profit and Loss"}]})
+
+        auth = {"auth_type": "PlatformOauth2", "credentials": {
+            "access_token": make_access_token("user-a", issued_at=1700000000),
+            "refresh_token": "refresh-1", "expires_at": 1700001800
+        }}
+        async with ExecutionContext(auth=auth) as context:
+            first_key = xero_module.get_caller_key(context)
+            first = await xero.execute_action("get_profit_and_loss", inputs, context)
+
+        refreshed = {"auth_type": "PlatformOauth2", "credentials": {
+            "access_token": make_access_token("user-a", issued_at=1700001800),
+            "refresh_token": "refresh-2", "expires_at": 1700003600
+        }}
+        async with ExecutionContext(auth=refreshed) as context:
+            second_key = xero_module.get_caller_key(context)
+            second = await xero.execute_action("get_profit_and_loss", inputs, context)
+
+    assert first_key == second_key
+    assert second.result.data == first.result.data
+    assert mock_limiter.make_request.call_count == 1
+
+
 if __name__ == "__main__":
     asyncio.run(main())
@@ -2,12 +2,18 @@ from autohive_integrations_sdk import (
     Integration, ExecutionContext, ActionHandler, ActionResult,
     ConnectedAccountHandler, ConnectedAccountInfo
 )
-from typing import Dict, Any, Optional
-from datetime import datetime
+from typing import Dict, Any, Optional, List, Tuple, AsyncIterator
+from datetime import datetime, date, timezone
+from collections import OrderedDict
 import asyncio
 import base64
+import contextlib
+import hashlib
 import io
+import json
 import os
+import re
+import time
 import aiohttp
 
 # Create the integration using the config.json
@@ -68,73 +74,412 @@ class XeroRateLimitExceededException(Exception):
             f"exceeds maximum wait time of {max_wait_time}s"
         )
 
+class _TenantRateState:
+    """Pacing state for a single Xero tenant (organisation)."""
+
+    def __init__(self, calls_per_minute: int, max_concurrent: int):
+        self.max_concurrent = max_concurrent
+        self.tokens = float(calls_per_minute)
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self.semaphore: Optional[asyncio.Semaphore] = None
+        self.loop = None
+        self.in_flight = 0
+        self.minute_remaining: Optional[int] = None
+        self.day_remaining: Optional[int] = None
+        self.requests = 0
+        self.throttled = 0
+        self.wait_seconds = 0.0
+
+    def get_semaphore(self) -> asyncio.Semaphore:
+        # Semaphores belong to an event loop; a new loop (e.g. a new invocation) gets a fresh one
+        loop = asyncio.get_running_loop()
+        if self.semaphore is None or self.loop is not loop:
+            self.semaphore = asyncio.Semaphore(self.max_concurrent)
+            self.loop = loop
+        return self.semaphore
+
+
+def _error_status(error: Exception) -> Optional[int]:
+    """HTTP status code attached to an error or its response, if any"""
+    for source in (error, getattr(error, "response", None)):
+        for attribute in ("status", "status_code"):
+            status = getattr(source, attribute, None)
+            if isinstance(status, int):
+                return status
+    return None
+
+
 class XeroRateLimiter:
-    def __init__(self, default_retry_delay: int = 60, max_retries: int = 3, max_wait_time: int = 60):
+    def __init__(self, default_retry_delay: int = 60, max_retries: int = 3, max_wait_time: int = 60,
+                 calls_per_minute: int = 60, max_concurrent: int = 5):
         """
-        Handles Xero API rate limiting by retrying requests on 429 errors.
-        Prevents lambda from waiting too long by setting maximum wait time.
+        Handles Xero API rate limiting per tenant.
+
+        Requests are paced ahead of time with a token bucket sized to Xero's
+        60 calls per minute limit, and at most 5 requests per tenant are in
+        flight at once (Xero's concurrent limit). The X-MinLimit-Remaining and
+        X-DayLimit-Remaining headers tighten the local budget when they are seen.
+        A 429 is still retried after Retry-After, and pauses other requests for
+        the same tenant. Prevents lambda from waiting too long by setting maximum
+        wait time.
         """
         self.default_retry_delay = default_retry_delay
         self.max_retries = max_retries
         self.max_wait_time = max_wait_time
-    
+        self.calls_per_minute = calls_per_minute
+        self.max_concurrent = max_concurrent
+        self._tenants: Dict[str, _TenantRateState] = {}
+
+    def _tenant(self, tenant_id: str) -> _TenantRateState:
+        state = self._tenants.get(tenant_id)
+        if state is None:
+            state = _TenantRateState(self.calls_per_minute, self.max_concurrent)
+            self._tenants[tenant_id] = state
+        return state
+
+    @staticmethod
+    def _error_headers(error) -> Dict[str, str]:
+        """Response headers attached to an error, if the error carries any"""
+        headers = getattr(error, 'headers', None)
+        if headers is None and getattr(error, 'response', None) is not None:
+            headers = getattr(error.response, 'headers', None)
+        return headers or {}
+
+    @staticmethod
+    def _is_rate_limit_error(error) -> bool:
+        # Status only: error text can contain "429" (an invoice number, an amount) without being a 429
+        return _error_status(error) == 429
+
     def _extract_retry_delay(self, error_response) -> int:
         """Extract retry delay from error response headers"""
-        if hasattr(error_response, 'headers'):
-            retry_after = error_response.headers.get('Retry-After')
-            if retry_after:
-                try:
-                    return int(retry_after)
-                except ValueError:
-                    pass
+        retry_after = self._error_headers(error_response).get('Retry-After')
+        if retry_after:
+            try:
+                return int(retry_after)
+            except ValueError:
+                pass
         return self.default_retry_delay
-    
+
+    def observe_headers(self, tenant_id: str, headers) -> None:
+        """Update a tenant's budget from Xero's X-MinLimit-Remaining / X-DayLimit-Remaining headers"""
+        if not headers:
+            return
+        state = self._tenant(tenant_id)
+        for header, attribute in (("X-MinLimit-Remaining", "minute_remaining"), ("X-DayLimit-Remaining", "day_remaining")):
+            value = headers.get(header)
+            if value is None:
+                continue
+            try:
+                setattr(state, attribute, int(value))
+            except (TypeError, ValueError):
+                continue
+        if state.minute_remaining is not None:
+            # Other apps share the tenant's minute quota, so the server's count wins if it is lower
+            state.tokens = min(state.tokens, float(state.minute_remaining))
+
+    async def _pace(self, tenant_id: str, state: _TenantRateState, respect_block: bool = True) -> None:
+        """Wait until the tenant has budget for one more call, reserving it"""
+        now = time.monotonic()
+        rate = self.calls_per_minute / 60.0
+        state.tokens = min(float(self.calls_per_minute), state.tokens + (now - state.updated_at) * rate)
+        state.updated_at = now
+        state.tokens -= 1
+
+        delay = -state.tokens / rate if state.tokens < 0 else 0.0
+        if respect_block:
+            delay = max(delay, state.blocked_until - now)
+        if delay <= 0:
+            return
+        if delay > self.max_wait_time:
+            # Give the reserved call back; we are not going to make it
+            state.tokens += 1
+            raise XeroRateLimitExceededException(int(delay + 0.999), self.max_wait_time, tenant_id)
+        state.wait_seconds += delay
+        await asyncio.sleep(delay)
+
+    @contextlib.asynccontextmanager
+    async def slot(self, tenant_id: str, respect_block: bool = True):
+        """Pace and hold one of the tenant's concurrent request slots, for requests made outside make_request"""
+        state = self._tenant(tenant_id)
+        await self._pace(tenant_id, state, respect_block)
+        async with state.get_semaphore():
+            state.in_flight += 1
+            state.requests += 1
+            try:
+                yield state
+            finally:
+                state.in_flight -= 1
+
     async def make_request(self, context: ExecutionContext, url: str, tenant_id: str, **kwargs) -> Any:
-        """Make request to Xero API with automatic retry on rate limit errors"""
+        """Make request to Xero API with per-tenant pacing and automatic retry on rate limit errors"""
         # Add tenant header to the request
         headers = kwargs.get('headers', {})
         headers['xero-tenant-id'] = tenant_id
         kwargs['headers'] = headers
-        
+
+        state = self._tenant(tenant_id)
         last_error = None
-        
+
         for attempt in range(self.max_retries + 1):
             try:
-                response = await context.fetch(url, **kwargs)
+                # A retry has already waited out the Retry-After it set itself
+                async with self.slot(tenant_id, respect_block=attempt == 0):
+                    response = await context.fetch(url, **kwargs)
                 return response
-                
+
+            except XeroRateLimitExceededException:
+                raise
+
             except Exception as e:
                 last_error = e
-                error_str = str(e).lower()
-                
+                self.observe_headers(tenant_id, self._error_headers(e))
+
                 # Check if it's a rate limit error (HTTP 429)
-                if '429' in error_str or 'rate limit' in error_str or 'too many requests' in error_str:
+                if self._is_rate_limit_error(e):
+                    state.throttled += 1
+
+                    # Get delay from response headers or use default
+                    delay = self._extract_retry_delay(e)
+
+                    # Hold back other requests for this tenant until the limit resets
+                    state.blocked_until = max(state.blocked_until, time.monotonic() + delay)
+
                     # Don't retry on the last attempt
                     if attempt >= self.max_retries:
                         break
-                        
-                    # Get delay from response headers or use default
-                    delay = self._extract_retry_delay(e)
-                    
+
                     # Check if delay exceeds maximum wait time
                     if delay > self.max_wait_time:
                         # Don't wait - inform LLM about rate limit immediately
                         raise XeroRateLimitExceededException(delay, self.max_wait_time, tenant_id)
-                    
+
+                    state.wait_seconds += delay
+
                     # Short delay - proceed with waiting and retry
                     await asyncio.sleep(delay)
                     continue
-                
+
                 # For non-rate-limit errors, fail immediately
                 raise e
-        
+
         # All retries exhausted, raise the last error
         raise last_error
 
+    def get_metrics(self, tenant_id: Optional[str] = None) -> Dict[str, Any]:
+        """Per-tenant request counts, throttling and remaining budget"""
+        tenant_ids = [tenant_id] if tenant_id else list(self._tenants)
+        metrics = {}
+        for current_id in tenant_ids:
+            state = self._tenants.get(current_id)
+            if state is None:
+                continue
+            metrics[current_id] = {
+                "requests": state.requests,
+                "throttled": state.throttled,
+                "wait_seconds": round(state.wait_seconds, 3),
+                "in_flight": state.in_flight,
+                "tokens_available": max(0.0, round(state.tokens, 3)),
+                "minute_remaining": state.minute_remaining,
+                "day_remaining": state.day_remaining
+            }
+        return metrics
+
 
 # Global rate limiter instance
 rate_limiter = XeroRateLimiter()
 
+
+# ---- Report Cache ----
+
+# Reports for periods that ended before the current month rarely change; current ones do
+REPORT_CACHE_CLOSED_PERIOD_TTL = 7 * 24 * 3600
+REPORT_CACHE_OPEN_PERIOD_TTL = 5 * 60
+REPORT_CACHE_MAX_ENTRIES = 500
+
+
+class MemoryReportCacheBackend:
+    """Keeps cached reports in process memory, evicting the least recently used"""
+
+    def __init__(self, max_entries: int = REPORT_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Tuple[float, str]]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, expires_at: float, value: str) -> None:
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class DiskReportCacheBackend:
+    """Keeps cached reports as JSON files in a directory, so they survive restarts"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json")
+
+    def get(self, key: str) -> Optional[Tuple[float, str]]:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry["expires_at"], entry["value"]
+
+    def set(self, key: str, expires_at: float, value: str) -> None:
+        path = self._path(key)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"expires_at": expires_at, "value": value}, f)
+        os.replace(temp_path, path)
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def clear(self) -> None:
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+
+# Auth fields that change on every token refresh and say nothing about who is connected
+VOLATILE_AUTH_FIELDS = frozenset({
+    "access_token", "refresh_token", "id_token", "token_type", "expires_at", "expires_in", "scope"
+})
+# Access token claims that identify the Xero user and survive a refresh
+STABLE_TOKEN_CLAIMS = ("xero_userid", "sub")
+
+
+def _stable_auth(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _stable_auth(item) for key, item in value.items() if key not in VOLATILE_AUTH_FIELDS}
+    return value
+
+
+def _token_identity(token: Any) -> Dict[str, Any]:
+    """Identity claims from a Xero access token (a JWT); empty if the token can't be read"""
+    if not isinstance(token, str) or token.count(".") != 2:
+        return {}
+    payload = token.split(".")[1]
+    try:
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+    except (ValueError, TypeError):
+        return {}
+    if not isinstance(claims, dict):
+        return {}
+    return {claim: claims[claim] for claim in STABLE_TOKEN_CLAIMS if claim in claims}
+
+
+def get_caller_key(context: ExecutionContext) -> str:
+    """
+    Fingerprint of the connection behind a context, so cached data is never shared between callers.
+
+    Token values are left out (Xero rotates the access token about every 30 minutes),
+    so the key stays the same across refreshes; the user claims inside the token are kept.
+    """
+    auth = getattr(context, "auth", None) or {}
+    credentials = auth.get("credentials") if isinstance(auth.get("credentials"), dict) else auth
+    identity = json.dumps({"auth": _stable_auth(auth), "user": _token_identity(credentials.get("access_token"))},
+                          sort_keys=True, default=str)
+    return hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+
+class XeroReportCache:
+    """
+    Memoizes report responses by caller, tenant, report and query parameters.
+
+    Reports whose period ended before the current month are kept for
+    closed_period_ttl; anything covering the current month (or with no explicit
+    date, which Xero treats as today) only for open_period_ttl. Storage is
+    pluggable: any backend with get/set/delete/clear works, e.g. memory or disk.
+    """
+
+    def __init__(self, backend=None, closed_period_ttl: int = REPORT_CACHE_CLOSED_PERIOD_TTL,
+                 open_period_ttl: int = REPORT_CACHE_OPEN_PERIOD_TTL):
+        self.backend = backend or MemoryReportCacheBackend()
+        self.closed_period_ttl = closed_period_ttl
+        self.open_period_ttl = open_period_ttl
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "stores": 0}
+
+    @staticmethod
+    def make_key(tenant_id: str, endpoint: str, params: Dict[str, str], caller: str = "") -> str:
+        return json.dumps([caller, tenant_id, endpoint, sorted(params.items())])
+
+    def ttl_for(self, params: Dict[str, str], today: Optional[date] = None) -> int:
+        """Long TTL if the report's period ended before the current month, short otherwise"""
+        period_end = params.get("toDate") or params.get("date")
+        if not period_end:
+            return self.open_period_ttl
+        try:
+            period_end_date = datetime.strptime(period_end[:10], "%Y-%m-%d").date()
+        except ValueError:
+            return self.open_period_ttl
+        today = today or datetime.now(timezone.utc).date()
+        if period_end_date < today.replace(day=1):
+            return self.closed_period_ttl
+        return self.open_period_ttl
+
+    async def get_or_fetch(self, tenant_id: str, endpoint: str, params: Dict[str, str], fetch,
+                           refresh: bool = False, caller: str = "") -> Tuple[Dict[str, Any], bool]:
+        """
+        Return (report, served from cache), calling fetch() on a miss.
+
+        caller identifies the connection (see get_caller_key); a report cached for one
+        connection is never served to another, even for the same tenant.
+        """
+        key = self.make_key(tenant_id, endpoint, params, caller)
+        if not refresh:
+            entry = self.backend.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.time():
+                    self.stats["hits"] += 1
+                    return json.loads(value), True
+                self.stats["expired"] += 1
+                self.backend.delete(key)
+        self.stats["misses"] += 1
+
+        response = await fetch()
+        self.backend.set(key, time.time() + self.ttl_for(params), json.dumps(response))
+        self.stats["stores"] += 1
+        return response, False
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {**self.stats, "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else 0.0}
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+
+# Global report cache; set XERO_REPORT_CACHE_DIR to keep reports on disk instead of in memory
+report_cache = XeroReportCache(
+    DiskReportCacheBackend(os.environ["XERO_REPORT_CACHE_DIR"]) if os.environ.get("XERO_REPORT_CACHE_DIR") else None
+)
+
+
 # ---- Helper Functions ----
 
 
@@ -159,6 +504,313 @@ async def get_all_connections(context: ExecutionContext) -> list:
 
 
 
+# ---- Bulk Export ----
+
+XERO_API_BASE = "https://api.xero.com/api.xro/2.0"
+
+# record_type -> (endpoint, key of the records list in the response)
+EXPORT_RECORD_TYPES = {
+    "invoices": ("Invoices", "Invoices"),
+    "payments": ("Payments", "Payments"),
+    "bank_transactions": ("BankTransactions", "BankTransactions"),
+    "purchase_orders": ("PurchaseOrders", "PurchaseOrders"),
+}
+EXPORT_DEFAULT_PAGE_SIZE = 100
+EXPORT_MAX_PAGE_SIZE = 1000
+# Pages requested ahead of the one being consumed; the rate limiter still caps concurrency
+EXPORT_PREFETCH_PAGES = 3
+
+
+def parse_xero_date(value: Optional[str]) -> Optional[datetime]:
+    """Parse Xero's /Date(1573755038314+0000)/ or ISO timestamps into UTC datetimes"""
+    if not value:
+        return None
+    match = re.match(r"/Date\((-?\d+)([+-]\d{4})?\)/", value)
+    if match:
+        return datetime.fromtimestamp(int(match.group(1)) / 1000, tz=timezone.utc)
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+async def fetch_export_page(context: ExecutionContext, tenant_id: str, endpoint: str, result_key: str,
+                            params: Dict[str, Any], page: int, modified_since: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Fetch one page of records, optionally only those modified since a timestamp"""
+    headers = {"Accept": "application/json"}
+    if modified_since:
+        headers["If-Modified-Since"] = modified_since
+    try:
+        response = await rate_limiter.make_request(
+            context,
+            f"{XERO_API_BASE}/{endpoint}",
+            tenant_id,
+            method="GET",
+            params={**params, "page": str(page)},
+            headers=headers
+        )
+    except XeroRateLimitExceededException:
+        raise
+    except Exception as e:
+        # Nothing changed since If-Modified-Since
+        if _error_status(e) == 304:
+            return []
+        raise
+    return (response or {}).get(result_key, [])
+
+
+async def iter_export_pages(context: ExecutionContext, tenant_id: str, record_type: str, params: Dict[str, Any],
+                            page_size: int = EXPORT_DEFAULT_PAGE_SIZE, start_page: int = 1,
+                            modified_since: Optional[str] = None,
+                            prefetch: int = EXPORT_PREFETCH_PAGES) -> AsyncIterator[Tuple[int, List[Dict[str, Any]]]]:
+    """
+    Yield (page number, records) in order until Xero returns a short page.
+
+    Up to `prefetch` pages are requested ahead of the one being consumed, so the
+    next chunk is usually ready by the time the caller asks for it. Pages still in
+    flight when the caller stops or a short page is reached are cancelled.
+    """
+    endpoint, result_key = EXPORT_RECORD_TYPES[record_type]
+    params = {**params, "pageSize": str(page_size)}
+    pending: Dict[int, asyncio.Task] = {}
+    next_to_schedule = start_page
+    current = start_page
+
+    def schedule():
+        nonlocal next_to_schedule
+        while len(pending) < max(1, prefetch):
+            pending[next_to_schedule] = asyncio.ensure_future(
+                fetch_export_page(context, tenant_id, endpoint, result_key, params, next_to_schedule, modified_since)
+            )
+            next_to_schedule += 1
+
+    try:
+        while True:
+            schedule()
+            records = await pending.pop(current)
+            yield current, records
+            if len(records) < page_size:
+                return
+            current += 1
+    finally:
+        for task in pending.values():
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending.values(), return_exceptions=True)
+
+
+
+# ---- Report Aggregation ----
+
+# report_type -> Xero report endpoint
+REPORT_ENDPOINTS = {
+    "profit_and_loss": "ProfitAndLoss",
+    "balance_sheet": "BalanceSheet",
+    "trial_balance": "TrialBalance",
+    "aged_receivables": "AgedReceivablesByContact",
+    "aged_payables": "AgedPayablesByContact",
+}
+# Input name -> Xero query parameter, shared by all report types
+REPORT_PARAMS = {
+    "date": "date",
+    "from_date": "fromDate",
+    "to_date": "toDate",
+    "timeframe": "timeframe",
+    "periods": "periods",
+    "payments_only": "paymentsOnly",
+}
+# Tenants reported on at once; each tenant is also held to its own limits by rate_limiter
+REPORT_AGGREGATION_CONCURRENCY = 10
+
+TENANT_CURRENCY_CACHE_MAX_ENTRIES = 1000
+
+# Base currency per (caller, tenant), least recently used first; an organisation's
+# base currency cannot be changed once set
+_tenant_currencies: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+
+
+def build_report_params(inputs: Dict[str, Any]) -> Dict[str, str]:
+    """Map report inputs to Xero query parameters"""
+    params = {}
+    for input_name, param_name in REPORT_PARAMS.items():
+        value = inputs.get(input_name)
+        if value is None or value == "":
+            continue
+        params[param_name] = str(value).lower() if isinstance(value, bool) else str(value)
+    return params
+
+
+async def fetch_report(context: ExecutionContext, tenant_id: str, endpoint: str, params: Dict[str, str],
+                       refresh: bool = False) -> Tuple[Dict[str, Any], bool]:
+    """Fetch a Xero report for one tenant through the report cache; returns (report, served from cache)"""
+    async def fetch():
+        response = await rate_limiter.make_request(
+            context,
+            f"{XERO_API_BASE}/Reports/{endpoint}",
+            tenant_id,
+            method="GET",
+            params=params,
+            headers={"Accept": "application/json"}
+        )
+        if not response:
+            raise ValueError("Empty response from Xero API")
+        return response
+
+    return await report_cache.get_or_fetch(tenant_id, endpoint, params, fetch, refresh=refresh,
+                                           caller=get_caller_key(context))
+
+
+async def get_tenant_currency(context: ExecutionContext, tenant_id: str) -> Optional[str]:
+    """Base currency of a tenant's organisation"""
+    key = (get_caller_key(context), tenant_id)
+    if key not in _tenant_currencies:
+        response = await rate_limiter.make_request(
+            context,
+            f"{XERO_API_BASE}/Organisation",
+            tenant_id,
+            method="GET",
+            headers={"Accept": "application/json"}
+        )
+        organisations = (response or {}).get("Organisations") or [{}]
+        currency = organisations[0].get("BaseCurrency")
+        if not currency:
+            return None
+        _tenant_currencies[key] = currency
+        while len(_tenant_currencies) > TENANT_CURRENCY_CACHE_MAX_ENTRIES:
+            _tenant_currencies.popitem(last=False)
+    _tenant_currencies.move_to_end(key)
+    return _tenant_currencies[key]
+
+
+# Report columns that hold text even when it looks numeric (account codes, invoice numbers)
+REPORT_TEXT_COLUMNS = {
+    "account", "account code", "code", "account type", "contact", "date", "description",
+    "due date", "invoice date", "invoice number", "reference", "tax rate", "type"
+}
+
+
+def _report_number(value: Any) -> Optional[float]:
+    """A report cell as a number, or None if it is not numeric"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str) and value.strip():
+        try:
+            return float(value.replace(",", ""))
+        except ValueError:
+            return None
+    return None
+
+
+def _report_value_columns(columns: List[str], rows: List[Tuple[Dict[str, Any], str]]) -> set:
+    """
+    Indexes of the columns that hold amounts.
+
+    Xero's summary (total) rows only fill amount columns, so a column is a value
+    column if a summary row has a number in it. Reports without summary rows fall
+    back to columns whose cells are all numeric. Known text columns never count.
+    """
+    summaries = [row.get("Cells") or [] for row, _ in rows if row.get("RowType") == "SummaryRow"]
+    value_columns = set()
+    for cells in summaries:
+        for index, cell in enumerate(cells[1:], start=1):
+            if _report_number(cell.get("Value")) is not None:
+                value_columns.add(index)
+    if not summaries:
+        numeric: Dict[int, bool] = {}
+        for row, _ in rows:
+            for index, cell in enumerate((row.get("Cells") or [])[1:], start=1):
+                if cell.get("Value") not in (None, ""):
+                    numeric[index] = numeric.get(index, True) and _report_number(cell.get("Value")) is not None
+        value_columns = {index for index, is_numeric in numeric.items() if is_numeric}
+
+    return {
+        index for index in value_columns
+        if not (index < len(columns) and columns[index].strip().lower() in REPORT_TEXT_COLUMNS)
+    }
+
+
+def flatten_report(response: Dict[str, Any]) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """
+    Flatten a Xero report into column titles and one dict per row.
+
+    Xero nests rows inside titled sections, with a header row giving the column
+    titles. Each flattened row keeps its section title, whether it is a summary
+    (total) row, its label (first cell), the account ID when the row is an
+    account, and the remaining cells keyed by column title. Cells in amount
+    columns become floats; other cells (codes, dates, references) stay strings.
+    """
+    reports = response.get("Reports") or []
+    if not reports:
+        return [], []
+    report = reports[0]
+
+    columns: List[str] = []
+    raw_rows: List[Tuple[Dict[str, Any], str]] = []
+    for row in report.get("Rows") or []:
+        row_type = row.get("RowType")
+        if row_type == "Header":
+            columns = [cell.get("Value", "") for cell in row.get("Cells") or []]
+        elif row_type == "Section":
+            for child in row.get("Rows") or []:
+                raw_rows.append((child, row.get("Title", "")))
+        else:
+            raw_rows.append((row, ""))
+
+    value_columns = _report_value_columns(columns, raw_rows)
+
+    rows: List[Dict[str, Any]] = []
+    for row, section in raw_rows:
+        cells = row.get("Cells") or []
+        if not cells:
+            continue
+        account_id = None
+        for attribute in cells[0].get("Attributes") or []:
+            if attribute.get("Id") == "account":
+                account_id = attribute.get("Value")
+        values = {}
+        for index, cell in enumerate(cells[1:], start=1):
+            title = columns[index] if index < len(columns) else f"Column {index}"
+            value = cell.get("Value")
+            if index in value_columns:
+                number = _report_number(value)
+                value = value if number is None else number
+            values[title] = value
+        rows.append({
+            "section": section,
+            "row_type": "summary" if row.get("RowType") == "SummaryRow" else "row",
+            "label": cells[0].get("Value", ""),
+            "account_id": account_id,
+            "values": values
+        })
+
+    return columns[1:], rows
+
+
+def consolidate_report_rows(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Sum numeric values of rows with the same section, label and currency across tenants"""
+    totals: Dict[Tuple[str, str, str, Optional[str]], Dict[str, Any]] = {}
+    for row in rows:
+        key = (row["section"], row["row_type"], row["label"], row["currency"])
+        entry = totals.get(key)
+        if entry is None:
+            entry = totals[key] = {
+                "section": row["section"],
+                "row_type": row["row_type"],
+                "label": row["label"],
+                "currency": row["currency"],
+                "values": {},
+                "tenant_ids": []
+            }
+        if row["tenant_id"] not in entry["tenant_ids"]:
+            entry["tenant_ids"].append(row["tenant_id"])
+        for column, value in row["values"].items():
+            if isinstance(value, float):
+                entry["values"][column] = round(entry["values"].get(column, 0.0) + value, 2)
+    return list(totals.values())
+
+
+
 # ---- Action Handlers ----
 
 
@@ -297,8 +949,7 @@ class GetAgedPayablesAction(ActionHandler):
         
         try:
             
-            # Build URL with parameters
-            url = "https://api.xero.com/api.xro/2.0/Reports/AgedPayablesByContact"
+            # Build report parameters
             params = {
                 "contactId": contact_id
             }
@@ -307,20 +958,15 @@ class GetAgedPayablesAction(ActionHandler):
             if inputs.get("date"):
                 params["date"] = inputs["date"]
             
-            # Make rate-limited authenticated request to Xero API
-            response = await rate_limiter.make_request(
+            # Rate-limited request, served from the report cache when still fresh
+            response, _ = await fetch_report(
                 context,
-                url,
                 tenant_id,
-                method="GET",
-                params=params,
-                headers={"Accept": "application/json"}
+                "AgedPayablesByContact",
+                params,
+                refresh=bool(inputs.get("refresh_cache", False))
             )
             
-            # Return raw API response
-            if not response:
-                raise ValueError("Empty response from Xero API")
-            
             return ActionResult(data=response)
                 
         except XeroRateLimitExceededException as e:
@@ -352,8 +998,7 @@ class GetAgedReceivablesAction(ActionHandler):
         
         try:
             
-            # Build URL with parameters
-            url = "https://api.xero.com/api.xro/2.0/Reports/AgedReceivablesByContact"
+            # Build report parameters
             params = {
                 "contactId": contact_id
             }
@@ -362,20 +1007,15 @@ class GetAgedReceivablesAction(ActionHandler):
             if inputs.get("date"):
                 params["date"] = inputs["date"]
             
-            # Make rate-limited authenticated request to Xero API
-            response = await rate_limiter.make_request(
+            # Rate-limited request, served from the report cache when still fresh
+            response, _ = await fetch_report(
                 context,
-                url,
                 tenant_id,
-                method="GET",
-                params=params,
-                headers={"Accept": "application/json"}
+                "AgedReceivablesByContact",
+                params,
+                refresh=bool(inputs.get("refresh_cache", False))
             )
             
-            # Return raw API response
-            if not response:
-                raise ValueError("Empty response from Xero API")
-            
             return ActionResult(data=response)
                 
         except XeroRateLimitExceededException as e:
@@ -403,8 +1043,7 @@ class GetBalanceSheetAction(ActionHandler):
         
         try:
             
-            # Build URL with parameters
-            url = "https://api.xero.com/api.xro/2.0/Reports/BalanceSheet"
+            # Build report parameters
             params = {}
             
             # Add optional date parameter
@@ -415,20 +1054,15 @@ class GetBalanceSheetAction(ActionHandler):
             if inputs.get("periods"):
                 params["periods"] = str(inputs["periods"])
             
-            # Make rate-limited authenticated request to Xero API
-            response = await rate_limiter.make_request(
+            # Rate-limited request, served from the report cache when still fresh
+            response, _ = await fetch_report(
                 context,
-                url,
                 tenant_id,
-                method="GET",
-                params=params,
-                headers={"Accept": "application/json"}
+                "BalanceSheet",
+                params,
+                refresh=bool(inputs.get("refresh_cache", False))
             )
             
-            # Return raw API response
-            if not response:
-                raise ValueError("Empty response from Xero API")
-            
             return ActionResult(data=response)
                 
         except XeroRateLimitExceededException as e:
@@ -456,8 +1090,7 @@ class GetProfitAndLossAction(ActionHandler):
         
         try:
             
-            # Build URL with parameters
-            url = "https://api.xero.com/api.xro/2.0/Reports/ProfitAndLoss"
+            # Build report parameters
             params = {}
             
             # Add optional date parameter
@@ -480,20 +1113,15 @@ class GetProfitAndLossAction(ActionHandler):
             if inputs.get("periods"):
                 params["periods"] = str(inputs["periods"])
             
-            # Make rate-limited authenticated request to Xero API
-            response = await rate_limiter.make_request(
+            # Rate-limited request, served from the report cache when still fresh
+            response, _ = await fetch_report(
                 context,
-                url,
                 tenant_id,
-                method="GET",
-                params=params,
-                headers={"Accept": "application/json"}
+                "ProfitAndLoss",
+                params,
+                refresh=bool(inputs.get("refresh_cache", False))
             )
             
-            # Return raw API response
-            if not response:
-                raise ValueError("Empty response from Xero API")
-            
             return ActionResult(data=response)
                 
         except XeroRateLimitExceededException as e:
@@ -521,8 +1149,7 @@ class GetTrialBalanceAction(ActionHandler):
         
         try:
             
-            # Build URL with parameters
-            url = "https://api.xero.com/api.xro/2.0/Reports/TrialBalance"
+            # Build report parameters
             params = {}
             
             # Add optional date parameter
@@ -533,20 +1160,15 @@ class GetTrialBalanceAction(ActionHandler):
             if inputs.get("payments_only") is not None:
                 params["paymentsOnly"] = str(inputs["payments_only"]).lower()
             
-            # Make rate-limited authenticated request to Xero API
-            response = await rate_limiter.make_request(
+            # Rate-limited request, served from the report cache when still fresh
+            response, _ = await fetch_report(
                 context,
-                url,
                 tenant_id,
-                method="GET",
-                params=params,
-                headers={"Accept": "application/json"}
+                "TrialBalance",
+                params,
+                refresh=bool(inputs.get("refresh_cache", False))
             )
             
-            # Return raw API response
-            if not response:
-                raise ValueError("Empty response from Xero API")
-            
             return ActionResult(data=response)
                 
         except XeroRateLimitExceededException as e:
@@ -813,9 +1435,10 @@ class GetInvoicePdfAction(ActionHandler):
 
             headers["Authorization"] = f"Bearer {auth_token}"
 
-            # Use aiohttp to download the PDF
-            async with aiohttp.ClientSession() as session:
+            # Use aiohttp to download the PDF, paced by the tenant's rate limit
+            async with rate_limiter.slot(tenant_id), aiohttp.ClientSession() as session:
                 async with session.get(url, headers=headers) as response:
+                    rate_limiter.observe_headers(tenant_id, response.headers)
                     if response.status != 200:
                         error_text = await response.text()
                         return ActionResult(data={
@@ -1573,7 +2196,8 @@ class GetAttachmentContentAction(ActionHandler):
                     if "access_token" in credentials:
                         headers["Authorization"] = f"Bearer {credentials['access_token']}"
 
-                async with session.get(url, headers=headers) as response:
+                async with rate_limiter.slot(tenant_id), session.get(url, headers=headers) as response:
+                    rate_limiter.observe_headers(tenant_id, response.headers)
                     if response.status != 200:
                         error_text = await response.text()
                         return ActionResult(data={
@@ -2053,3 +2677,183 @@ class AddNoteToPurchaseOrderAction(ActionHandler):
             })
         except Exception as e:
             raise Exception(f"Failed to add note to purchase order: {str(e)}")
+
+
+@xero.action("export_records")
+class ExportRecordsAction(ActionHandler):
+    async def execute(self, inputs: Dict[str, Any], context: ExecutionContext):
+        """
+        Exports invoices, payments, bank transactions or purchase orders across pages
+
+        Pages are fetched automatically (with a few requested ahead) until the last
+        page or max_records is reached. With modified_since, only records changed
+        since that time are returned (If-Modified-Since); pass back the returned
+        watermark on the next run for an incremental sync. When more records remain,
+        next_page says where to continue.
+        """
+        # Validate required inputs
+        tenant_id = inputs.get("tenant_id")
+        record_type = inputs.get("record_type")
+        if not tenant_id:
+            raise ValueError("tenant_id is required")
+        if record_type not in EXPORT_RECORD_TYPES:
+            raise ValueError(f"record_type must be one of: {', '.join(EXPORT_RECORD_TYPES)}")
+
+        page_size = min(int(inputs.get("page_size", EXPORT_DEFAULT_PAGE_SIZE)), EXPORT_MAX_PAGE_SIZE)
+        max_records = int(inputs.get("max_records", 5000))
+        modified_since = inputs.get("modified_since")
+
+        params = {}
+        if inputs.get("where"):
+            params["where"] = inputs["where"]
+        # A stable order keeps pages consistent while the export runs
+        params["order"] = inputs.get("order") or "UpdatedDateUTC ASC"
+
+        try:
+            records = []
+            pages_fetched = 0
+            next_page = None
+            watermark = None
+
+            pages = iter_export_pages(
+                context, tenant_id, record_type, params,
+                page_size=page_size,
+                start_page=int(inputs.get("start_page", 1)),
+                modified_since=modified_since
+            )
+            try:
+                async for page, chunk in pages:
+                    pages_fetched += 1
+                    records.extend(chunk)
+                    for record in chunk:
+                        updated = parse_xero_date(record.get("UpdatedDateUTC"))
+                        if updated and (watermark is None or updated > watermark):
+                            watermark = updated
+                    if len(chunk) == page_size and len(records) >= max_records:
+                        next_page = page + 1
+                        break
+            finally:
+                await pages.aclose()
+
+            return ActionResult(data={
+                "success": True,
+                "record_type": record_type,
+                "records": records,
+                "record_count": len(records),
+                "pages_fetched": pages_fetched,
+                "complete": next_page is None,
+                "next_page": next_page,
+                # Use as modified_since next time; falls back to the previous watermark if nothing changed
+                "watermark": watermark.strftime("%Y-%m-%dT%H:%M:%S") if watermark else modified_since
+            })
+
+        except XeroRateLimitExceededException as e:
+            return ActionResult(data={
+                "success": False,
+                "error_type": "rate_limit_exceeded",
+                "message": f"Xero API rate limit exceeded for tenant {e.tenant_id}. Required wait time: {e.requested_delay}s exceeds maximum: {e.max_wait_time}s. Please try again later.",
+                "tenant_id": e.tenant_id,
+                "retry_delay_seconds": e.requested_delay
+            })
+        except Exception as e:
+            raise Exception(f"Failed to export {record_type}: {str(e)}")
+
+
+@xero.action("aggregate_report")
+class AggregateReportAction(ActionHandler):
+    async def execute(self, inputs: Dict[str, Any], context: ExecutionContext):
+        """
+        Runs one report type across many tenants concurrently and merges the results
+
+        Each tenant's report is flattened into rows tagged with the tenant and its
+        base currency. Rows with the same section and label are also summed per
+        currency into a consolidated view; amounts in different currencies are
+        never added together.
+        """
+        report_type = inputs.get("report_type")
+        if report_type not in REPORT_ENDPOINTS:
+            raise ValueError(f"report_type must be one of: {', '.join(REPORT_ENDPOINTS)}")
+        endpoint = REPORT_ENDPOINTS[report_type]
+        contact_ids = inputs.get("contact_ids") or {}
+        refresh_cache = bool(inputs.get("refresh_cache", False))
+
+        try:
+            connections = await get_all_connections(context)
+            tenant_names = {connection.get("tenantId"): connection.get("tenantName") for connection in connections}
+            tenant_ids = inputs.get("tenant_ids") or list(tenant_names)
+            params = build_report_params(inputs)
+
+            semaphore = asyncio.Semaphore(REPORT_AGGREGATION_CONCURRENCY)
+
+            async def run_for_tenant(tenant_id: str) -> Dict[str, Any]:
+                tenant_params = dict(params)
+                if report_type in ("aged_receivables", "aged_payables"):
+                    if not contact_ids.get(tenant_id):
+                        return {"tenant_id": tenant_id, "error": "contact_ids has no contact for this tenant"}
+                    tenant_params["contactId"] = contact_ids[tenant_id]
+                async with semaphore:
+                    try:
+                        currency, (report, from_cache) = await asyncio.gather(
+                            get_tenant_currency(context, tenant_id),
+                            fetch_report(context, tenant_id, endpoint, tenant_params, refresh=refresh_cache)
+                        )
+                    except XeroRateLimitExceededException as e:
+                        return {
+                            "tenant_id": tenant_id,
+                            "error_type": "rate_limit_exceeded",
+                            "error": str(e),
+                            "retry_delay_seconds": e.requested_delay
+                        }
+                    except Exception as e:
+                        return {"tenant_id": tenant_id, "error": str(e)}
+                columns, rows = flatten_report(report)
+                return {
+                    "tenant_id": tenant_id,
+                    "currency": currency,
+                    "columns": columns,
+                    "rows": rows,
+                    "from_cache": from_cache
+                }
+
+            results = await asyncio.gather(*(run_for_tenant(tenant_id) for tenant_id in tenant_ids))
+
+            rows = []
+            tenants = []
+            errors = []
+            for result in results:
+                tenant_id = result["tenant_id"]
+                if "error" in result:
+                    errors.append({**result, "tenant_name": tenant_names.get(tenant_id)})
+                    continue
+                tenants.append({
+                    "tenant_id": tenant_id,
+                    "tenant_name": tenant_names.get(tenant_id),
+                    "currency": result["currency"],
+                    "columns": result["columns"],
+                    "row_count": len(result["rows"]),
+                    "from_cache": result["from_cache"]
+                })
+                for row in result["rows"]:
+                    rows.append({
+                        "tenant_id": tenant_id,
+                        "tenant_name": tenant_names.get(tenant_id),
+                        "currency": result["currency"],
+                        **row
+                    })
+
+            rate_limits = {}
+            for tenant_id in tenant_ids:
+                rate_limits.update(rate_limiter.get_metrics(tenant_id))
+
+            return ActionResult(data={
+                "success": True,
+                "report_type": report_type,
+                "tenants": tenants,
+                "rows": rows,
+                "consolidated": consolidate_report_rows(rows),
+                "errors": errors,
+                "rate_limits": rate_limits
+            })
+
+        except Exception as e:
+            raise Exception(f"Failed to aggregate {report_type} report: {str(e)}")